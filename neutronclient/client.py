@@ -18,8 +18,12 @@ try:
     import json
 except ImportError:
     import simplejson as json
+import calendar
 import logging
 import os
+import sys
+import threading
+import time
 
 import debtcollector.renames
 from keystoneauth1 import access
@@ -28,11 +32,10 @@ from oslo_utils import importutils
 import requests
 
 from neutronclient._i18n import _
+from neutronclient.common import auth_cache as neutron_auth_cache
 from neutronclient.common import exceptions
 from neutronclient.common import utils
 
-osprofiler_web = importutils.try_import("osprofiler.web")
-
 _logger = logging.getLogger(__name__)
 
 if os.environ.get('NEUTRONCLIENT_DEBUG'):
@@ -47,6 +50,23 @@ logging.getLogger("requests").setLevel(_requests_log_level)
 MAX_URI_LEN = 8192
 USER_AGENT = 'python-neutronclient'
 REQ_ID_HEADER = 'X-OpenStack-Request-ID'
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+# Tokens expiring within that many seconds are renewed before being used
+DEFAULT_AUTH_REFRESH_MARGIN = 60
+
+
+def _get_trace_id_headers():
+    # NOTE(dbelova): osprofiler_web.get_trace_id_headers does not add any
+    # headers in case if osprofiler is not initialized.
+    # osprofiler cannot be initialized unless the application imported it,
+    # so do not make every process pay for importing it.
+    if 'osprofiler.profiler' not in sys.modules:
+        return {}
+    osprofiler_web = importutils.try_import("osprofiler.web")
+    if not osprofiler_web:
+        return {}
+    return osprofiler_web.get_trace_id_headers()
 
 
 class HTTPClient(object):
@@ -66,6 +86,11 @@ class HTTPClient(object):
                  endpoint_type='publicURL',
                  auth_strategy='keystone', ca_cert=None, log_credentials=False,
                  service_type='network', global_request_id=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_idle_timeout=None, circuit_breaker=None,
+                 auth_cache=None,
+                 auth_refresh_margin=DEFAULT_AUTH_REFRESH_MARGIN,
                  **kwargs):
 
         self.username = username
@@ -89,6 +114,82 @@ class HTTPClient(object):
             self.verify_cert = False
         else:
             self.verify_cert = ca_cert if ca_cert else True
+        # Connections are kept alive in a pool owned by this client and
+        # shared by all requests until close() is called.
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self._session = None
+        self._session_last_used = None
+        self._session_lock = threading.Lock()
+        self._pool_hits = 0
+        self._pool_misses = 0
+        self.circuit_breaker = circuit_breaker
+        # Tokens and endpoints obtained from Keystone can be shared with
+        # other clients and processes through an AuthCache.
+        self.auth_cache = auth_cache
+        self.auth_refresh_margin = auth_refresh_margin
+        self.auth_ref = None
+        # Only one thread at a time authenticates, see _reauthenticate().
+        self._auth_lock = threading.Lock()
+        self._refresher = None
+
+    def _get_session(self):
+        with self._session_lock:
+            now = time.time()
+            if (self._session is not None and
+                    self.pool_idle_timeout is not None and
+                    now - self._session_last_used > self.pool_idle_timeout):
+                # Connections idle for that long have most likely been
+                # dropped by the server, so start over with a fresh pool.
+                _logger.debug("Connection pool idle for more than %s "
+                              "seconds, recycling it", self.pool_idle_timeout)
+                self._close_session()
+            if self._session is None:
+                self._session = requests.Session()
+                http_adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize)
+                self._session.mount('https://', http_adapter)
+                self._session.mount('http://', http_adapter)
+            self._session_last_used = now
+            return self._session
+
+    def _live_pool_counters(self):
+        hits = misses = 0
+        if self._session is None:
+            return hits, misses
+        for http_adapter in set(self._session.adapters.values()):
+            pools = http_adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                misses += pool.num_connections
+                hits += pool.num_requests - pool.num_connections
+        return hits, misses
+
+    def _close_session(self):
+        if self._session is not None:
+            hits, misses = self._live_pool_counters()
+            self._pool_hits += hits
+            self._pool_misses += misses
+            self._session.close()
+            self._session = None
+
+    def get_pool_stats(self):
+        """Return connection pool usage counters.
+
+        'hits' is the number of requests sent over an already established
+        connection and 'misses' is the number of new connections opened.
+        """
+        with self._session_lock:
+            hits, misses = self._live_pool_counters()
+            return {'hits': self._pool_hits + hits,
+                    'misses': self._pool_misses + misses}
+
+    def close(self):
+        """Close all connections held in the connection pool."""
+        with self._session_lock:
+            self._close_session()
 
     def _cs_request(self, *args, **kwargs):
         kargs = {}
@@ -97,6 +198,8 @@ class HTTPClient(object):
 
         if 'body' in kwargs:
             kargs['body'] = kwargs['body']
+        if kwargs.get('stream'):
+            kargs['stream'] = True
 
         if self.log_credentials:
             log_kargs = kargs
@@ -140,10 +243,73 @@ class HTTPClient(object):
             return kwargs
 
     def authenticate_and_fetch_endpoint_url(self):
-        if not self.auth_token:
+        if not self.auth_token or self._token_expires_soon():
+            self._reauthenticate(self.auth_token)
+        else:
+            if self._token_expires_soon(2 * self.auth_refresh_margin):
+                self._refresh_in_background()
+            if not self.endpoint_url:
+                self.endpoint_url = self._get_endpoint_url()
+
+    def _token_expires_soon(self, margin=None):
+        # Only the tokens obtained by the client itself can be renewed.
+        if margin is None:
+            margin = self.auth_refresh_margin
+        return (self.auth_ref is not None and self.password is not None and
+                self.auth_ref.will_expire_soon(margin))
+
+    def _reauthenticate(self, stale_token):
+        """Replace stale_token, unless another thread already did it."""
+        with self._auth_lock:
+            if (self.auth_token and self.auth_token != stale_token and
+                    not self._token_expires_soon()):
+                return
             self.authenticate()
-        elif not self.endpoint_url:
-            self.endpoint_url = self._get_endpoint_url()
+
+    def _refresh_in_background(self):
+        """Renew the token before it expires, without blocking requests.
+
+        The current token keeps being used until the new one is there.
+        """
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        if not self._auth_lock.acquire(False):
+            # A thread is authenticating already.
+            return
+        try:
+            self._refresher = threading.Thread(
+                target=self._background_refresh, args=(self.auth_token,))
+            self._refresher.daemon = True
+            self._refresher.start()
+        finally:
+            self._auth_lock.release()
+
+    def _background_refresh(self, stale_token):
+        try:
+            self._reauthenticate(stale_token)
+        except Exception as e:
+            # Requests will retry in the foreground once the token is
+            # about to expire.
+            _logger.debug("Background token refresh failed: %s", e)
+
+    def _auth_cache_key(self):
+        # The password is left out: the key is stored in clear in the
+        # cache, and the user and project already identify the token.
+        return neutron_auth_cache.make_key(
+            self.auth_url, self.user_id, self.username,
+            self.project_id, self.project_name, self.region_name,
+            self.service_type, self.endpoint_type)
+
+    def _endpoint_cache_key(self):
+        # Not keyed by token, which would add an entry to the cache per
+        # token without any expiry to drop it.
+        return neutron_auth_cache.make_key(
+            'endpoint', self.auth_url, self.region_name,
+            self.service_type, self.endpoint_type)
+
+    def _drop_cached_auth(self):
+        if self.auth_cache is not None:
+            self.auth_cache.delete(self._auth_cache_key())
 
     def request(self, url, method, body=None, headers=None, **kwargs):
         """Request without authentication."""
@@ -159,12 +325,9 @@ class HTTPClient(object):
             headers.setdefault(REQ_ID_HEADER, self.global_request_id)
 
         headers['User-Agent'] = USER_AGENT
-        # NOTE(dbelova): osprofiler_web.get_trace_id_headers does not add any
-        # headers in case if osprofiler is not initialized.
-        if osprofiler_web:
-            headers.update(osprofiler_web.get_trace_id_headers())
+        headers.update(_get_trace_id_headers())
 
-        resp = requests.request(
+        resp = self._get_session().request(
             method,
             url,
             data=body,
@@ -173,6 +336,9 @@ class HTTPClient(object):
             timeout=self.timeout,
             **kwargs)
 
+        if kwargs.get('stream'):
+            # The body is left unread for the caller to consume.
+            return resp, None
         return resp, resp.text
 
     def _check_uri_length(self, action):
@@ -194,17 +360,24 @@ class HTTPClient(object):
             if self.auth_token is None:
                 self.auth_token = ""
             kwargs['headers']['X-Auth-Token'] = self.auth_token
-            resp, body = self._cs_request(self.endpoint_url + url, method,
-                                          **kwargs)
+            resp, body = self._neutron_request(self.endpoint_url + url,
+                                               method, **kwargs)
             return resp, body
         except exceptions.Unauthorized:
-            self.authenticate()
+            # The token may come from the cache and have been revoked.
+            self._drop_cached_auth()
+            self._reauthenticate(kwargs['headers']['X-Auth-Token'])
             kwargs['headers'] = kwargs.get('headers') or {}
             kwargs['headers']['X-Auth-Token'] = self.auth_token
-            resp, body = self._cs_request(
+            resp, body = self._neutron_request(
                 self.endpoint_url + url, method, **kwargs)
             return resp, body
 
+    def _neutron_request(self, *args, **kwargs):
+        if self.circuit_breaker is None:
+            return self._cs_request(*args, **kwargs)
+        return self.circuit_breaker.call(self._cs_request, *args, **kwargs)
+
     def _extract_service_catalog(self, body):
         """Set the client's service catalog from the response data."""
         self.auth_ref = access.create(body=body)
@@ -219,7 +392,34 @@ class HTTPClient(object):
                 service_type=self.service_type,
                 interface=self.endpoint_type)
 
+    def _authenticate_from_cache(self):
+        entry = self.auth_cache.get(self._auth_cache_key())
+        if not entry or not entry.get('auth_ref'):
+            return False
+        expires = entry.get('expires')
+        # Tokens due for a background refresh are not reused either, the
+        # refresh would get them back.
+        if (expires and
+                expires - 2 * self.auth_refresh_margin <= time.time()):
+            return False
+        if entry.get('endpoint_url') and not self.endpoint_url:
+            self.endpoint_url = entry['endpoint_url']
+        self._extract_service_catalog(entry['auth_ref'])
+        return True
+
+    def _cache_auth(self, body):
+        expires = None
+        if self.auth_ref.expires:
+            expires = calendar.timegm(self.auth_ref.expires.utctimetuple())
+        self.auth_cache.set(self._auth_cache_key(),
+                            {'auth_ref': body,
+                             'expires': expires,
+                             'endpoint_url': self.endpoint_url})
+
     def _authenticate_keystone(self):
+        if self.auth_cache is not None and self._authenticate_from_cache():
+            return
+
         if self.user_id:
             creds = {'userId': self.user_id,
                      'password': self.password}
@@ -252,6 +452,8 @@ class HTTPClient(object):
         else:
             resp_body = None
         self._extract_service_catalog(resp_body)
+        if self.auth_cache is not None:
+            self._cache_auth(resp_body)
 
     def _authenticate_noauth(self):
         if not self.endpoint_url:
@@ -273,6 +475,11 @@ class HTTPClient(object):
         if self.auth_url is None:
             raise exceptions.NoAuthURLProvided()
 
+        if self.auth_cache is not None:
+            entry = self.auth_cache.get(self._endpoint_cache_key())
+            if entry and entry.get('endpoint_url'):
+                return entry['endpoint_url']
+
         url = self.auth_url + '/tokens/%s/endpoints' % self.auth_token
         try:
             resp, body = self._cs_request(url, "GET")
@@ -289,6 +496,10 @@ class HTTPClient(object):
                 if self.endpoint_type not in endpoint:
                     raise exceptions.EndpointTypeNotFound(
                         type_=self.endpoint_type)
+                if self.auth_cache is not None:
+                    self.auth_cache.set(
+                        self._endpoint_cache_key(),
+                        {'endpoint_url': endpoint[self.endpoint_type]})
                 return endpoint[self.endpoint_type]
 
         raise exceptions.EndpointNotFound()
@@ -300,11 +511,15 @@ class HTTPClient(object):
                 'endpoint_url': self.endpoint_url}
 
     def get_auth_ref(self):
-        return getattr(self, 'auth_ref', None)
+        return self.auth_ref
 
 
 class SessionClient(adapter.Adapter):
 
+    def __init__(self, *args, **kwargs):
+        self.circuit_breaker = kwargs.pop('circuit_breaker', None)
+        super(SessionClient, self).__init__(*args, **kwargs)
+
     def request(self, *args, **kwargs):
         kwargs.setdefault('authenticated', False)
         kwargs.setdefault('raise_exc', False)
@@ -314,10 +529,7 @@ class SessionClient(adapter.Adapter):
         headers = kwargs.get('headers') or {}
         headers.setdefault('Accept', content_type)
 
-        # NOTE(dbelova): osprofiler_web.get_trace_id_headers does not add any
-        # headers in case if osprofiler is not initialized.
-        if osprofiler_web:
-            headers.update(osprofiler_web.get_trace_id_headers())
+        headers.update(_get_trace_id_headers())
 
         try:
             kwargs.setdefault('data', kwargs.pop('body'))
@@ -329,6 +541,9 @@ class SessionClient(adapter.Adapter):
 
         kwargs['headers'] = headers
         resp = super(SessionClient, self).request(*args, **kwargs)
+        if kwargs.get('stream'):
+            # The body is left unread for the caller to consume.
+            return resp, None
         return resp, resp.text
 
     def _check_uri_length(self, url):
@@ -340,7 +555,9 @@ class SessionClient(adapter.Adapter):
     def do_request(self, url, method, **kwargs):
         kwargs.setdefault('authenticated', True)
         self._check_uri_length(url)
-        return self.request(url, method, **kwargs)
+        if self.circuit_breaker is None:
+            return self.request(url, method, **kwargs)
+        return self.circuit_breaker.call(self.request, url, method, **kwargs)
 
     @property
     def endpoint_url(self):
@@ -405,6 +622,11 @@ def construct_http_client(username=None,
                           service_type='network',
                           session=None,
                           global_request_id=None,
+                          pool_connections=DEFAULT_POOL_CONNECTIONS,
+                          pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                          pool_idle_timeout=None,
+                          circuit_breaker=None,
+                          auth_cache=None,
                           **kwargs):
 
     if session:
@@ -414,6 +636,7 @@ def construct_http_client(username=None,
                              service_type=service_type,
                              region_name=region_name,
                              global_request_id=global_request_id,
+                             circuit_breaker=circuit_breaker,
                              **kwargs)
     else:
         # FIXME(bklei): username and password are now optional. Need
@@ -435,4 +658,9 @@ def construct_http_client(username=None,
                           ca_cert=ca_cert,
                           log_credentials=log_credentials,
                           auth_strategy=auth_strategy,
-                          global_request_id=global_request_id)
+                          global_request_id=global_request_id,
+                          pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize,
+                          pool_idle_timeout=pool_idle_timeout,
+                          circuit_breaker=circuit_breaker,
+                          auth_cache=auth_cache)
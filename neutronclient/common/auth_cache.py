@@ -0,0 +1,154 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""Caches of the tokens and endpoints obtained from Keystone.
+
+An entry is a dict holding the Keystone token response ('auth_ref'), the
+expiry of the token as a POSIX timestamp ('expires') and the network
+endpoint URL ('endpoint_url'). Entries are keyed by a hash of the user,
+project and endpoint options, see make_key(), so that tokens are never
+shared between different users or projects. Keys are stored in clear in
+the caches, so secrets such as passwords must not be part of them.
+"""
+
+import abc
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from oslo_utils import importutils
+import six
+
+fcntl = importutils.try_import('fcntl')
+
+_logger = logging.getLogger(__name__)
+
+
+def make_key(*args):
+    """Return the cache key of the given identifiers and options.
+
+    The key is an unsalted hash, the arguments must not include secrets.
+    """
+    data = json.dumps([a if a is None else six.text_type(a) for a in args])
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+@six.add_metaclass(abc.ABCMeta)
+class AuthCache(object):
+    """Base class of the authentication caches."""
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Return the entry stored under key, None if there is none."""
+
+    @abc.abstractmethod
+    def set(self, key, entry):
+        """Store entry under key."""
+
+    @abc.abstractmethod
+    def delete(self, key):
+        """Drop the entry stored under key, if any."""
+
+
+class MemoryAuthCache(AuthCache):
+    """Cache shared by the clients of a process which use it."""
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry else None
+
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = dict(entry)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class FileAuthCache(AuthCache):
+    """Cache stored in a JSON file shared by processes.
+
+    The file is only readable by its owner since it holds tokens. It is
+    replaced atomically on every write, writers being serialized with a
+    lock file where fcntl is available.
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return {}
+        except ValueError:
+            _logger.warning("Ignoring corrupted auth cache %s", self.path)
+            return {}
+
+    def _save(self, entries):
+        directory = os.path.dirname(self.path) or '.'
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.chmod(tmp_path, 0o600)
+            getattr(os, 'replace', os.rename)(tmp_path, self.path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def get(self, key):
+        return self._load().get(key)
+
+    def set(self, key, entry):
+        with self._locked():
+            now = time.time()
+            # Drop the expired tokens while at it.
+            entries = dict((k, v) for k, v in self._load().items()
+                           if not v.get('expires') or v['expires'] > now)
+            entries[key] = entry
+            self._save(entries)
+
+    def delete(self, key):
+        with self._locked():
+            entries = self._load()
+            if entries.pop(key, None) is not None:
+                self._save(entries)
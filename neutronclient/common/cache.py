@@ -0,0 +1,103 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import collections
+import threading
+import time
+
+
+class TTLCache(object):
+    """A size bounded, thread-safe cache whose entries expire.
+
+    The least recently used entry is evicted when the cache is full.
+    Expired entries are not returned by get() but are kept until they
+    are replaced or evicted, so that callers can revalidate them with
+    get_expired().
+    """
+
+    def __init__(self, maxsize, ttl, timer=time.time):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _lookup(self, key):
+        # Returns (value, expired) or None; the caller holds the lock.
+        try:
+            value, stored_at = self._data.pop(key)
+        except KeyError:
+            return None
+        self._data[key] = (value, stored_at)
+        return value, self._timer() - stored_at > self.ttl
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or entry[1]:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[0]
+
+    def get_expired(self, key, default=None):
+        """Return the value of an expired entry without counting it."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None or not entry[1]:
+                return default
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, self._timer())
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def touch(self, key):
+        """Restart the time to live of an entry."""
+        with self._lock:
+            if key in self._data:
+                self._data[key] = (self._data[key][0], self._timer())
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def invalidate(self, predicate):
+        """Drop the entries for which predicate(key, value) is true."""
+        with self._lock:
+            for key in [k for k, v in self._data.items()
+                        if predicate(k, v[0])]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def get_stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._data)}
@@ -0,0 +1,171 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import collections
+import logging
+import threading
+import time
+
+from keystoneauth1 import exceptions as ksa_exc
+
+from neutronclient._i18n import _
+from neutronclient.common import exceptions
+
+_logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """Fail fast while the Neutron server is failing or too slow.
+
+    The circuit opens after failure_threshold consecutive failures, i.e.
+    connection failures or 5xx responses, or when the 99th percentile of
+    the latency of the last latency_window requests exceeds
+    latency_threshold seconds. While it is open, requests are not sent
+    and raise CircuitBreakerOpen. After reset_timeout seconds up to
+    half_open_calls requests are let through as probes: the circuit
+    closes again if they succeed and opens again otherwise.
+
+    A breaker can be shared by the clients of the same endpoint.
+
+    :param integer failure_threshold: Consecutive failures opening the
+                                      circuit (default: 5).
+    :param float reset_timeout: Seconds before probing a server after
+                                the circuit opened (default: 30).
+    :param float latency_threshold: p99 latency in seconds opening the
+                                    circuit (default: None, latency is
+                                    not watched).
+    :param integer latency_window: Number of requests the p99 latency is
+                                   computed over (default: 100).
+    :param integer half_open_calls: Probes let through at once when the
+                                    circuit is half-open (default: 1).
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30,
+                 latency_threshold=None, latency_window=100,
+                 half_open_calls=1, timer=time.time):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.latency_threshold = latency_threshold
+        self.half_open_calls = half_open_calls
+        self._timer = timer
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probes = 0
+        self._latencies = collections.deque(maxlen=latency_window)
+        self._reason = None
+        self.trips = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        return self._state
+
+    def _open(self, reason):
+        # The caller holds the lock.
+        if self._state != OPEN:
+            _logger.warning("Opening the circuit to Neutron server: %s",
+                            reason)
+            self.trips += 1
+        self._state = OPEN
+        self._opened_at = self._timer()
+        self._reason = reason
+        self._probes = 0
+        self._latencies.clear()
+
+    def _close(self):
+        # The caller holds the lock.
+        if self._state != CLOSED:
+            _logger.info("Closing the circuit to Neutron server")
+        self._state = CLOSED
+        self._failures = 0
+        self._probes = 0
+
+    def _before_call(self):
+        with self._lock:
+            if (self._state == OPEN and
+                    self._timer() - self._opened_at >= self.reset_timeout):
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN:
+                if self._probes < self.half_open_calls:
+                    self._probes += 1
+                    return
+            elif self._state == CLOSED:
+                return
+            self.rejected += 1
+            raise exceptions.CircuitBreakerOpen(reason=self._reason)
+
+    def _p99(self):
+        latencies = sorted(self._latencies)
+        return latencies[int(len(latencies) * 0.99)]
+
+    def record_success(self, latency):
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._close()
+            self._failures = 0
+            if self.latency_threshold is None:
+                return
+            self._latencies.append(latency)
+            if len(self._latencies) == self._latencies.maxlen:
+                p99 = self._p99()
+                if p99 > self.latency_threshold:
+                    self._open(_("p99 latency of %(p99).2f seconds") %
+                               {'p99': p99})
+
+    def record_failure(self, reason):
+        with self._lock:
+            self._failures += 1
+            if (self._state == HALF_OPEN or
+                    self._failures >= self.failure_threshold):
+                self._open(reason)
+
+    def _release(self):
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def call(self, func, *args, **kwargs):
+        """Call func, which sends a request, through the breaker.
+
+        func must return a (response, body) tuple.
+        """
+        self._before_call()
+        start = self._timer()
+        try:
+            resp, body = func(*args, **kwargs)
+        except (exceptions.ConnectionFailed, ksa_exc.ConnectionError) as e:
+            self.record_failure(e)
+            raise
+        except Exception:
+            # The server was not reached or did answer, e.g. 401.
+            self._release()
+            raise
+        if resp.status_code >= 500:
+            self.record_failure(_("HTTP %s") % resp.status_code)
+        else:
+            self.record_success(self._timer() - start)
+        return resp, body
+
+    def get_stats(self):
+        return {'state': self._state,
+                'consecutive_failures': self._failures,
+                'trips': self.trips,
+                'rejected': self.rejected}
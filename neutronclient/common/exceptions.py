@@ -225,6 +225,12 @@ class ConnectionFailed(NeutronClientException):
     message = _("Connection to neutron failed: %(reason)s")
 
 
+class CircuitBreakerOpen(NeutronClientException):
+    """Raised instead of sending a request while the circuit is open."""
+    message = _("Neutron server is unavailable, not sending the request: "
+                "%(reason)s")
+
+
 class SslCertificateValidationError(NeutronClientException):
     message = _("SSL certificate validation has failed: %(reason)s")
 
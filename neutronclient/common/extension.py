@@ -13,17 +13,134 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 #
+import hashlib
+import inspect
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+
+from oslo_utils import importutils
 from stevedore import extension
 
 from neutronclient.neutron import v2_0 as neutronV20
 
+_logger = logging.getLogger(__name__)
+
+NAMESPACE = 'neutronclient.extension'
+CACHE_ENV = 'NEUTRONCLIENT_EXTENSION_CACHE'
+
+_lock = threading.Lock()
+_extensions = None
+_classes = {}
+
 
 def _discover_via_entry_points():
-    emgr = extension.ExtensionManager('neutronclient.extension',
+    emgr = extension.ExtensionManager(NAMESPACE,
                                       invoke_on_load=False)
     return ((ext.name, ext.plugin) for ext in emgr)
 
 
+def _installed_distributions():
+    # The names of the metadata directories hold the distribution versions,
+    # listing them is much cheaper than scanning the entry points.
+    names = []
+    for path in sys.path:
+        try:
+            entries = os.listdir(path or '.')
+        except OSError:
+            continue
+        names.extend(name for name in entries
+                     if name.endswith(('.dist-info', '.egg-info')))
+    return sorted(names)
+
+
+def _cache_key():
+    data = json.dumps([sys.version, _installed_distributions()])
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+
+def _load_cached(path, key):
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('key') != key:
+        return None
+    try:
+        return [(name, importutils.import_module(module_name))
+                for name, module_name in cached['extensions']]
+    except (ImportError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _save_cached(path, key, extensions):
+    if not all(inspect.ismodule(plugin) for _name, plugin in extensions):
+        return
+    data = {'key': key,
+            'extensions': [(name, plugin.__name__)
+                           for name, plugin in extensions]}
+    directory = os.path.dirname(path) or '.'
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+    except (IOError, OSError) as e:
+        _logger.debug("Unable to write the extension cache %s: %s", path, e)
+
+
+def discover_extensions():
+    """Return the (name, module) pairs of the installed extensions.
+
+    The entry points are only scanned once per process. When the
+    NEUTRONCLIENT_EXTENSION_CACHE environment variable holds the path of
+    a file, the modules found are also cached in it until a distribution
+    is installed, upgraded or removed.
+    """
+    global _extensions
+    with _lock:
+        if _extensions is not None:
+            return _extensions
+        path = os.environ.get(CACHE_ENV)
+        if path:
+            path = os.path.expanduser(path)
+            key = _cache_key()
+            extensions = _load_cached(path, key)
+            if extensions is None:
+                extensions = list(_discover_via_entry_points())
+                _save_cached(path, key, extensions)
+        else:
+            extensions = list(_discover_via_entry_points())
+        _extensions = extensions
+        return extensions
+
+
+def get_extension_classes(version):
+    """Return the (extension name, class) pairs available for version."""
+    classes = _classes.get(version)
+    if classes is None:
+        classes = []
+        for name, module in discover_extensions():
+            for _cls_name, cls in inspect.getmembers(module,
+                                                     inspect.isclass):
+                if version in getattr(cls, 'versions', (version,)):
+                    classes.append((name, cls))
+        _classes[version] = classes
+    return classes
+
+
+def reset_cache():
+    """Forget the extensions discovered so far."""
+    global _extensions
+    with _lock:
+        _extensions = None
+        _classes.clear()
+
+
 class NeutronClientExtension(neutronV20.NeutronCommand):
     pagination_support = False
     _formatters = {}
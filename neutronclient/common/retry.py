@@ -0,0 +1,119 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import email.utils
+import random
+import time
+
+import six
+
+
+DEFAULT_RETRY_STATUSES = (429, 503)
+
+
+def parse_retry_after(value):
+    """Return the number of seconds to wait from a Retry-After header.
+
+    The header holds either a number of seconds or an HTTP date. None is
+    returned if it is missing or cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    date = email.utils.parsedate_tz(value)
+    if date is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(date) - time.time())
+
+
+class RetryPolicy(object):
+    """How idempotent requests are retried.
+
+    The delay before the n-th retry is drawn at random between 0 and
+    min(max_backoff, backoff * 2 ** n) ("full jitter"), so that clients
+    failing at the same time do not retry in lockstep. A Retry-After
+    header sent along with a retryable status code is honoured as a
+    minimum delay, up to max_backoff: a server asking for a longer wait
+    does not keep the caller blocked for longer than that.
+
+    :param integer retries: Maximum number of retries (default: 0).
+    :param float backoff: Base delay in seconds (default: 1).
+    :param float max_backoff: Maximum delay between two attempts in
+                              seconds (default: 30).
+    :param float deadline: Maximum number of seconds spent on a call,
+                           retries included; no retry is attempted if it
+                           would end after the deadline (default: None,
+                           no deadline).
+    :param retry_statuses: HTTP status codes of the responses to retry
+                           besides connection failures
+                           (default: 429 and 503).
+    :param bool jitter: Whether to randomize the delays (default: True).
+    """
+
+    def __init__(self, retries=0, backoff=1, max_backoff=30, deadline=None,
+                 retry_statuses=DEFAULT_RETRY_STATUSES, jitter=True):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses or ())
+        self.jitter = jitter
+
+    def get_delay(self, retry_number, retry_after=None):
+        """Return the delay in seconds before the given retry (from 0)."""
+        delay = min(self.max_backoff, self.backoff * 2 ** retry_number)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_backoff))
+        return delay
+
+    def allows(self, metrics, delay):
+        """Whether another attempt can be made after waiting delay."""
+        if metrics.retries >= self.retries:
+            return False
+        if self.deadline is None:
+            return True
+        return metrics.elapsed() + delay <= self.deadline
+
+
+class RetryMetrics(object):
+    """What it took to complete a call.
+
+    Available as the retry_metrics attribute of the exception raised by
+    the call, or of its result if the call was retried. The results of
+    the calls that succeeded at once have None instead.
+    """
+
+    def __init__(self):
+        self.start = time.time()
+        self.attempts = 0
+        self.delay = 0.0
+        self.errors = []
+
+    @property
+    def retries(self):
+        return max(0, self.attempts - 1)
+
+    def elapsed(self):
+        return time.time() - self.start
+
+    def __repr__(self):
+        return ('<RetryMetrics attempts=%d delay=%.3f errors=%s>' %
+                (self.attempts, self.delay,
+                 [six.text_type(e) for e in self.errors]))
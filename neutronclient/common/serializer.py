@@ -13,7 +13,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import codecs
+import json
+import logging
+
+try:
+    from collections import abc as collections_abc
+except ImportError:
+    # Python 2
+    import collections as collections_abc
+
 from oslo_serialization import jsonutils
+from oslo_utils import importutils
 import six
 
 from neutronclient._i18n import _
@@ -23,6 +34,97 @@ from neutronclient.common import exceptions as exception
 if six.PY3:
     long = int
 
+_logger = logging.getLogger(__name__)
+
+
+class JSONCodec(object):
+    """A JSON implementation usable by the serializers.
+
+    'dumps' must accept a 'default' callable used for objects that are not
+    JSON serializable and return text. 'loads' must raise ValueError on
+    invalid documents. 'raw_decode' is optional, it decodes the value
+    starting at the given index of a text and returns it along with the
+    index where it ends, like json.JSONDecoder.raw_decode. It is used to
+    decode streamed lists, which fall back to the standard library with
+    codecs that do not provide it.
+    """
+
+    def __init__(self, name, dumps, loads, raw_decode=None):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.raw_decode = raw_decode
+
+
+_CODECS = {}
+_DEFAULT_CODEC = 'jsonutils'
+# Used when the requested codec is not available.
+_FALLBACK_CODEC = 'json'
+
+
+def register_codec(name, dumps, loads, raw_decode=None):
+    """Register a JSON implementation under the given name."""
+    _CODECS[name] = JSONCodec(name, dumps, loads, raw_decode)
+
+
+def get_codec(name=None):
+    """Return the named codec, the default one if name is None.
+
+    Falls back to the standard library json module if the requested
+    codec is not registered, e.g. because its library is not installed.
+    """
+    name = name or _DEFAULT_CODEC
+    try:
+        return _CODECS[name]
+    except KeyError:
+        _logger.debug("JSON codec %s is not available, using %s",
+                      name, _FALLBACK_CODEC)
+        return _CODECS[_FALLBACK_CODEC]
+
+
+def set_default_codec(name):
+    """Select the codec used by serializers created without one."""
+    global _DEFAULT_CODEC
+    _DEFAULT_CODEC = name
+
+
+def available_codecs():
+    return sorted(_CODECS)
+
+
+_json_raw_decode = json.JSONDecoder().raw_decode
+
+register_codec('json', json.dumps, json.loads, _json_raw_decode)
+# jsonutils decodes with the json module.
+register_codec('jsonutils', jsonutils.dumps, jsonutils.loads,
+               _json_raw_decode)
+
+_simplejson = importutils.try_import('simplejson')
+if _simplejson:
+    register_codec('simplejson', _simplejson.dumps, _simplejson.loads,
+                   _simplejson.JSONDecoder().raw_decode)
+
+_orjson = importutils.try_import('orjson')
+if _orjson:
+    def _orjson_dumps(obj, default=None):
+        return _orjson.dumps(obj, default=default).decode('utf-8')
+
+    def _orjson_loads(s):
+        try:
+            return _orjson.loads(s)
+        except _orjson.JSONDecodeError as e:
+            raise ValueError(e)
+
+    register_codec('orjson', _orjson_dumps, _orjson_loads)
+
+
+def _sanitizer(obj):
+    # Mappings that are not dicts, e.g. the records of
+    # neutronclient.v2_0.records, are sent as JSON objects.
+    if isinstance(obj, collections_abc.Mapping):
+        return dict(obj)
+    return six.text_type(obj)
+
 
 class ActionDispatcher(object):
     """Maps method name to local methods through action name."""
@@ -50,10 +152,11 @@ class DictSerializer(ActionDispatcher):
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
+    def __init__(self, codec=None):
+        self.codec = codec
+
     def default(self, data):
-        def sanitizer(obj):
-            return six.text_type(obj)
-        return jsonutils.dumps(data, default=sanitizer)
+        return get_codec(self.codec).dumps(data, default=_sanitizer)
 
 
 class TextDeserializer(ActionDispatcher):
@@ -68,9 +171,12 @@ class TextDeserializer(ActionDispatcher):
 
 class JSONDeserializer(TextDeserializer):
 
+    def __init__(self, codec=None):
+        self.codec = codec
+
     def _from_json(self, datastring):
         try:
-            return jsonutils.loads(datastring)
+            return get_codec(self.codec).loads(datastring)
         except ValueError:
             msg = _("Cannot understand JSON")
             raise exception.MalformedResponseBody(reason=msg)
@@ -79,26 +185,141 @@ class JSONDeserializer(TextDeserializer):
         return {'body': self._from_json(datastring)}
 
 
+class _JSONChunkReader(object):
+    """Decodes JSON values from an iterable of byte or text chunks."""
+
+    _whitespace = ' \t\n\r'
+
+    def __init__(self, chunks, codec=None):
+        self._chunks = iter(chunks)
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._raw_decode = get_codec(codec).raw_decode or _json_raw_decode
+        self._buf = u''
+        self._pos = 0
+        self._eof = False
+
+    def _malformed(self):
+        return exception.MalformedResponseBody(
+            reason=_("Cannot understand JSON"))
+
+    def _fill(self):
+        """Read the next chunk, returning False at the end of data."""
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._eof = True
+            chunk = self._text_decoder.decode(b'', final=True)
+        else:
+            if isinstance(chunk, six.binary_type):
+                chunk = self._text_decoder.decode(chunk)
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self):
+        while True:
+            while (self._pos < len(self._buf) and
+                   self._buf[self._pos] in self._whitespace):
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                raise self._malformed()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise self._malformed()
+        self._pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self._raw_decode(self._buf, self._pos)
+            except ValueError:
+                # Most likely a value split across chunks.
+                if self._fill():
+                    continue
+                raise self._malformed()
+            # A value ending right at the end of the buffer, e.g. a number,
+            # may go on in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+
+class JSONCollectionDeserializer(object):
+    """Incremental deserialization of a JSON collection response.
+
+    Yields the items of the given collection one at a time as the body
+    arrives, so that the whole body never needs to be held in memory.
+    The other top-level members, e.g. the pagination links, are stored
+    in the 'extra' dict.
+
+    'codec' is the name of the JSON codec to use, the default one when
+    not given. Codecs without raw_decode, e.g. orjson, cannot decode a
+    value out of a partial body, so the standard library is used instead.
+    """
+
+    def __init__(self, codec=None):
+        self.codec = codec
+
+    def deserialize(self, chunks, collection, extra):
+        reader = _JSONChunkReader(chunks, self.codec)
+        reader.expect('{')
+        if reader.peek() == '}':
+            return
+        while True:
+            key = reader.value()
+            reader.expect(':')
+            if key == collection and reader.peek() == '[':
+                reader.expect('[')
+                if reader.peek() == ']':
+                    reader.expect(']')
+                else:
+                    while True:
+                        yield reader.value()
+                        if reader.peek() != ',':
+                            break
+                        reader.expect(',')
+                    reader.expect(']')
+            else:
+                extra[key] = reader.value()
+            if reader.peek() != ',':
+                break
+            reader.expect(',')
+        reader.expect('}')
+
+
 # NOTE(maru): this class is duplicated from neutron.wsgi
 class Serializer(object):
     """Serializes and deserializes dictionaries to certain MIME types."""
 
-    def __init__(self, metadata=None):
+    def __init__(self, metadata=None, codec=None):
         """Create a serializer based on the given WSGI environment.
 
         'metadata' is an optional dict mapping MIME types to information
         needed to serialize a dictionary to that type.
 
+        'codec' is the name of the JSON codec to use, the default one
+        when not given.
+
         """
         self.metadata = metadata or {}
-
-    def _get_serialize_handler(self, content_type):
-        handlers = {
-            'application/json': JSONDictSerializer(),
+        self.codec = codec
+        self._serialize_handlers = {
+            'application/json': JSONDictSerializer(codec),
+        }
+        self._deserialize_handlers = {
+            'application/json': JSONDeserializer(codec),
         }
 
+    def _get_serialize_handler(self, content_type):
         try:
-            return handlers[content_type]
+            return self._serialize_handlers[content_type]
         except Exception:
             raise exception.InvalidContentType(content_type=content_type)
 
@@ -115,11 +336,7 @@ class Serializer(object):
             datastring)
 
     def get_deserialize_handler(self, content_type):
-        handlers = {
-            'application/json': JSONDeserializer(),
-        }
-
         try:
-            return handlers[content_type]
+            return self._deserialize_handlers[content_type]
         except Exception:
             raise exception.InvalidContentType(content_type=content_type)
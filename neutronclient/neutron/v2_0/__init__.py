@@ -18,18 +18,22 @@ from __future__ import print_function
 
 import abc
 import argparse
+from concurrent import futures
 import functools
+import itertools
 import logging
 
 from cliff import command
 from cliff import lister
 from cliff import show
 from oslo_serialization import jsonutils
+from oslo_utils import reflection
 import six
 
 from neutronclient._i18n import _
 from neutronclient.common import exceptions
 from neutronclient.common import utils
+from neutronclient.common import validators
 
 HYPHEN_OPTS = ['tags_any', 'not_tags', 'not_tags_any']
 
@@ -357,6 +361,26 @@ class NeutronCommand(command.Command):
 
         return parser
 
+    def get_required_fields(self, fields):
+        """Return the fields of the resource needed to display fields.
+
+        Commands displaying columns computed from other fields override it
+        to return these other fields instead.
+        """
+        return fields
+
+    def get_projection(self, parsed_args):
+        """Return the fields to request from the server.
+
+        Only the columns selected with -c, and the fields they depend on,
+        are requested. None, i.e. all the fields, is returned if no column
+        was selected or if fields or details were explicitly asked for.
+        """
+        columns = getattr(parsed_args, 'columns', None)
+        if not columns or parsed_args.fields or parsed_args.show_details:
+            return None
+        return self.get_required_fields(list(columns))
+
     def cleanup_output_data(self, data):
         pass
 
@@ -504,6 +528,12 @@ class DeleteCommand(NeutronCommand):
             'id', metavar=self.resource.upper(),
             nargs='+' if self.bulk_delete else 1,
             help=help_str % self.help_resource)
+        if self.bulk_delete:
+            parser.add_argument(
+                '--parallel', metavar='N', type=int, default=1,
+                help=_('Delete up to N %s at the same time, after looking '
+                       'up all the given names at once. Defaults to 1, '
+                       'i.e. one at a time.') % self.help_resource)
         self.add_known_arguments(parser)
         return parser
 
@@ -514,7 +544,9 @@ class DeleteCommand(NeutronCommand):
                               "delete_%s" % self.cmd_resource)
 
         if self.bulk_delete:
-            self._bulk_delete(obj_deleter, neutron_client, parsed_args.id)
+            validators.validate_int_range(parsed_args, 'parallel', 1)
+            self._bulk_delete(obj_deleter, neutron_client, parsed_args.id,
+                              parsed_args.parallel)
         else:
             self.delete_item(obj_deleter, neutron_client, parsed_args.id)
             print((_('Deleted %(resource)s: %(id)s')
@@ -523,17 +555,24 @@ class DeleteCommand(NeutronCommand):
                   file=self.app.stdout)
         return
 
-    def _bulk_delete(self, obj_deleter, neutron_client, parsed_args_ids):
+    def _bulk_delete(self, obj_deleter, neutron_client, parsed_args_ids,
+                     parallel=1):
         successful_delete = []
         non_existent = []
         multiple_ids = []
-        for item_id in parsed_args_ids:
-            try:
-                self.delete_item(obj_deleter, neutron_client, item_id)
+        if parallel > 1:
+            errors = self._parallel_delete(obj_deleter, neutron_client,
+                                           parsed_args_ids, parallel)
+        else:
+            errors = (self._try_delete(self.delete_item, obj_deleter,
+                                       neutron_client, item_id)
+                      for item_id in parsed_args_ids)
+        for item_id, error in zip(parsed_args_ids, errors):
+            if error is None:
                 successful_delete.append(item_id)
-            except exceptions.NotFound:
+            elif isinstance(error, exceptions.NotFound):
                 non_existent.append(item_id)
-            except exceptions.NeutronClientNoUniqueMatch:
+            else:
                 multiple_ids.append(item_id)
         if successful_delete:
             print((_('Deleted %(resource)s(s): %(id)s'))
@@ -555,6 +594,35 @@ class DeleteCommand(NeutronCommand):
                                   'id': ", ".join(multiple_ids)}))
             raise exceptions.NeutronCLIError(message='\n'.join(err_msgs))
 
+    @staticmethod
+    def _try_delete(delete_func, *args):
+        # Return the error which must be reported for this item, if any.
+        try:
+            delete_func(*args)
+        except (exceptions.NotFound,
+                exceptions.NeutronClientNoUniqueMatch) as e:
+            return e
+
+    def _parallel_delete(self, obj_deleter, neutron_client, item_ids,
+                         parallel):
+        # Look up all the names with one or two list calls, then send up
+        # to parallel delete requests at the same time. The error of each
+        # item, or None, is returned in the order of item_ids.
+        if self.allow_names:
+            ids = neutron_client.find_resource_ids(
+                self.resource, item_ids, cmd_resource=self.cmd_resource,
+                parent_id=self.parent_id, return_exceptions=True)
+        else:
+            ids = list(item_ids)
+        args = (self.parent_id,) if self.parent_id else ()
+        with futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+            results = [_id if isinstance(_id, Exception) else
+                       executor.submit(self._try_delete, obj_deleter,
+                                       _id, *args)
+                       for _id in ids]
+            return [r if isinstance(r, Exception) else r.result()
+                    for r in results]
+
     def delete_item(self, obj_deleter, neutron_client, item_id):
         if self.allow_names:
             params = {'cmd_resource': self.cmd_resource,
@@ -583,6 +651,9 @@ class ListCommand(NeutronCommand, lister.Lister):
     pagination_support = False
     sorting_support = False
     resource_plural = None
+    # Output formats printed row by row, for which the pages of resources
+    # are listed and printed one after the other instead of all at once.
+    streaming_formatters = ('csv', 'value', 'json')
 
     # A list to define arguments for filtering by attribute value
     # CLI arguments are shown in the order of this list.
@@ -654,8 +725,8 @@ class ListCommand(NeutronCommand, lister.Lister):
 
     def args2search_opts(self, parsed_args):
         search_opts = {}
-        fields = parsed_args.fields
-        if parsed_args.fields:
+        fields = parsed_args.fields or self.get_projection(parsed_args)
+        if fields:
             search_opts.update({'fields': fields})
         if parsed_args.show_details:
             search_opts.update({'verbose': 'True'})
@@ -672,6 +743,10 @@ class ListCommand(NeutronCommand, lister.Lister):
     def call_server(self, neutron_client, search_opts, parsed_args):
         resource_plural = neutron_client.get_resource_plural(self.cmd_resource)
         obj_lister = getattr(neutron_client, "list_%s" % resource_plural)
+        if (parsed_args.formatter in self.streaming_formatters and
+                'retrieve_all' in reflection.get_callable_args(obj_lister)):
+            # Get an iterator over the pages.
+            search_opts = dict(search_opts, retrieve_all=False)
         if self.parent_id:
             data = obj_lister(self.parent_id, **search_opts)
         else:
@@ -704,7 +779,10 @@ class ListCommand(NeutronCommand, lister.Lister):
                 search_opts.update({'sort_dir': dirs})
         data = self.call_server(neutron_client, search_opts, parsed_args)
         collection = neutron_client.get_resource_plural(self.resource)
-        return data.get(collection, [])
+        if isinstance(data, dict):
+            return data.get(collection, [])
+        # A generator of the pages, see streaming_formatters.
+        return (page.get(collection, []) for page in data)
 
     def extend_list(self, data, parsed_args):
         """Update a retrieved list.
@@ -729,18 +807,23 @@ class ListCommand(NeutronCommand, lister.Lister):
             _columns = self._setup_columns_with_tenant_id(self.list_columns,
                                                           _columns)
 
+        formatters = self.get_formatters(parsed_args)
+        return (_columns, (utils.get_item_properties(
+            s, _columns, formatters=formatters, )
+            for s in info), )
+
+    def get_formatters(self, parsed_args):
         if parsed_args.formatter == 'table':
-            formatters = self._formatters
+            return self._formatters
         elif (parsed_args.formatter == 'csv' and
               hasattr(self, '_formatters_csv')):
-            formatters = self._formatters_csv
-        else:
-            # For other formatters, we use raw value returned from neutron
-            formatters = {}
+            return self._formatters_csv
+        # For other formatters, we use raw value returned from neutron
+        return {}
 
-        return (_columns, (utils.get_item_properties(
-            s, _columns, formatters=formatters, )
-            for s in info), )
+    def get_data_columns(self, columns):
+        """Return the keys of the resources shown in the given columns."""
+        return list(columns)
 
     def _setup_columns_with_tenant_id(self, display_columns, avail_columns):
         _columns = [x for x in display_columns if x in avail_columns]
@@ -768,9 +851,38 @@ class ListCommand(NeutronCommand, lister.Lister):
             return False
         return 'admin' in auth_ref.role_names
 
+    def _setup_streamed_columns(self, pages, parsed_args):
+        # The columns are set up from the first page which is not empty,
+        # the rows of the following pages being formatted with the same
+        # columns as they are received.
+        pages = iter(pages)
+        data = []
+        for data in pages:
+            if data:
+                break
+        self.extend_list(data, parsed_args)
+        columns, rows = self.setup_columns(data, parsed_args)
+        return columns, itertools.chain(
+            rows, self._stream_rows(pages, columns, parsed_args))
+
+    def _stream_rows(self, pages, columns, parsed_args):
+        fields = self.get_data_columns(columns)
+        formatters = self.get_formatters(parsed_args)
+        for data in pages:
+            self.extend_list(data, parsed_args)
+            for resource in data:
+                # The keys of the first page may be missing from the
+                # resources of the following ones.
+                item = dict.fromkeys(fields, '')
+                item.update(resource)
+                yield utils.get_item_properties(item, fields,
+                                                formatters=formatters)
+
     def take_action(self, parsed_args):
         self.set_extra_attrs(parsed_args)
         data = self.retrieve_list(parsed_args)
+        if not isinstance(data, list):
+            return self._setup_streamed_columns(data, parsed_args)
         self.extend_list(data, parsed_args)
         return self.setup_columns(data, parsed_args)
 
@@ -804,8 +916,9 @@ class ShowCommand(NeutronCommand, show.ShowOne):
         params = {}
         if parsed_args.show_details:
             params = {'verbose': 'True'}
-        if parsed_args.fields:
-            params = {'fields': parsed_args.fields}
+        fields = parsed_args.fields or self.get_projection(parsed_args)
+        if fields:
+            params = {'fields': fields}
         if self.allow_names:
             _id = find_resourceid_by_name_or_id(neutron_client,
                                                 self.resource,
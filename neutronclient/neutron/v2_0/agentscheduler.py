@@ -114,7 +114,8 @@ class ListDhcpAgentsHostingNetwork(neutronV20.ListCommand):
 
     def extend_list(self, data, parsed_args):
         for agent in data:
-            agent['alive'] = ":-)" if agent['alive'] else 'xxx'
+            if 'alive' in agent:
+                agent['alive'] = ":-)" if agent['alive'] else 'xxx'
 
     def call_server(self, neutron_client, search_opts, parsed_args):
         _id = neutronV20.find_resourceid_by_name_or_id(neutron_client,
@@ -222,7 +223,8 @@ class ListL3AgentsHostingRouter(neutronV20.ListCommand):
             if 'ha_state' not in self.list_columns:
                 self.list_columns.append('ha_state')
         for agent in data:
-            agent['alive'] = ":-)" if agent['alive'] else 'xxx'
+            if 'alive' in agent:
+                agent['alive'] = ":-)" if agent['alive'] else 'xxx'
 
     def call_server(self, neutron_client, search_opts, parsed_args):
         _id = neutronV20.find_resourceid_by_name_or_id(neutron_client,
@@ -276,7 +278,8 @@ class GetLbaasAgentHostingPool(neutronV20.ListCommand):
 
     def extend_list(self, data, parsed_args):
         for agent in data:
-            agent['alive'] = ":-)" if agent['alive'] else 'xxx'
+            if 'alive' in agent:
+                agent['alive'] = ":-)" if agent['alive'] else 'xxx'
 
     def call_server(self, neutron_client, search_opts, parsed_args):
         _id = neutronV20.find_resourceid_by_name_or_id(neutron_client,
@@ -331,7 +334,8 @@ class GetLbaasAgentHostingLoadBalancer(neutronV20.ListCommand):
 
     def extend_list(self, data, parsed_args):
         for agent in data:
-            agent['alive'] = ":-)" if agent['alive'] else 'xxx'
+            if 'alive' in agent:
+                agent['alive'] = ":-)" if agent['alive'] else 'xxx'
 
     def call_server(self, neutron_client, search_opts, parsed_args):
         _id = neutronV20.find_resourceid_by_name_or_id(
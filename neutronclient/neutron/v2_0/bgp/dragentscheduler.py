@@ -107,7 +107,8 @@ class ListDRAgentsHostingBGPSpeaker(neutronV20.ListCommand):
 
     def extend_list(self, data, parsed_args):
         for agent in data:
-            agent['alive'] = ":-)" if agent['alive'] else 'xxx'
+            if 'alive' in agent:
+                agent['alive'] = ":-)" if agent['alive'] else 'xxx'
 
     def call_server(self, neutron_client, search_opts, parsed_args):
         _speaker_id = bgp_speaker.get_bgp_speaker_id(neutron_client,
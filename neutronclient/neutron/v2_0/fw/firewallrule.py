@@ -84,6 +84,14 @@ class ListFirewallRule(neutronv20.ListCommand):
     list_columns = ['id', 'name', 'firewall_policy_id', 'summary', 'enabled']
     pagination_support = True
     sorting_support = True
+    summary_fields = ['protocol', 'source_ip_address', 'source_port',
+                      'destination_ip_address', 'destination_port', 'action']
+
+    def get_required_fields(self, fields):
+        if 'summary' in fields:
+            fields.remove('summary')
+            fields += [f for f in self.summary_fields if f not in fields]
+        return fields
 
     def extend_list(self, data, parsed_args):
         for d in data:
@@ -17,7 +17,6 @@
 import argparse
 
 from neutronclient._i18n import _
-from neutronclient.common import exceptions
 from neutronclient.common import utils
 from neutronclient.neutron import v2_0 as neutronV20
 from neutronclient.neutron.v2_0 import availability_zone
@@ -41,9 +40,6 @@ def args2body_common(body, parsed_args):
 class ListNetwork(neutronV20.ListCommand):
     """List networks that belong to a given tenant."""
 
-    # Length of a query filter on subnet id
-    # id=<uuid>& (with len(uuid)=36)
-    subnet_id_filter_len = 40
     resource = 'network'
     _formatters = {'subnets': _format_subnets, }
     list_columns = ['id', 'name', 'subnets']
@@ -101,25 +97,9 @@ class ListNetwork(neutronV20.ListCommand):
             if 'subnets' in n:
                 subnet_ids.extend(n['subnets'])
 
-        def _get_subnet_list(sub_ids):
-            search_opts['id'] = sub_ids
-            return neutron_client.list_subnets(
-                **search_opts).get('subnets', [])
-
-        try:
-            subnets = _get_subnet_list(subnet_ids)
-        except exceptions.RequestURITooLong as uri_len_exc:
-            # The URI is too long because of too many subnet_id filters
-            # Use the excess attribute of the exception to know how many
-            # subnet_id filters can be inserted into a single request
-            subnet_count = len(subnet_ids)
-            max_size = ((self.subnet_id_filter_len * subnet_count) -
-                        uri_len_exc.excess)
-            chunk_size = max_size // self.subnet_id_filter_len
-            subnets = []
-            for i in range(0, subnet_count, chunk_size):
-                subnets.extend(
-                    _get_subnet_list(subnet_ids[i: i + chunk_size]))
+        subnets = neutron_client.list_chunked(
+            neutron_client.list_subnets, 'id', subnet_ids,
+            **search_opts).get('subnets', [])
 
         subnet_dict = dict([(s['id'], s) for s in subnets])
         for n in data:
@@ -13,37 +13,99 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 #
+import collections
+from concurrent import futures
+import json
+import os
 import sys
+import tempfile
+import time
 
 from neutronclient._i18n import _
+from neutronclient.common import exceptions
+from neutronclient.common import retry
+from neutronclient.common import validators
 from neutronclient.neutron import v2_0 as neutronV20
 
 
 class Purge(neutronV20.NeutronCommand):
     """Delete all resources that belong to a given tenant."""
 
+    # The types of resources supported, each with the types of the
+    # resources which must be deleted before it.
+    dependencies = collections.OrderedDict([
+        ('floatingip', ()),
+        ('port', ('floatingip',)),
+        ('router', ('floatingip', 'port')),
+        ('network', ('port', 'router')),
+        ('security_group', ('port',)),
+    ])
+
+    # The owners of the ports which cannot be deleted directly but are
+    # deleted along with their router or floating IP. They are left out
+    # of the purge rather than failing with a conflict.
+    owned_port_owners = ('network:router_gateway',
+                         'network:router_ha_interface',
+                         'network:router_centralized_snat',
+                         'network:floatingip')
+
+    # How the deletions failing with a conflict, e.g. because of a port
+    # still being unbound, are retried.
+    retry_policy = retry.RetryPolicy(retries=3, backoff=0.5, max_backoff=5)
+
+    # Minimum number of seconds between two progress updates.
+    progress_interval = 0.5
+
     def _pluralize(self, string):
         return string + 's'
 
-    def _get_resources(self, neutron_client, resource_types, tenant_id):
-        resources = []
-        for resource_type in resource_types:
-            resources.append([])
-            resource_type_plural = self._pluralize(resource_type)
-            opts = {'fields': ['id', 'tenant_id']}
-            if resource_type_plural == 'ports':
-                opts['fields'].append('device_id')
-                opts['fields'].append('device_owner')
-            function = getattr(neutron_client, 'list_%s' %
-                               resource_type_plural)
-            if callable(function):
-                returned_resources = function(**opts).get(resource_type_plural,
-                                                          [])
-                for resource in returned_resources:
-                    if resource['tenant_id'] == tenant_id:
-                        index = resource_types.index(resource_type)
-                        resources[index].append(resource)
-                        self.total_resources += 1
+    def _get_levels(self, resource_types):
+        """Group the resource types by deletion level.
+
+        The resources of a level only depend on the resources of the
+        previous levels, so that they can all be deleted at the same time.
+        """
+        levels = []
+        done = set()
+        pending = list(resource_types)
+        while pending:
+            level = [t for t in pending
+                     if all(d in done or d not in resource_types
+                            for d in self.dependencies.get(t, ()))]
+            if not level:
+                raise ValueError(_('Circular dependency between %s') %
+                                 ', '.join(pending))
+            levels.append(level)
+            done.update(level)
+            pending = [t for t in pending if t not in done]
+        return levels
+
+    def _list_resources(self, neutron_client, resource_type, tenant_id,
+                        page_size=None):
+        resource_type_plural = self._pluralize(resource_type)
+        # Let the server filter the resources of the tenant, so that only
+        # these are transferred, and decode them as they arrive rather
+        # than page by page.
+        opts = {'fields': ['id', 'tenant_id'], 'tenant_id': tenant_id}
+        if resource_type_plural == 'ports':
+            opts['fields'].append('device_id')
+            opts['fields'].append('device_owner')
+        if page_size:
+            opts['limit'] = page_size
+        function = getattr(neutron_client, 'list_%s' % resource_type_plural)
+        return [resource for resource in function(stream=True, **opts)
+                if resource.get('tenant_id') == tenant_id and
+                resource.get('device_owner') not in self.owned_port_owners]
+
+    def _get_resources(self, neutron_client, resource_types, tenant_id,
+                       parallel=1, page_size=None):
+        # All the types are listed at the same time.
+        with futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+            jobs = [executor.submit(self._list_resources, neutron_client,
+                                    resource_type, tenant_id, page_size)
+                    for resource_type in resource_types]
+            resources = [job.result() for job in jobs]
+        self.total_resources += sum(len(r) for r in resources)
         return resources
 
     def _delete_resource(self, neutron_client, resource_type, resource):
@@ -60,34 +122,142 @@ class Purge(neutronV20.NeutronCommand):
         if callable(function):
             function(resource_id)
 
+    def _try_delete_resource(self, neutron_client, resource_type, resource):
+        """Delete a resource, retrying on conflicts.
+
+        Whether the resource is gone is returned.
+        """
+        retries = 0
+        while True:
+            try:
+                self._delete_resource(neutron_client, resource_type,
+                                      resource)
+                return True
+            except exceptions.NotFound:
+                # Deleted meanwhile.
+                return True
+            except exceptions.Conflict:
+                if retries >= self.retry_policy.retries:
+                    return False
+                time.sleep(self.retry_policy.get_delay(retries))
+                retries += 1
+            except Exception:
+                return False
+
+    def _report_progress(self, force=False):
+        now = time.time()
+        if not force and now - self._progress_time < self.progress_interval:
+            return
+        self._progress_time = now
+        percent_complete = 100
+        if self.total_resources > 0:
+            percent_complete = (self.deleted_resources /
+                                float(self.total_resources)) * 100
+        sys.stdout.write("\rPurging resources: %d%% complete." %
+                         percent_complete)
+        sys.stdout.flush()
+
     def _purge_resources(self, neutron_client, resource_types,
-                         tenant_resources):
-        deleted = {}
-        failed = {}
-        failures = False
-        for resources in tenant_resources:
-            index = tenant_resources.index(resources)
-            resource_type = resource_types[index]
-            failed[resource_type] = 0
-            deleted[resource_type] = 0
-            for resource in resources:
-                try:
-                    self._delete_resource(neutron_client, resource_type,
-                                          resource)
-                    deleted[resource_type] += 1
-                    self.deleted_resources += 1
-                except Exception:
-                    failures = True
-                    failed[resource_type] += 1
-                    self.total_resources -= 1
-                percent_complete = 100
-                if self.total_resources > 0:
-                    percent_complete = (self.deleted_resources /
-                                        float(self.total_resources)) * 100
-                sys.stdout.write("\rPurging resources: %d%% complete." %
-                                 percent_complete)
-                sys.stdout.flush()
-        return (deleted, failed, failures)
+                         tenant_resources, parallel=1, checkpoint=None):
+        """Delete the resources, level by level.
+
+        If checkpoint is given, it is a file to which a "<type> <id>"
+        line is written for every resource deleted.
+        """
+        deleted = dict((resource_type, 0) for resource_type in resource_types)
+        failed = dict((resource_type, 0) for resource_type in resource_types)
+        resources = dict(zip(resource_types, tenant_resources))
+        self._progress_time = 0
+        with futures.ThreadPoolExecutor(max_workers=parallel) as executor:
+            for level in self._get_levels(resource_types):
+                jobs = dict((executor.submit(self._try_delete_resource,
+                                             neutron_client, resource_type,
+                                             resource),
+                             (resource_type, resource['id']))
+                            for resource_type in level
+                            for resource in resources[resource_type])
+                for job in futures.as_completed(jobs):
+                    resource_type, resource_id = jobs[job]
+                    if job.result():
+                        deleted[resource_type] += 1
+                        self.deleted_resources += 1
+                        if checkpoint is not None:
+                            checkpoint.write('%s %s\n' % (resource_type,
+                                                          resource_id))
+                            checkpoint.flush()
+                    else:
+                        failed[resource_type] += 1
+                        self.total_resources -= 1
+                    self._report_progress()
+        if any(tenant_resources):
+            self._report_progress(force=True)
+        return (deleted, failed, any(failed.values()))
+
+    def _build_plan(self, tenant_id, resource_types, tenant_resources):
+        return {'tenant': tenant_id,
+                'levels': self._get_levels(resource_types),
+                'resources': dict(zip(resource_types, tenant_resources))}
+
+    def _save_plan(self, path, plan):
+        # Replace the plan atomically, an interrupted write must not
+        # leave a truncated plan to resume from.
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(plan, f)
+            getattr(os, 'replace', os.rename)(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def _load_plan(self, path):
+        """Return the plan saved in path, None if there is none."""
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (IOError, OSError):
+            return None
+        except ValueError:
+            raise exceptions.CommandError(
+                _('Invalid purge plan file %s.') % path)
+
+    def _load_checkpoint(self, path):
+        """Return the (type, id) pairs of the resources already deleted."""
+        completed = set()
+        try:
+            with open(path) as f:
+                for line in f:
+                    fields = line.split()
+                    # An interrupted write may leave an incomplete line.
+                    if len(fields) == 2:
+                        completed.add(tuple(fields))
+        except (IOError, OSError):
+            pass
+        return completed
+
+    def _build_plan_message(self, plan, page_size=None):
+        msg = [_('Purge plan for tenant %s:') % plan['tenant']]
+        total = 0
+        list_requests = 0
+        for index, level in enumerate(plan['levels']):
+            counts = []
+            for resource_type in level:
+                value = len(plan['resources'][resource_type])
+                total += value
+                if page_size:
+                    list_requests += value // page_size + 1
+                else:
+                    list_requests += 1
+                if not value == 1:
+                    resource_type = self._pluralize(resource_type)
+                counts.append("%d %s" % (value, resource_type))
+            msg.append(_('  Step %(step)d: %(counts)s') %
+                       {'step': index + 1, 'counts': ', '.join(counts)})
+        msg.append(_('Estimated requests: %(lists)d to list the resources, '
+                     '%(deletes)d to delete them.') %
+                   {'lists': list_requests, 'deletes': total})
+        return '\n'.join(msg)
 
     def _build_message(self, deleted, failed, failures):
         msg = ''
@@ -126,25 +296,84 @@ class Purge(neutronV20.NeutronCommand):
         parser.add_argument(
             'tenant', metavar='TENANT',
             help=_('ID of Tenant owning the resources to be deleted.'))
+        parser.add_argument(
+            '--parallel', metavar='N', type=int, default=10,
+            help=_('Maximum number of requests sent at the same time. '
+                   'Defaults to 10.'))
+        neutronV20.add_pagination_argument(parser)
+        parser.add_argument(
+            '--plan-file', metavar='FILE',
+            help=_('Save the resources to be deleted to FILE, and log the '
+                   'resources deleted to FILE.done.'))
+        parser.add_argument(
+            '--resume', action='store_true',
+            help=_('Resume an interrupted purge from the plan saved with '
+                   '--plan-file, instead of listing the resources again, '
+                   'and skip the resources already deleted.'))
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help=_('Only show the resources which would be deleted.'))
         return parser
 
     def take_action(self, parsed_args):
+        validators.validate_int_range(parsed_args, 'parallel', 1)
+        validators.validate_int_range(parsed_args, 'page_size', 1)
         neutron_client = self.get_client()
 
         self.any_failures = False
 
-        # A list of the types of resources supported in the order in which
-        # they should be deleted.
-        resource_types = ['floatingip', 'port', 'router',
-                          'network', 'security_group']
+        resource_types = list(self.dependencies)
 
         deleted = {}
         failed = {}
         self.total_resources = 0
         self.deleted_resources = 0
-        resources = self._get_resources(neutron_client, resource_types,
-                                        parsed_args.tenant)
-        deleted, failed, failures = self._purge_resources(neutron_client,
-                                                          resource_types,
-                                                          resources)
+        plan_file = parsed_args.plan_file
+        checkpoint_file = plan_file and plan_file + '.done'
+        plan = None
+        if parsed_args.resume:
+            if not plan_file:
+                raise exceptions.CommandError(
+                    _('--resume requires --plan-file.'))
+            plan = self._load_plan(plan_file)
+            if plan and plan['tenant'] != parsed_args.tenant:
+                raise exceptions.CommandError(
+                    _('The purge plan %(file)s is for tenant %(tenant)s.') %
+                    {'file': plan_file, 'tenant': plan['tenant']})
+        if plan:
+            completed = self._load_checkpoint(checkpoint_file)
+            resources = [[resource for resource in
+                          plan['resources'].get(resource_type, [])
+                          if (resource_type, resource['id']) not in completed]
+                         for resource_type in resource_types]
+            self.total_resources = sum(len(r) for r in resources)
+        else:
+            resources = self._get_resources(neutron_client, resource_types,
+                                            parsed_args.tenant,
+                                            parsed_args.parallel,
+                                            parsed_args.page_size)
+            if plan_file:
+                self._save_plan(plan_file, self._build_plan(
+                    parsed_args.tenant, resource_types, resources))
+                # Deletions logged for a previous plan no longer apply.
+                if os.path.exists(checkpoint_file):
+                    os.remove(checkpoint_file)
+
+        if parsed_args.dry_run:
+            print(self._build_plan_message(
+                self._build_plan(parsed_args.tenant, resource_types,
+                                 resources),
+                parsed_args.page_size))
+            return
+
+        checkpoint = None
+        if checkpoint_file:
+            checkpoint = open(checkpoint_file, 'a')
+        try:
+            deleted, failed, failures = self._purge_resources(
+                neutron_client, resource_types, resources,
+                parsed_args.parallel, checkpoint)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
         print('\n%s' % self._build_message(deleted, failed, failures))
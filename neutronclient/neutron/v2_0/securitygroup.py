@@ -17,7 +17,6 @@
 import argparse
 
 from neutronclient._i18n import _
-from neutronclient.common import exceptions
 from neutronclient.common import utils
 from neutronclient.neutron import v2_0 as neutronV20
 
@@ -232,28 +231,9 @@ class ListSecurityGroupRule(neutronV20.ListCommand):
                     sec_group_ids.add(rule[key])
         sec_group_ids = list(sec_group_ids)
 
-        def _get_sec_group_list(sec_group_ids):
-            search_opts['id'] = sec_group_ids
-            return neutron_client.list_security_groups(
-                **search_opts).get('security_groups', [])
-
-        try:
-            secgroups = _get_sec_group_list(sec_group_ids)
-        except exceptions.RequestURITooLong as uri_len_exc:
-            # Length of a query filter on security group rule id
-            # id=<uuid>& (with len(uuid)=36)
-            sec_group_id_filter_len = 40
-            # The URI is too long because of too many sec_group_id filters
-            # Use the excess attribute of the exception to know how many
-            # sec_group_id filters can be inserted into a single request
-            sec_group_count = len(sec_group_ids)
-            max_size = ((sec_group_id_filter_len * sec_group_count) -
-                        uri_len_exc.excess)
-            chunk_size = max_size // sec_group_id_filter_len
-            secgroups = []
-            for i in range(0, sec_group_count, chunk_size):
-                secgroups.extend(
-                    _get_sec_group_list(sec_group_ids[i: i + chunk_size]))
+        secgroups = neutron_client.list_chunked(
+            neutron_client.list_security_groups, 'id', sec_group_ids,
+            **search_opts).get('security_groups', [])
 
         return dict([(sg['id'], sg['name'])
                      for sg in secgroups if sg['name']])
@@ -292,6 +272,10 @@ class ListSecurityGroupRule(neutronV20.ListCommand):
             parsed_args.columns = cols
         return (cols, info[1])
 
+    def get_data_columns(self, columns):
+        return self.replace_columns(columns, self.replace_rules,
+                                    reverse=True)
+
 
 class ShowSecurityGroupRule(neutronV20.ShowCommand):
     """Show information of a given security group rule."""
@@ -160,12 +160,10 @@ def _get_common_attrs(client_manager, parsed_args, is_create=True):
     if parsed_args.description:
         attrs['description'] = str(parsed_args.description)
     if parsed_args.port and parsed_args.no_port:
-        attrs['ports'] = sorted([client.find_resource(
-            'port', p)['id'] for p in set(parsed_args.port)])
+        attrs['ports'] = sorted(set(client.find_resource_ids(
+            'port', parsed_args.port)))
     elif parsed_args.port:
-        ports = []
-        for p in set(parsed_args.port):
-            ports.append(client.find_resource('port', p)['id'])
+        ports = client.find_resource_ids('port', parsed_args.port)
         if not is_create:
             ports += client.find_resource(
                 const.FWG, parsed_args.firewall_group,
@@ -383,8 +381,7 @@ class UnsetFirewallGroup(command.Command):
             old = client.find_resource(
                 const.FWG, parsed_args.firewall_group,
                 cmd_resource=const.CMD_FWG)['ports']
-            new = [client.find_resource(
-                'port', r)['id'] for r in parsed_args.port]
+            new = client.find_resource_ids('port', parsed_args.port)
             attrs['ports'] = sorted(list(set(old) - set(new)))
         if parsed_args.all_port:
             attrs['ports'] = []
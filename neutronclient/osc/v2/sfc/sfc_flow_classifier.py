@@ -281,14 +281,13 @@ def _get_attrs(client_manager, attrs, parsed_args):
         attrs['source_ip_prefix'] = parsed_args.source_ip_prefix
     if parsed_args.destination_ip_prefix is not None:
         attrs['destination_ip_prefix'] = parsed_args.destination_ip_prefix
-    if parsed_args.logical_source_port is not None:
-        attrs['logical_source_port'] = _get_id(
-            client_manager.neutronclient, parsed_args.logical_source_port,
-            'port')
-    if parsed_args.logical_destination_port is not None:
-        attrs['logical_destination_port'] = _get_id(
-            client_manager.neutronclient, parsed_args.logical_destination_port,
-            'port')
+    # Look the logical source and destination ports up at once.
+    keys = [key for key in ('logical_source_port', 'logical_destination_port')
+            if getattr(parsed_args, key) is not None]
+    if keys:
+        attrs.update(zip(keys, _get_ids(
+            client_manager.neutronclient,
+            [getattr(parsed_args, key) for key in keys], 'port')))
     if parsed_args.source_port is not None:
         _fill_protocol_port_info(attrs, 'source',
                                         parsed_args.source_port)
@@ -317,4 +316,8 @@ def _fill_protocol_port_info(attrs, port_type, port_val):
 
 
 def _get_id(client, id_or_name, resource):
-    return client.find_resource(resource, id_or_name)['id']
+    return _get_ids(client, [id_or_name], resource)[0]
+
+
+def _get_ids(client, ids_or_names, resource):
+    return client.find_resource_ids(resource, ids_or_names)
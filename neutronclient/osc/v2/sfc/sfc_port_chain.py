@@ -197,10 +197,9 @@ class SetSfcPortChain(command.Command):
                 fc_list = client.find_resource(
                     resource, parsed_args.port_chain,
                     cmd_resource='sfc_port_chain')['flow_classifiers']
-            for fc in parsed_args.flow_classifiers:
-                fc_id = client.find_resource(
-                    'flow_classifier', fc,
-                    cmd_resource='sfc_flow_classifier')['id']
+            for fc_id in client.find_resource_ids(
+                    'flow_classifier', parsed_args.flow_classifiers,
+                    cmd_resource='sfc_flow_classifier'):
                 if fc_id not in fc_list:
                     fc_list.append(fc_id)
             attrs['flow_classifiers'] = fc_list
@@ -210,10 +209,9 @@ class SetSfcPortChain(command.Command):
             raise exceptions.CommandError(message)
         if parsed_args.no_port_pair_group and parsed_args.port_pair_groups:
             ppg_list = []
-            for ppg in parsed_args.port_pair_groups:
-                ppg_id = client.find_resource(
-                    'port_pair_group', ppg,
-                    cmd_resource='sfc_port_pair_group')['id']
+            for ppg_id in client.find_resource_ids(
+                    'port_pair_group', parsed_args.port_pair_groups,
+                    cmd_resource='sfc_port_pair_group'):
                 if ppg_id not in ppg_list:
                     ppg_list.append(ppg_id)
             attrs['port_pair_groups'] = ppg_list
@@ -222,10 +220,9 @@ class SetSfcPortChain(command.Command):
             ppg_list = client.find_resource(
                 resource, parsed_args.port_chain,
                 cmd_resource='sfc_port_chain')['port_pair_groups']
-            for ppg in parsed_args.port_pair_groups:
-                ppg_id = client.find_resource(
-                    'port_pair_group', ppg,
-                    cmd_resource='sfc_port_pair_group')['id']
+            for ppg_id in client.find_resource_ids(
+                    'port_pair_group', parsed_args.port_pair_groups,
+                    cmd_resource='sfc_port_pair_group'):
                 if ppg_id not in ppg_list:
                     ppg_list.append(ppg_id)
             attrs['port_pair_groups'] = ppg_list
@@ -297,10 +294,9 @@ class UnsetSfcPortChain(command.Command):
             fc_list = client.find_resource(
                 resource, parsed_args.port_chain,
                 cmd_resource='sfc_port_chain')['flow_classifiers']
-            for fc in parsed_args.flow_classifiers:
-                fc_id = client.find_resource(
-                    'flow_classifier', fc,
-                    cmd_resource='sfc_flow_classifier')['id']
+            for fc_id in client.find_resource_ids(
+                    'flow_classifier', parsed_args.flow_classifiers,
+                    cmd_resource='sfc_flow_classifier'):
                 if fc_id in fc_list:
                     fc_list.remove(fc_id)
             attrs['flow_classifiers'] = fc_list
@@ -310,10 +306,9 @@ class UnsetSfcPortChain(command.Command):
             ppg_list = client.find_resource(
                 resource, parsed_args.port_chain,
                 cmd_resource='sfc_port_chain')['port_pair_groups']
-            for ppg in parsed_args.port_pair_groups:
-                ppg_id = client.find_resource(
-                    'port_pair_group', ppg,
-                    cmd_resource='sfc_port_pair_group')['id']
+            for ppg_id in client.find_resource_ids(
+                    'port_pair_group', parsed_args.port_pair_groups,
+                    cmd_resource='sfc_port_pair_group'):
                 if ppg_id in ppg_list:
                     ppg_list.remove(ppg_id)
             if ppg_list == []:
@@ -336,15 +331,17 @@ def _get_common_attrs(client_manager, parsed_args, is_create=True):
         attrs['name'] = parsed_args.name
     if parsed_args.description is not None:
         attrs['description'] = parsed_args.description
-    if parsed_args.port_pair_groups:
-        attrs['port_pair_groups'] = [(_get_id(client_manager.neutronclient,
-                                              ppg, 'port_pair_group'))
-                                     for ppg in parsed_args.port_pair_groups]
-    if parsed_args.flow_classifiers:
-        attrs['flow_classifiers'] = [(_get_id(client_manager.neutronclient, fc,
-                                      'flow_classifier'))
-                                     for fc in parsed_args.flow_classifiers]
     if is_create is True:
+        # SetSfcPortChain merges the port pair groups and flow
+        # classifiers with those of the port chain itself.
+        if parsed_args.port_pair_groups:
+            attrs['port_pair_groups'] = _get_ids(
+                client_manager.neutronclient, parsed_args.port_pair_groups,
+                'port_pair_group')
+        if parsed_args.flow_classifiers:
+            attrs['flow_classifiers'] = _get_ids(
+                client_manager.neutronclient, parsed_args.flow_classifiers,
+                'flow_classifier')
         _get_attrs(attrs, parsed_args)
     return attrs
 
@@ -361,4 +358,8 @@ def _get_attrs(attrs, parsed_args):
 
 
 def _get_id(client, id_or_name, resource):
-    return client.find_resource(resource, id_or_name)['id']
+    return _get_ids(client, [id_or_name], resource)[0]
+
+
+def _get_ids(client, ids_or_names, resource):
+    return client.find_resource_ids(resource, ids_or_names)
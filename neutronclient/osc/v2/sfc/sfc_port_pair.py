@@ -200,12 +200,13 @@ def _get_common_attrs(client_manager, parsed_args, is_create=True):
 
 
 def _get_attrs(client_manager, attrs, parsed_args):
-    if parsed_args.ingress is not None:
-        attrs['ingress'] = _get_id(client_manager.neutronclient,
-                                   parsed_args.ingress, 'port')
-    if parsed_args.egress is not None:
-        attrs['egress'] = _get_id(client_manager.neutronclient,
-                                  parsed_args.egress, 'port')
+    # Look the ingress and egress ports up at once.
+    keys = [key for key in ('ingress', 'egress')
+            if getattr(parsed_args, key) is not None]
+    if keys:
+        attrs.update(zip(keys, _get_ids(
+            client_manager.neutronclient,
+            [getattr(parsed_args, key) for key in keys], 'port')))
     if parsed_args.service_function_parameters is not None:
         attrs['service_function_parameters'] = _get_service_function_params(
             parsed_args.service_function_parameters)
@@ -225,4 +226,8 @@ def _get_service_function_params(sf_params):
 
 
 def _get_id(client, id_or_name, resource):
-    return client.find_resource(resource, id_or_name)['id']
+    return _get_ids(client, [id_or_name], resource)[0]
+
+
+def _get_ids(client, ids_or_names, resource):
+    return client.find_resource_ids(resource, ids_or_names)
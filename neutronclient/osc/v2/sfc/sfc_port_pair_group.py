@@ -182,9 +182,9 @@ class SetSfcPortPairGroup(command.Command):
         if parsed_args.no_port_pair:
             attrs['port_pairs'] = []
         if parsed_args.port_pairs:
-            added = [client.find_resource('port_pair', pp,
-                                          cmd_resource='sfc_port_pair')['id']
-                     for pp in parsed_args.port_pairs]
+            added = client.find_resource_ids('port_pair',
+                                             parsed_args.port_pairs,
+                                             cmd_resource='sfc_port_pair')
             if parsed_args.no_port_pair:
                 existing = []
             else:
@@ -253,9 +253,9 @@ class UnsetSfcPortPairGroup(command.Command):
             existing = client.find_resource(
                 resource, parsed_args.port_pair_group,
                 cmd_resource='sfc_port_pair_group')['port_pairs']
-            removed = [client.find_resource('port_pair', pp,
-                       cmd_resource='sfc_port_pair')['id']
-                       for pp in parsed_args.port_pairs]
+            removed = client.find_resource_ids('port_pair',
+                                               parsed_args.port_pairs,
+                                               cmd_resource='sfc_port_pair')
             attrs['port_pairs'] = list(set(existing) - set(removed))
         if parsed_args.all_port_pair:
             attrs['port_pairs'] = []
@@ -285,11 +285,13 @@ def _get_common_attrs(client_manager, parsed_args, is_create=True):
         attrs['name'] = parsed_args.name
     if parsed_args.description is not None:
         attrs['description'] = parsed_args.description
-    if parsed_args.port_pairs:
-        attrs['port_pairs'] = [(_get_id(client_manager.neutronclient, pp,
-                                        'port_pair'))
-                               for pp in parsed_args.port_pairs]
     if is_create:
+        # SetSfcPortPairGroup merges the port pairs with those of the
+        # port pair group itself.
+        if parsed_args.port_pairs:
+            attrs['port_pairs'] = _get_ids(client_manager.neutronclient,
+                                           parsed_args.port_pairs,
+                                           'port_pair')
         _get_attrs(attrs, parsed_args)
     return attrs
 
@@ -305,4 +307,8 @@ def _get_attrs(attrs, parsed_args):
 
 
 def _get_id(client, id_or_name, resource):
-    return client.find_resource(resource, id_or_name)['id']
+    return _get_ids(client, [id_or_name], resource)[0]
+
+
+def _get_ids(client, ids_or_names, resource):
+    return client.find_resource_ids(resource, ids_or_names)
@@ -179,10 +179,10 @@ def _get_common_attrs(client_manager, parsed_args, is_create=True):
     return attrs
 
 
-def _validate_destination_chains(comma_split, attrs, client_manager, sc_):
+def _validate_destination_chains(comma_split, attrs, chain_ids, sc_):
     for e in comma_split:
         if e != "":
-            dc_ = _get_id(client_manager.neutronclient, e, 'port_chain')
+            dc_ = chain_ids[e]
             attrs['port_chains'][sc_].append(dc_)
             if _check_cycle(attrs['port_chains'], sc_, dc_):
                 raise(exceptions.CommandError(
@@ -217,15 +217,23 @@ def _get_attrs_for_create(client_manager, attrs, parsed_args):
     if parsed_args.branching_points:
         attrs['port_chains'] = {}
         src_chain = None
+        chains = []
         for c in parsed_args.branching_points:
             if ':' not in c:
                 raise exceptions.CommandError(
                     "Error: You must specify at least one "
                     "destination chain for each source chain.")
             colon_split = c.split(':')
+            chains.append(colon_split[0])
+            for i in colon_split[1:]:
+                chains.extend(e for e in i.split(',') if e)
+        # Look all the port chains up at once.
+        chain_ids = dict(zip(chains, _get_ids(client_manager.neutronclient,
+                                              chains, 'port_chain')))
+        for c in parsed_args.branching_points:
+            colon_split = c.split(':')
             src_chain = colon_split.pop(0)
-            sc_ = _get_id(client_manager.neutronclient,
-                          src_chain, 'port_chain')
+            sc_ = chain_ids[src_chain]
             for i in colon_split:
                 comma_split = i.split(',')
                 unique = set(comma_split)
@@ -240,8 +248,12 @@ def _get_attrs_for_create(client_manager, attrs, parsed_args):
                         "use already ".format(src_chain))
                 attrs['port_chains'][sc_] = []
                 _validate_destination_chains(
-                    comma_split, attrs, client_manager, sc_)
+                    comma_split, attrs, chain_ids, sc_)
 
 
 def _get_id(client, id_or_name, resource):
-    return client.find_resource(resource, id_or_name)['id']
+    return _get_ids(client, [id_or_name], resource)[0]
+
+
+def _get_ids(client, ids_or_names, resource):
+    return client.find_resource_ids(resource, ids_or_names)
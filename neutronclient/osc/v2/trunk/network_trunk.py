@@ -108,9 +108,12 @@ class DeleteNetworkTrunk(command.Command):
     def take_action(self, parsed_args):
         client = self.app.client_manager.neutronclient
         result = 0
-        for trunk in parsed_args.trunk:
+        trunk_ids = _get_ids(client, parsed_args.trunk, TRUNK,
+                             return_exceptions=True)
+        for trunk, trunk_id in zip(parsed_args.trunk, trunk_ids):
             try:
-                trunk_id = _get_id(client, trunk, TRUNK)
+                if isinstance(trunk_id, Exception):
+                    raise trunk_id
                 client.delete_trunk(trunk_id)
             except Exception as e:
                 result += 1
@@ -139,7 +142,6 @@ class ListNetworkTrunk(command.Lister):
 
     def take_action(self, parsed_args):
         client = self.app.client_manager.neutronclient
-        data = client.list_trunks()
         headers = (
             'ID',
             'Name',
@@ -165,6 +167,8 @@ class ListNetworkTrunk(command.Lister):
                 'created_at',
                 'updated_at'
             )
+        # Only fetch the fields which are displayed.
+        data = client.list_trunks(fields=list(columns))
         return (headers,
                 (osc_utils.get_dict_properties(
                     s, columns,
@@ -353,12 +357,13 @@ def _get_attrs_for_trunk(client_manager, parsed_args):
 
 def _format_subports(client_manager, subports):
     attrs = []
+    ports = [subport['port'] for subport in subports if subport.get('port')]
+    port_ids = dict(zip(ports, _get_ids(client_manager.neutronclient,
+                                        ports, 'port')))
     for subport in subports:
         subport_attrs = {}
         if subport.get('port'):
-            port_id = _get_id(client_manager.neutronclient,
-                              subport['port'], 'port')
-            subport_attrs['port_id'] = port_id
+            subport_attrs['port_id'] = port_ids[subport['port']]
         if subport.get('segmentation-id'):
             try:
                 subport_attrs['segmentation_id'] = int(
@@ -380,14 +385,17 @@ def _get_attrs_for_subports(client_manager, parsed_args):
                                             parsed_args.set_subports)
     if ('unset_subports' in parsed_args and
             parsed_args.unset_subports is not None):
-        subports_list = []
-        for subport in parsed_args.unset_subports:
-            port_id = _get_id(client_manager.neutronclient,
-                              subport, 'port')
-            subports_list.append({'port_id': port_id})
-        attrs[SUB_PORTS] = subports_list
+        port_ids = _get_ids(client_manager.neutronclient,
+                            parsed_args.unset_subports, 'port')
+        attrs[SUB_PORTS] = [{'port_id': port_id} for port_id in port_ids]
     return attrs
 
 
 def _get_id(client, id_or_name, resource):
-    return client.find_resource(resource, str(id_or_name))['id']
+    return _get_ids(client, [id_or_name], resource)[0]
+
+
+def _get_ids(client, ids_or_names, resource, return_exceptions=False):
+    return client.find_resource_ids(
+        resource, [str(id_or_name) for id_or_name in ids_or_names],
+        return_exceptions=return_exceptions)
@@ -21,14 +21,20 @@ Command-line interface to the Neutron APIs
 from __future__ import print_function
 
 import argparse
+import hashlib
 import inspect
-import itertools
+import json
 import logging
 import os
 import sys
+import tempfile
+
+try:
+    from collections import abc as collections_abc
+except ImportError:
+    # Python 2
+    import collections as collections_abc
 
-from keystoneauth1 import session
-import os_client_config
 from oslo_utils import encodeutils
 from oslo_utils import netutils
 
@@ -37,12 +43,14 @@ from cliff import command
 from cliff import commandmanager
 
 from neutronclient._i18n import _
-from neutronclient.common import clientmanager
 from neutronclient.common import exceptions as exc
 from neutronclient.common import extension as client_extension
-from neutronclient.neutron.v2_0 import subnet
 from neutronclient.version import __version__
 
+# NOTE: keystoneauth1.session, os_client_config, the client manager and the
+# command modules are only imported when needed, they account for most of
+# the start-up time of the CLI.
+
 
 VERSION = '2.0'
 NEUTRON_API_VERSION = '2.0'
@@ -59,7 +67,8 @@ def run_command(cmd, cmd_parser, sub_argv):
         _argv = sub_argv[:index]
         values_specs = sub_argv[index:]
     known_args, _values_specs = cmd_parser.parse_known_args(_argv)
-    if(isinstance(cmd, subnet.CreateSubnet) and not known_args.cidr):
+    from neutronclient.neutron.v2_0 import subnet
+    if isinstance(cmd, subnet.CreateSubnet) and not known_args.cidr:
         cidr = get_first_valid_cidr(_values_specs)
         if cidr:
             known_args.cidr = cidr
@@ -92,6 +101,13 @@ def env(*_vars, **kwargs):
     return kwargs.get('default', '')
 
 
+def get_completion_cache_path():
+    cache_dir = env('XDG_CACHE_HOME',
+                    default=os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cache_dir, 'python-neutronclient',
+                        'bash-completion.json')
+
+
 def check_non_negative_int(value):
     try:
         value = int(value)
@@ -106,12 +122,33 @@ def check_non_negative_int(value):
 COMMANDS = {}
 
 
+class _CommandsDict(collections_abc.Mapping):
+    """Command classes by name, a command module is imported when used."""
+
+    def __init__(self, command_manager):
+        self._command_manager = command_manager
+        self._classes = {}
+
+    def __getitem__(self, name):
+        if name not in self._classes:
+            if name not in self._command_manager.commands:
+                raise KeyError(name)
+            self._classes[name] = (
+                self._command_manager.find_command([name])[0])
+        return self._classes[name]
+
+    def __iter__(self):
+        return iter(self._command_manager.commands)
+
+    def __len__(self):
+        return len(self._command_manager.commands)
+
+
 # NOTE(amotoki): This is only to provide compatibility
 # to existing neutron CLI extensions. See bug 1706573 for detail.
 def _set_commands_dict_for_compat(apiversion, command_manager):
     global COMMANDS
-    COMMANDS = {apiversion: dict((cmd, command_manager.find_command([cmd])[0])
-                                 for cmd in command_manager.commands)}
+    COMMANDS = {apiversion: _CommandsDict(command_manager)}
 
 
 class BashCompletionCommand(command.Command):
@@ -432,42 +469,88 @@ class NeutronShell(app.App):
                    "not be verified against any certificate authorities. "
                    "This option should be used with caution."))
 
+    def _completion_index_key(self):
+        # The distributions installed, neutronclient and its extensions
+        # included, determine the commands and their options.
+        data = json.dumps([sorted(self.command_manager.commands),
+                           client_extension._installed_distributions()])
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _build_completion_index(self):
+        index = {}
+        for _name, _command in self.command_manager:
+            cmd_factory = _command.load()
+            cmd = cmd_factory(self, None)
+            cmd_parser = cmd.get_parser('')
+            index[_name] = sorted(cmd_parser._option_string_actions)
+        return index
+
+    def _get_completion_index(self):
+        """Return the options of every command by command name.
+
+        Building the parsers of all the commands is slow, so the index is
+        cached in a file until a distribution is installed, upgraded or
+        removed.
+        """
+        path = get_completion_cache_path()
+        key = self._completion_index_key()
+        try:
+            with open(path) as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cached['index']
+        except (IOError, OSError, ValueError, AttributeError, KeyError):
+            pass
+        index = self._build_completion_index()
+        try:
+            directory = os.path.dirname(path)
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            fd, tmp_path = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': key, 'index': index}, f)
+            getattr(os, 'replace', os.rename)(tmp_path, path)
+        except (IOError, OSError) as e:
+            self.log.debug("Unable to write the completion index %s: %s",
+                           path, e)
+        return index
+
     def _bash_completion(self):
         """Prints all of the commands and options for bash-completion."""
         commands = set()
         options = set()
         for option, _action in self.parser._option_string_actions.items():
             options.add(option)
-        for _name, _command in self.command_manager:
+        for _name, cmd_options in self._get_completion_index().items():
             commands.add(_name)
-            cmd_factory = _command.load()
-            cmd = cmd_factory(self, None)
-            cmd_parser = cmd.get_parser('')
-            for option, _action in cmd_parser._option_string_actions.items():
-                options.add(option)
+            options.update(cmd_options)
         print(' '.join(commands | options))
 
     def _register_extensions(self, version):
-        for name, module in itertools.chain(
-                client_extension._discover_via_entry_points()):
-            self._extend_shell_commands(name, module, version)
+        for name, cls in client_extension.get_extension_classes(version):
+            self._extend_shell_command(name, cls)
+
+    def _extend_shell_command(self, name, cls):
+        if (issubclass(cls, client_extension.NeutronClientExtension) and
+                hasattr(cls, 'shell_command')):
+            cmd = cls.shell_command
+            try:
+                name_prefix = "[%s]" % name
+                # The classes are shared by the shells of the process.
+                if not (cls.__doc__ or '').startswith(name_prefix):
+                    cls.__doc__ = ("%s %s" % (name_prefix, cls.__doc__) if
+                                   cls.__doc__ else name_prefix)
+                self.command_manager.add_command(cmd, cls)
+            except TypeError:
+                pass
 
     def _extend_shell_commands(self, name, module, version):
         classes = inspect.getmembers(module, inspect.isclass)
         for cls_name, cls in classes:
-            if (issubclass(cls, client_extension.NeutronClientExtension) and
-                    hasattr(cls, 'shell_command')):
-                cmd = cls.shell_command
-                if hasattr(cls, 'versions'):
-                    if version not in cls.versions:
-                        continue
-                try:
-                    name_prefix = "[%s]" % name
-                    cls.__doc__ = ("%s %s" % (name_prefix, cls.__doc__) if
-                                   cls.__doc__ else name_prefix)
-                    self.command_manager.add_command(cmd, cls)
-                except TypeError:
-                    pass
+            if hasattr(cls, 'versions'):
+                if version not in cls.versions:
+                    continue
+            self._extend_shell_command(name, cls)
 
     def run(self, argv):
         """Equivalent to the main program for the application.
@@ -546,6 +629,11 @@ class NeutronShell(app.App):
         Make sure the user has provided all of the authentication
         info we need.
         """
+        from keystoneauth1 import session
+        import os_client_config
+
+        from neutronclient.common import clientmanager
+
         cloud_config = os_client_config.OpenStackConfig().get_one_cloud(
             cloud=self.options.os_cloud, argparse=self.options,
             network_api_version=self.api_version,
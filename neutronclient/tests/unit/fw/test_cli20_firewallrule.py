@@ -167,6 +167,15 @@ class CLITestV20FirewallRuleJSON(test_cli20.CLITestV20Base):
                                             None)
         self._test_list_resources(resources, cmd, page_size=1000)
 
+    def test_list_firewall_rules_summary_required_fields(self):
+        # firewall-rule-list -c id -c summary.
+        cmd = firewallrule.ListFirewallRule(test_cli20.MyApp(sys.stdout),
+                                            None)
+        self.assertEqual(['id'] + cmd.summary_fields,
+                         cmd.get_required_fields(['id', 'summary']))
+        self.assertEqual(['id', 'name'],
+                         cmd.get_required_fields(['id', 'name']))
+
     def test_show_firewall_rule_id(self):
         # firewall-rule-show test_id.
         resource = 'firewall_rule'
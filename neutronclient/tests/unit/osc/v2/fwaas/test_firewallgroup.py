@@ -93,6 +93,8 @@ class TestFirewallGroup(test_fakes.TestNeutronClientOSCV2):
 
         self.neutronclient.find_resource = mock.Mock(
             side_effect=_find_resource)
+        self.neutronclient.find_resource_ids = mock.Mock(
+            side_effect=lambda resource, names_or_ids: list(names_or_ids))
         osc_utils.find_project = mock.Mock()
         osc_utils.find_project.id = _fwg['tenant_id']
         self.res = 'firewall_group'
@@ -426,18 +428,8 @@ class TestSetFirewallGroup(TestFirewallGroup, common.TestSetFWaaS):
                 self.neutronclient.find_resource.assert_called_with(
                     self.res, target, cmd_resource=const.CMD_FWG)
                 return {'id': args[1]}
-            # 2. Find specified 'port' #1
+            # 2. Find specified firewall_group and refer 'ports' attribute
             if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port', args[1])
-                return {'id': args[1]}
-            # 3. Find specified 'port' #2
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port', args[1])
-                return {'id': args[1]}
-            # 4. Find specified firewall_group and refer 'ports' attribute
-            if self.neutronclient.find_resource.call_count == 4:
                 self.neutronclient.find_resource.assert_called_with(
                     self.res, target, cmd_resource=const.CMD_FWG)
                 return {'ports': _fwg['ports']}
@@ -458,7 +450,10 @@ class TestSetFirewallGroup(TestFirewallGroup, common.TestSetFWaaS):
 
         expect = {'ports': sorted(_fwg['ports'] + [port1, port2])}
         self.mocked.assert_called_once_with(target, {self.res: expect})
-        self.assertEqual(4, self.neutronclient.find_resource.call_count)
+        self.assertEqual(2, self.neutronclient.find_resource.call_count)
+        # The ports are looked up at once.
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port', [port1, port2])
         self.assertIsNone(result)
 
     def test_set_no_port(self):
@@ -679,11 +674,6 @@ class TestUnsetFirewallGroup(TestFirewallGroup, common.TestUnsetFWaaS):
                 self.neutronclient.find_resource.assert_called_with(
                     self.res, target, cmd_resource=const.CMD_FWG)
                 return {'ports': _fwg['ports']}
-            # 3. Find specified 'port'
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port', port)
-                return {'id': args[1]}
 
         self.neutronclient.find_resource.side_effect = mock.Mock(
             side_effect=_mock_port_fwg)
@@ -699,6 +689,8 @@ class TestUnsetFirewallGroup(TestFirewallGroup, common.TestUnsetFWaaS):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
         result = self.cmd.take_action(parsed_args)
         self.mocked.assert_called_once_with(target, {self.res: {'ports': []}})
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port', [port])
         self.assertIsNone(result)
 
     def test_unset_all_port(self):
@@ -34,6 +34,9 @@ class TestNeutronClientOSCV2(utils.TestCommand):
             side_effect=lambda resource, name_or_id, project_id=None,
             cmd_resource=None, parent_id=None, fields=None:
             {'id': name_or_id})
+        self.neutronclient.find_resource_ids = mock.Mock(
+            side_effect=lambda resource, names_or_ids, project_id=None,
+            cmd_resource=None, parent_id=None: list(names_or_ids))
 
 
 class FakeSfcPortPair(object):
@@ -269,23 +269,8 @@ class TestSetSfcPortChain(fakes.TestNeutronClientOSCV2):
         fc1 = 'flow_classifier1'
         fc2 = 'flow_classifier2'
 
-        def _mock_flow_classifier(*args, **kwargs):
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_chain')
-                return {'flow_classifiers': [self.pc_fc]}
-
-            if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'flow_classifier', fc1, cmd_resource='sfc_flow_classifier')
-                return {'id': args[1]}
-
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    'flow_classifier', fc2, cmd_resource='sfc_flow_classifier')
-                return {'id': args[1]}
-
-        self.neutronclient.find_resource.side_effect = _mock_flow_classifier
+        self.neutronclient.find_resource = mock.Mock(
+            return_value={'flow_classifiers': [self.pc_fc]})
         arglist = [
             target,
             '--flow-classifier', fc1,
@@ -299,7 +284,10 @@ class TestSetSfcPortChain(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'flow_classifiers': [self.pc_fc, fc1, fc2]}
         self.mocked.assert_called_once_with(target, {self.res: expect})
-        self.assertEqual(3, self.neutronclient.find_resource.call_count)
+        self.neutronclient.find_resource.assert_called_once_with(
+            self.res, target, cmd_resource='sfc_port_chain')
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'flow_classifier', [fc1, fc2], cmd_resource='sfc_flow_classifier')
         self.assertIsNone(result)
 
     def test_set_no_flow_classifier(self):
@@ -326,25 +314,8 @@ class TestSetSfcPortChain(fakes.TestNeutronClientOSCV2):
         ppg1 = 'port_pair_group1'
         ppg2 = 'port_pair_group2'
 
-        def _mock_flow_classifier(*args, **kwargs):
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_chain')
-                return {'port_pair_groups': [self.pc_ppg]}
-
-            if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair_group', ppg1,
-                    cmd_resource='sfc_port_pair_group')
-                return {'id': args[1]}
-
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair_group', ppg2,
-                    cmd_resource='sfc_port_pair_group')
-                return {'id': args[1]}
-
-        self.neutronclient.find_resource.side_effect = _mock_flow_classifier
+        self.neutronclient.find_resource = mock.Mock(
+            return_value={'port_pair_groups': [self.pc_ppg]})
         arglist = [
             target,
             '--port-pair-group', ppg1,
@@ -358,21 +329,17 @@ class TestSetSfcPortChain(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'port_pair_groups': [existing_ppg, ppg1, ppg2]}
         self.mocked.assert_called_once_with(target, {self.res: expect})
-        self.assertEqual(3, self.neutronclient.find_resource.call_count)
+        self.neutronclient.find_resource.assert_called_once_with(
+            self.res, target, cmd_resource='sfc_port_chain')
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port_pair_group', [ppg1, ppg2],
+            cmd_resource='sfc_port_pair_group')
         self.assertIsNone(result)
 
     def test_set_no_port_pair_group(self):
         target = self.resource['id']
         ppg1 = 'port_pair_group1'
 
-        def _mock_port_pair_group(*args, **kwargs):
-
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair_group', ppg1,
-                    cmd_resource='sfc_port_pair_group')
-                return {'id': args[1]}
-        self.neutronclient.find_resource.side_effect = _mock_port_pair_group
         arglist = [
             target,
             '--no-port-pair-group',
@@ -387,7 +354,9 @@ class TestSetSfcPortChain(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'port_pair_groups': [ppg1]}
         self.mocked.assert_called_once_with(target, {self.res: expect})
-        self.assertEqual(1, self.neutronclient.find_resource.call_count)
+        self.assertFalse(self.neutronclient.find_resource.called)
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port_pair_group', [ppg1], cmd_resource='sfc_port_pair_group')
         self.assertIsNone(result)
 
     def test_set_only_no_port_pair_group(self):
@@ -480,23 +449,8 @@ class TestUnsetSfcPortChain(fakes.TestNeutronClientOSCV2):
         target = self.resource['id']
         ppg1 = 'port_pair_group1'
 
-        def _mock_port_pair_group(*args, **kwargs):
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_chain')
-                return {'port_pair_groups': [self.pc_ppg]}
-
-            if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair_group', ppg1,
-                    cmd_resource='sfc_port_pair_group')
-                return {'id': args[1]}
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_chain')
-                return {'id': args[1]}
-        self.neutronclient.find_resource.side_effect = _mock_port_pair_group
-
+        self.neutronclient.find_resource = mock.Mock(
+            return_value={'port_pair_groups': [self.pc_ppg, ppg1]})
         arglist = [
             target,
             '--port-pair-group', ppg1,
@@ -509,24 +463,16 @@ class TestUnsetSfcPortChain(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'port_pair_groups': [self.pc_ppg]}
         self.mocked.assert_called_once_with(target, {self.res: expect})
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port_pair_group', [ppg1], cmd_resource='sfc_port_pair_group')
         self.assertIsNone(result)
 
     def test_unset_flow_classifier(self):
         target = self.resource['id']
         fc1 = 'flow_classifier1'
 
-        def _mock_flow_classifier(*args, **kwargs):
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_chain')
-                return {'flow_classifiers': [self.pc_fc]}
-
-            if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'flow_classifier', fc1, cmd_resource='sfc_flow_classifier')
-                return {'id': args[1]}
-        self.neutronclient.find_resource.side_effect = _mock_flow_classifier
-
+        self.neutronclient.find_resource = mock.Mock(
+            return_value={'flow_classifiers': [self.pc_fc, fc1]})
         arglist = [
             target,
             '--flow-classifier', fc1,
@@ -539,6 +485,8 @@ class TestUnsetSfcPortChain(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'flow_classifiers': [self.pc_fc]}
         self.mocked.assert_called_once_with(target, {self.res: expect})
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'flow_classifier', [fc1], cmd_resource='sfc_flow_classifier')
         self.assertIsNone(result)
 
     def test_unset_all_flow_classifier(self):
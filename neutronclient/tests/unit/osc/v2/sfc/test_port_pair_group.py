@@ -278,24 +278,8 @@ class TestSetSfcPortPairGroup(fakes.TestNeutronClientOSCV2):
         port_pair1 = 'additional_port1'
         port_pair2 = 'additional_port2'
 
-        def _mock_port_pair_group(*args, **kwargs):
-
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair', port_pair1, cmd_resource='sfc_port_pair')
-                return {'id': args[1]}
-
-            if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair', port_pair2, cmd_resource='sfc_port_pair')
-                return {'id': args[1]}
-
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_pair_group')
-                return {'port_pairs': [self.ppg_pp]}
-
-        self.neutronclient.find_resource.side_effect = _mock_port_pair_group
+        self.neutronclient.find_resource = mock.Mock(
+            return_value={'port_pairs': [self.ppg_pp]})
 
         arglist = [
             target,
@@ -310,7 +294,11 @@ class TestSetSfcPortPairGroup(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'port_pairs': sorted([self.ppg_pp, port_pair1, port_pair2])}
         self.mocked.assert_called_once_with(target, {self.res: expect})
-        self.assertEqual(3, self.neutronclient.find_resource.call_count)
+        self.neutronclient.find_resource.assert_called_once_with(
+            self.res, target, cmd_resource='sfc_port_pair_group')
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port_pair', [port_pair1, port_pair2],
+            cmd_resource='sfc_port_pair')
         self.assertIsNone(result)
 
     def test_set_no_port_pair(self):
@@ -418,29 +406,8 @@ class TestUnsetSfcPortPairGroup(fakes.TestNeutronClientOSCV2):
         port_pair1 = 'additional_port1'
         port_pair2 = 'additional_port2'
 
-        def _mock_port_pair(*args, **kwargs):
-
-            if self.neutronclient.find_resource.call_count == 1:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_pair_group')
-                return {'port_pairs': [self.ppg_pp]}
-
-            if self.neutronclient.find_resource.call_count == 2:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair', port_pair1, cmd_resource='sfc_port_pair')
-                return {'id': args[1]}
-
-            if self.neutronclient.find_resource.call_count == 3:
-                self.neutronclient.find_resource.assert_called_with(
-                    'port_pair', port_pair2, cmd_resource='sfc_port_pair')
-                return {'id': args[1]}
-
-            if self.neutronclient.find_resource.call_count == 4:
-                self.neutronclient.find_resource.assert_called_with(
-                    self.res, target, cmd_resource='sfc_port_pair_group')
-                return {'id': args[1]}
-
-        self.neutronclient.find_resource.side_effect = _mock_port_pair
+        self.neutronclient.find_resource = mock.Mock(
+            return_value={'port_pairs': [self.ppg_pp, port_pair1]})
 
         arglist = [
             target,
@@ -455,6 +422,9 @@ class TestUnsetSfcPortPairGroup(fakes.TestNeutronClientOSCV2):
         result = self.cmd.take_action(parsed_args)
         expect = {'port_pairs': sorted([self.ppg_pp])}
         self.mocked.assert_called_once_with(target, {self.res: expect})
+        self.neutronclient.find_resource_ids.assert_called_once_with(
+            'port_pair', [port_pair1, port_pair2],
+            cmd_resource='sfc_port_pair')
         self.assertIsNone(result)
 
     def test_unset_all_port_pair(self):
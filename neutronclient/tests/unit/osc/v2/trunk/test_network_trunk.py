@@ -29,8 +29,8 @@ from neutronclient.tests.unit.osc.v2 import fakes as test_fakes
 from neutronclient.tests.unit.osc.v2.trunk import fakes
 
 
-def _get_id(client, id_or_name, resource):
-    return id_or_name
+def _get_ids(client, ids_or_names, resource, return_exceptions=False):
+    return list(ids_or_names)
 
 
 class TestCreateNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
@@ -62,8 +62,8 @@ class TestCreateNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
 
     def setUp(self):
         super(TestCreateNetworkTrunk, self).setUp()
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.create_trunk = mock.Mock(
             return_value={trunk.TRUNK: self._trunk})
         self.data = self.get_data()
@@ -222,8 +222,8 @@ class TestDeleteNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
     def setUp(self):
         super(TestDeleteNetworkTrunk, self).setUp()
 
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.delete_trunk = mock.Mock(return_value=None)
 
         # Get the command object to test
@@ -273,10 +273,9 @@ class TestDeleteNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        get_mock_result = [self._trunks[0], exceptions.CommandError]
-        trunk._get_id = (
-            mock.Mock(side_effect=get_mock_result)
-        )
+        get_mock_result = [self._trunks[0], exceptions.CommandError()]
+        mock.patch.object(trunk, '_get_ids',
+                          return_value=get_mock_result).start()
         with testtools.ExpectedException(exceptions.CommandError) as e:
             self.cmd.take_action(parsed_args)
             self.assertEqual('1 of 2 trunks failed to delete.', str(e))
@@ -314,8 +313,8 @@ class TestShowNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
     def setUp(self):
         super(TestShowNetworkTrunk, self).setUp()
 
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.show_trunk = mock.Mock(
             return_value={trunk.TRUNK: self._trunk})
 
@@ -387,8 +386,8 @@ class TestListNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
 
     def setUp(self):
         super(TestListNetworkTrunk, self).setUp()
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.list_trunks = mock.Mock(
             return_value={trunk.TRUNKS: self._trunks})
 
@@ -402,7 +401,8 @@ class TestListNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
 
         columns, data = self.cmd.take_action(parsed_args)
 
-        self.neutronclient.list_trunks.assert_called_once_with()
+        self.neutronclient.list_trunks.assert_called_once_with(
+            fields=['id', 'name', 'port_id', 'description'])
         self.assertEqual(self.columns, columns)
         self.assertListItemEqual(self.data, list(data))
 
@@ -417,7 +417,9 @@ class TestListNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
 
         columns, data = self.cmd.take_action(parsed_args)
 
-        self.neutronclient.list_trunks.assert_called_once_with()
+        self.neutronclient.list_trunks.assert_called_once_with(
+            fields=['id', 'name', 'port_id', 'description', 'status',
+                    'admin_state_up', 'created_at', 'updated_at'])
         self.assertEqual(self.columns_long, columns)
         self.assertListItemEqual(self.data_long, list(data))
 
@@ -449,8 +451,8 @@ class TestSetNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
 
     def setUp(self):
         super(TestSetNetworkTrunk, self).setUp()
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.update_trunk = mock.Mock(
             return_value={trunk.TRUNK: self._trunk})
         self.neutronclient.trunk_add_subports = mock.Mock(
@@ -563,6 +565,31 @@ class TestSetNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
         )
         self.assertIsNone(result)
 
+    def test_set_network_trunk_subports_looked_up_at_once(self):
+        mock.patch.stopall()
+        self.neutronclient.find_resource_ids = mock.Mock(
+            side_effect=[[self._trunk['id']], ['port-id1', 'port-id2']])
+        arglist = [
+            '--subport', 'port=port1',
+            '--subport', 'port=port2',
+            self._trunk['name'],
+        ]
+        verifylist = [
+            ('trunk', self._trunk['name']),
+            ('set_subports', [{'port': 'port1'}, {'port': 'port2'}]),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.cmd.take_action(parsed_args)
+
+        self.neutronclient.find_resource_ids.assert_has_calls([
+            mock.call(trunk.TRUNK, [self._trunk['name']],
+                      return_exceptions=False),
+            mock.call('port', ['port1', 'port2'], return_exceptions=False)])
+        self.neutronclient.trunk_add_subports.assert_called_once_with(
+            self._trunk['id'], {'sub_ports': [{'port_id': 'port-id1'},
+                                              {'port_id': 'port-id2'}]})
+
     def test_set_network_trunk_subports_without_optional_keys(self):
         subport = copy.copy(self._trunk['sub_ports'][0])
         # Pop out the segmentation-id and segmentation-type
@@ -678,8 +705,8 @@ class TestListNetworkSubport(test_fakes.TestNeutronClientOSCV2):
 
     def setUp(self):
         super(TestListNetworkSubport, self).setUp()
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.trunk_get_subports = mock.Mock(
             return_value={trunk.SUB_PORTS: self._subports})
 
@@ -729,8 +756,8 @@ class TestUnsetNetworkTrunk(test_fakes.TestNeutronClientOSCV2):
     def setUp(self):
         super(TestUnsetNetworkTrunk, self).setUp()
 
-        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_id',
-                   new=_get_id).start()
+        mock.patch('neutronclient.osc.v2.trunk.network_trunk._get_ids',
+                   new=_get_ids).start()
         self.neutronclient.trunk_remove_subports = mock.Mock(
             return_value=None)
 
@@ -0,0 +1,112 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import mock
+import six
+import testtools
+
+from neutronclient.common import exceptions
+from neutronclient.tests.unit import test_cli20
+
+if six.PY3:
+    import asyncio
+
+    from neutronclient.v2_0 import async_client
+
+
+@testtools.skipIf(six.PY2, 'asyncio is only available on Python 3')
+class AsyncClientTest(test_cli20.CLITestV20Base):
+
+    def setUp(self):
+        super(AsyncClientTest, self).setUp()
+        self.async_client = async_client.AsyncClient(client=self.client,
+                                                     max_workers=4)
+        self.addCleanup(self.async_client.close)
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+
+    def _resp(self, body, status_code=200):
+        headers = {'x-openstack-request-id': test_cli20.REQUEST_ID}
+        return (test_cli20.MyResp(status_code, headers),
+                self.client.serialize(body))
+
+    def test_show(self):
+        body = {'network': {'id': 'myid'}}
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._resp(body)) as mock_req:
+            result = self.loop.run_until_complete(
+                self.async_client.show_network('myid'))
+
+        self.assertEqual(body, result)
+        self.assertEqual([test_cli20.REQUEST_ID], result.request_ids)
+        mock_req.assert_called_once_with(
+            test_cli20.end_url('/networks/myid'), 'GET', body=None,
+            headers=test_cli20.ContainsKeyValue(
+                {'X-Auth-Token': test_cli20.TOKEN}))
+
+    def test_concurrent_calls(self):
+        body = {'port': {'id': 'myid'}}
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._resp(body)) as mock_req:
+            results = self.loop.run_until_complete(asyncio.gather(
+                *[self.async_client.show_port('myid') for i in range(10)]))
+
+        self.assertEqual(10, mock_req.call_count)
+        self.assertEqual([body] * 10, results)
+
+    def test_error_is_mapped(self):
+        body = {'NeutronError': {'type': 'NetworkNotFound',
+                                 'message': 'not found', 'detail': ''}}
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._resp(body, 404)):
+            self.assertRaises(exceptions.NetworkNotFoundClient,
+                              self.loop.run_until_complete,
+                              self.async_client.show_network('myid'))
+
+    def test_list_pages(self):
+        path = '/networks'
+        query = 'marker=myid1&limit=1'
+        page1 = {'networks': [{'id': 'myid1'}],
+                 'networks_links': [{'href': test_cli20.end_url(path, query),
+                                     'rel': 'next'}]}
+        page2 = {'networks': [{'id': 'myid2'}]}
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=[self._resp(page1),
+                                            self._resp(page2)]):
+            pages = self.loop.run_until_complete(
+                self.async_client.list_networks(retrieve_all=False))
+            first = self.loop.run_until_complete(pages.__anext__())
+            second = self.loop.run_until_complete(pages.__anext__())
+            self.assertRaises(StopAsyncIteration,
+                              self.loop.run_until_complete,
+                              pages.__anext__())
+
+        self.assertEqual(page1['networks'], first['networks'])
+        self.assertEqual(page2, second)
+        self.assertEqual([test_cli20.REQUEST_ID] * 2, pages.request_ids)
+
+    def test_close_leaves_given_client_open(self):
+        with mock.patch.object(self.client, 'close') as mock_close:
+            self.async_client.close()
+        self.assertFalse(mock_close.called)
+
+    def test_close_own_client(self):
+        neutron = async_client.AsyncClient(token=test_cli20.TOKEN,
+                                           endpoint_url=test_cli20.ENDURL)
+        with mock.patch.object(neutron.client, 'close') as mock_close:
+            neutron.close()
+        mock_close.assert_called_once_with()
@@ -17,6 +17,7 @@
 import contextlib
 import itertools
 import json
+import pickle
 import sys
 
 import mock
@@ -60,6 +61,9 @@ class FakeStdout(object):
     def write(self, text):
         self.content.append(text)
 
+    def flush(self):
+        pass
+
     def make_string(self):
         result = ''
         for line in self.content:
@@ -317,7 +321,8 @@ class CLITestV20Base(base.BaseTestCase):
 
     def _test_list_columns(self, cmd, resources,
                            resources_out, args=('-f', 'json'),
-                           cmd_resources=None, parent_id=None):
+                           cmd_resources=None, parent_id=None,
+                           query=None):
         if not cmd_resources:
             cmd_resources = resources
 
@@ -338,7 +343,7 @@ class CLITestV20Base(base.BaseTestCase):
         self.assert_mock_multiple_calls_with_same_arguments(
             mock_get_client, mock.call(), None)
         mock_request.assert_called_once_with(
-            end_url(path), 'GET',
+            MyUrlComparator(end_url(path, query), self.client), 'GET',
             body=None,
             headers=ContainsKeyValue({'X-Auth-Token': TOKEN}))
 
@@ -792,6 +797,16 @@ class ClientV2TestJson(CLITestV20Base):
         self.assertEqual(body, result)
         self.assertEqual([REQUEST_ID], result.request_ids)
 
+    def test_do_request_request_ids_not_captured(self):
+        self.client.capture_request_ids = False
+        self.client.httpclient.auth_token = 'token'
+        resp_headers = {'x-openstack-request-id': REQUEST_ID}
+        resp = (MyResp(200, resp_headers), self.client.serialize({}))
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=resp):
+            result = self.client.do_request('GET', '/test')
+        self.assertEqual([], result.request_ids)
+
     def test_list_request_ids_with_retrieve_all_true(self):
         path = '/test'
         resources = 'tests'
@@ -859,6 +874,116 @@ class ClientV2TestJson(CLITestV20Base):
                 body=None,
                 headers=ContainsKeyValue({'X-Auth-Token': TOKEN}))])
 
+    def _fake_pages(self, path, resources, count):
+        pages = []
+        for i in range(count):
+            page = {resources: [{'id': 'myid%d' % i}]}
+            if i < count - 1:
+                query = "marker=myid%d&limit=1" % i
+                page['%s_links' % resources] = [
+                    {'href': end_url(path, query), 'rel': 'next'}]
+            resp_headers = {'x-openstack-request-id': 'req-%d' % i}
+            pages.append((MyResp(200, resp_headers),
+                          self.client.serialize(page)))
+        return pages
+
+    def test_list_with_prefetch_retrieve_all_true(self):
+        path = '/test'
+        resources = 'tests'
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=self._fake_pages(
+                                   path, resources, 5)) as mock_request:
+            result = self.client.list(resources, path, prefetch=2)
+
+        self.assertEqual(5, mock_request.call_count)
+        self.assertEqual([{'id': 'myid%d' % i} for i in range(5)],
+                         result[resources])
+        self.assertEqual(['req-%d' % i for i in range(5)],
+                         result.request_ids)
+
+    def test_list_with_prefetch_retrieve_all_false(self):
+        path = '/test'
+        resources = 'tests'
+        self.client.prefetch = 1
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=self._fake_pages(
+                                   path, resources, 3)):
+            result = self.client.list(resources, path, retrieve_all=False)
+            pages = list(result)
+
+        self.assertEqual([[{'id': 'myid%d' % i}] for i in range(3)],
+                         [page[resources] for page in pages])
+        self.assertEqual(['req-%d' % i for i in range(3)],
+                         result.request_ids)
+
+    def test_list_with_prefetch_error(self):
+        path = '/test'
+        resources = 'tests'
+        pages = self._fake_pages(path, resources, 2)
+        pages[1] = (MyResp(500, {}), '')
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=pages):
+            result = self.client.list(resources, path, retrieve_all=False,
+                                      prefetch=2)
+            next(result)
+            self.assertRaises(exceptions.InternalServerError, next, result)
+
+    def _stream_resp(self, body, status_code=200):
+        resp = MyResp(status_code, {'x-openstack-request-id': REQUEST_ID})
+        resp.raw = six.BytesIO(body.encode('utf-8'))
+        resp._content = False
+        resp._content_consumed = False
+        resp.encoding = 'utf-8'
+        return (resp, None)
+
+    @mock.patch.object(client, 'STREAM_CHUNK_SIZE', 5)
+    def test_list_stream(self):
+        path = '/test'
+        resources = 'tests'
+        query = "marker=myid2&limit=2"
+        # The collection is not the first member and values are split
+        # across several chunks.
+        body1 = json.dumps({
+            '%s_links' % resources: [{'href': end_url(path, query),
+                                      'rel': 'next'}],
+            resources: [{'id': 'myid1', 'name': u'\u7f51\u7edc'},
+                        {'id': 'myid2', 'size': 12345}],
+            'count': 1234567})
+        body2 = json.dumps({resources: []})
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=[self._stream_resp(body1),
+                                            self._stream_resp(body2)]
+                               ) as mock_request:
+            result = self.client.list(resources, path, stream=True)
+            self.assertEqual({'id': 'myid1', 'name': u'\u7f51\u7edc'},
+                             next(result))
+            self.assertEqual(1, mock_request.call_count)
+            self.assertEqual([{'id': 'myid2', 'size': 12345}], list(result))
+
+        self.assertEqual(2, mock_request.call_count)
+        mock_request.assert_called_with(
+            MyUrlComparator(end_url(path, query), self.client), 'GET',
+            body=None, headers=ContainsKeyValue({'X-Auth-Token': TOKEN}),
+            stream=True)
+        self.assertEqual([REQUEST_ID, REQUEST_ID], result.request_ids)
+
+    def test_list_stream_malformed(self):
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._stream_resp(
+                                   '{"tests": [{"id": "myid1"}, {"id"')):
+            result = self.client.list('tests', '/test', stream=True)
+            self.assertEqual({'id': 'myid1'}, next(result))
+            self.assertRaises(exceptions.MalformedResponseBody, next, result)
+
+    def test_list_stream_error(self):
+        body = json.dumps({'NeutronError': {'type': 'NotFound',
+                                            'message': 'not found',
+                                            'detail': ''}})
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._stream_resp(body, 404)):
+            result = self.client.list('tests', '/test', stream=True)
+            self.assertRaises(exceptions.NotFound, next, result)
+
     def test_deserialize_without_data(self):
         data = u''
         result = self.client.deserialize(data, 200)
@@ -911,6 +1036,178 @@ class ClientV2TestJson(CLITestV20Base):
         self.assertEqual(body, result)
         self.assertEqual([REQUEST_ID], result.request_ids)
 
+    def test_batch(self):
+        not_found = {'NeutronError': {'type': 'PortNotFound',
+                                      'message': 'not found', 'detail': ''}}
+
+        def fake_request(url, method, body=None, headers=None):
+            port_id = url.rsplit('/', 1)[-1]
+            resp_headers = {'x-openstack-request-id': 'req-%s' % port_id}
+            if port_id == 'missing':
+                return (MyResp(404, resp_headers),
+                        self.client.serialize(not_found))
+            return (MyResp(200, resp_headers),
+                    self.client.serialize({'port': {'id': port_id}}))
+
+        port_ids = ['id%d' % i for i in range(8)]
+        port_ids.insert(3, 'missing')
+        batch = self.client.batch(max_workers=3)
+        for port_id in port_ids:
+            batch.show_port(port_id)
+        self.assertEqual(len(port_ids), len(batch))
+
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=fake_request) as mock_request:
+            results = batch.execute()
+
+        self.assertEqual(len(port_ids), mock_request.call_count)
+        self.assertEqual(0, len(batch))
+        self.assertEqual(len(port_ids), len(results))
+        for port_id, res in zip(port_ids, results):
+            self.assertEqual(['req-%s' % port_id], res.request_ids)
+            if port_id == 'missing':
+                self.assertIsInstance(res.exception,
+                                      exceptions.PortNotFoundClient)
+                self.assertRaises(exceptions.PortNotFoundClient, res.get)
+            else:
+                self.assertIsNone(res.exception)
+                self.assertEqual({'port': {'id': port_id}}, res.get())
+
+    def _cached_client(self, **kwargs):
+        neutron = client.Client(token=TOKEN, endpoint_url=self.endurl,
+                                cache_ttl=10, **kwargs)
+        self.now = 0
+        neutron._cache._timer = lambda: self.now
+        return neutron
+
+    def _resp(self, body):
+        headers = {'x-openstack-request-id': REQUEST_ID}
+        return (MyResp(200, headers), self.client.serialize(body))
+
+    def test_cache_hit(self):
+        neutron = self._cached_client()
+        body = {'network': {'id': 'myid', 'name': 'net'}}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(body)) as mock_req:
+            first = neutron.show_network('myid')
+            first['network']['name'] = 'changed'
+            second = neutron.show_network('myid')
+            neutron.show_network('myid', fields='name')
+
+        self.assertEqual(2, mock_req.call_count)
+        self.assertEqual(body, second)
+        self.assertEqual([REQUEST_ID], second.request_ids)
+        self.assertEqual({'hits': 1, 'misses': 2, 'evictions': 0,
+                          'size': 2, 'revalidated': 0},
+                         neutron.get_cache_stats())
+
+    def test_cache_disabled(self):
+        body = {'network': {'id': 'myid'}}
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._resp(body)) as mock_req:
+            self.client.show_network('myid')
+            self.client.show_network('myid')
+
+        self.assertEqual(2, mock_req.call_count)
+        self.assertIsNone(self.client.get_cache_stats())
+
+    def test_cache_invalidated_on_write(self):
+        neutron = self._cached_client()
+        net = {'network': {'id': 'myid'}}
+        nets = {'networks': [{'id': 'myid'}]}
+        port = {'port': {'id': 'portid'}}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(port)):
+            neutron.show_port('portid')
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(nets)):
+            neutron.list_networks()
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(net)):
+            neutron.show_network('myid')
+            neutron.update_network('myid', net)
+        self.assertEqual(1, neutron.get_cache_stats()['size'])
+
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(net)) as mock_req:
+            neutron.show_network('myid')
+            neutron.show_port('portid')
+        self.assertEqual(1, mock_req.call_count)
+
+    def test_cache_expiry_and_eviction(self):
+        neutron = self._cached_client(cache_size=2,
+                                      cache_revalidate=False)
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp({'network': {}})
+                               ) as mock_req:
+            neutron.show_network('id1')
+            neutron.show_network('id2')
+            neutron.show_network('id1')
+            neutron.show_network('id3')
+            neutron.show_network('id1')
+            self.assertEqual(3, mock_req.call_count)
+            self.now = 11
+            neutron.show_network('id1')
+            self.assertEqual(4, mock_req.call_count)
+        self.assertEqual(1, neutron.get_cache_stats()['evictions'])
+
+    def test_cache_revalidate(self):
+        neutron = self._cached_client()
+        net = {'network': {'id': 'myid', 'revision_number': 3}}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(net)):
+            neutron.show_network('myid')
+        self.now = 11
+        with mock.patch.object(
+                neutron.httpclient, "request",
+                return_value=self._resp({'network': {'revision_number': 3}})
+        ) as mock_req:
+            self.assertEqual(net, neutron.show_network('myid'))
+            self.assertEqual(net, neutron.show_network('myid'))
+        mock_req.assert_called_once_with(
+            end_url('/networks/myid', 'fields=revision_number'), 'GET',
+            body=None, headers=mock.ANY)
+        self.assertEqual(1, neutron.get_cache_stats()['revalidated'])
+
+        self.now = 22
+        changed = {'network': {'id': 'myid', 'revision_number': 4}}
+        with mock.patch.object(
+                neutron.httpclient, "request",
+                side_effect=[self._resp({'network': {'revision_number': 4}}),
+                             self._resp(changed)]) as mock_req:
+            self.assertEqual(changed, neutron.show_network('myid'))
+        self.assertEqual(2, mock_req.call_count)
+
+    def test_list_chunked(self):
+        ids = ['port%04d' % i for i in range(1000)]
+
+        def fake_request(url, method, body=None, headers=None):
+            query = urlparse.parse_qs(urlparse.urlparse(url).query)
+            self.assertEqual(['id'], query['fields'])
+            return (MyResp(200, {'x-openstack-request-id': 'req'}),
+                    self.client.serialize(
+                        {'ports': [{'id': i} for i in query['id']]}))
+
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=fake_request) as mock_request:
+            res = self.client.list_chunked(self.client.list_ports, 'id', ids,
+                                           fields='id')
+            self.assertEqual({}, self.client.list_chunked(
+                self.client.list_ports, 'id', [], fields='id'))
+
+        self.assertLess(1, mock_request.call_count)
+        self.assertEqual(sorted(ids), sorted(p['id'] for p in res['ports']))
+        self.assertEqual(['req'] * mock_request.call_count, res.request_ids)
+
+    def test_list_chunked_splits_too_long_uri(self):
+        def fake_list(**params):
+            if len(params['id']) > 2:
+                raise exceptions.RequestURITooLong(excess=1)
+            return client._DictWithMeta({'ports': params['id']}, None)
+
+        res = self.client.list_chunked(fake_list, 'id', list(range(5)))
+        self.assertEqual(list(range(5)), res['ports'])
+
 
 class CLITestV20ExceptionHandler(CLITestV20Base):
 
@@ -1087,6 +1384,23 @@ class DictWithMetaTest(base.BaseTestCase):
         self.assertTrue(hasattr(obj, 'request_ids'))
         self.assertEqual([REQUEST_ID], obj.request_ids)
 
+    def test_dict_with_meta_has_no_instance_dict(self):
+        obj = client._DictWithMeta({'test': 'value'}, None)
+        self.assertFalse(hasattr(obj, '__dict__'))
+        self.assertIsNone(obj._request_ids)
+        self.assertEqual([], obj.request_ids)
+        obj.retry_metrics = mock.sentinel.metrics
+        self.assertRaises(AttributeError, setattr, obj, 'other', None)
+
+    def test_dict_with_meta_pickle(self):
+        obj = client._DictWithMeta({'test': 'value'}, REQUEST_ID)
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            copied = pickle.loads(pickle.dumps(obj, protocol))
+            self.assertIsInstance(copied, client._DictWithMeta)
+            self.assertEqual({'test': 'value'}, copied)
+            self.assertEqual([REQUEST_ID], copied.request_ids)
+            self.assertIsNone(copied.retry_metrics)
+
 
 class TupleWithMetaTest(base.BaseTestCase):
 
@@ -1188,6 +1502,13 @@ class CLITestV20OutputFormatter(CLITestV20Base):
         self.assertEqual('myname', data['name'])
         self.assertEqual('myid', data['id'])
 
+    def test_show_resource_columns_projection(self):
+        # Only the fields of the columns selected are requested.
+        cmd = network.ShowNetwork(MyApp(sys.stdout), None)
+        args = ['-c', 'id', '-c', 'name', 'myid']
+        self._test_show_resource('network', cmd, 'myid',
+                                 args, ['id', 'name'])
+
     @mock.patch.object(network.ListNetwork, "extend_list")
     def _test_list_resources_with_formatter(self, fmt, mock_extend_list):
         resources = 'networks'
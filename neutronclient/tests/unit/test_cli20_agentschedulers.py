@@ -17,9 +17,11 @@
 import sys
 
 import mock
+import six.moves.urllib.parse as urlparse
 
 from neutronclient.neutron.v2_0 import agentscheduler
 from neutronclient.neutron.v2_0 import network
+from neutronclient import shell
 from neutronclient.tests.unit import test_cli20
 
 
@@ -117,6 +119,33 @@ class CLITestV20DHCPAgentScheduler(CLITestV20AgentScheduler):
         self._test_list_resources(resources, cmd, base_args=[agent_id],
                                   path=path, response_contents=contents)
 
+    def test_list_agents_hosting_network_with_columns(self):
+        # Only the fields of the -c columns are returned by the server,
+        # extend_list must not rely on the others.
+        cmd = agentscheduler.ListDhcpAgentsHostingNetwork(
+            test_cli20.MyApp(sys.stdout), None)
+        agent = {'id': 'agent_id1', 'host': 'host1', 'alive': True,
+                 'admin_state_up': True}
+
+        def fake_request(url, method, body=None, headers=None):
+            url = urlparse.urlparse(url)
+            fields = urlparse.parse_qs(url.query).get('fields', [])
+            if url.path.endswith(self.client.DHCP_AGENTS):
+                body = {'agents': [dict((k, v) for k, v in agent.items()
+                                        if k in fields)]}
+            else:
+                body = {'network': {'id': 'mynet'}}
+            return (test_cli20.MyResp(200), self.client.serialize(body))
+
+        cmd_parser = cmd.get_parser('list_agents_hosting_network')
+        with mock.patch.object(cmd, "get_client",
+                               return_value=self.client), \
+                mock.patch.object(self.client.httpclient, "request",
+                                  side_effect=fake_request):
+            shell.run_command(cmd, cmd_parser,
+                              ['-f', 'value', '-c', 'host', 'mynet'])
+        self.assertEqual('host1\n', self.fake_stdout.make_string())
+
 
 class CLITestV20L3AgentScheduler(CLITestV20AgentScheduler):
 
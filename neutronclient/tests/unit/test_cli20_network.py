@@ -18,11 +18,13 @@ import sys
 
 import mock
 from oslo_serialization import jsonutils
+import six.moves.urllib.parse as urlparse
 
 from neutronclient.common import exceptions
 from neutronclient.neutron.v2_0 import network
 from neutronclient import shell
 from neutronclient.tests.unit import test_cli20
+from neutronclient.v2_0 import client
 
 
 class CLITestV20CreateNetworkJSON(test_cli20.CLITestV20Base):
@@ -163,7 +165,7 @@ class CLITestV20ListNetworkJSON(test_cli20.CLITestV20Base):
         resstr = self.client.serialize(reses)
         resp = (test_cli20.MyResp(200), resstr)
         # url method body
-        query = "id=myfakeid"
+        query = "fields=id&id=myfakeid"
         args = ['-c', 'id', '--', '--id', 'myfakeid']
         path = getattr(self.client, resources + "_path")
         with mock.patch.object(cmd, "get_client",
@@ -332,11 +334,12 @@ class CLITestV20ListNetworkJSON(test_cli20.CLITestV20Base):
                                  fields_1=['a', 'b'], fields_2=['c', 'd'])
 
     def _test_list_nets_columns(self, cmd, returned_body,
-                                args=('-f', 'json')):
+                                args=('-f', 'json'), query=None):
         resources = 'networks'
         with mock.patch.object(network.ListNetwork, "extend_list",
                                return_value=None) as mock_extend_list:
-            self._test_list_columns(cmd, resources, returned_body, args=args)
+            self._test_list_columns(cmd, resources, returned_body, args=args,
+                                    query=query)
         mock_extend_list.assert_called_once_with(test_cli20.IsA(list),
                                                  mock.ANY)
 
@@ -347,7 +350,8 @@ class CLITestV20ListNetworkJSON(test_cli20.CLITestV20Base):
                                        "tenant_id": "tenant_3",
                                        "subnets": []}]}
         self._test_list_nets_columns(cmd, returned_body,
-                                     args=['-f', 'json', '-c', 'id'])
+                                     args=['-f', 'json', '-c', 'id'],
+                                     query='fields=id')
         _str = self.fake_stdout.make_string()
         returned_networks = jsonutils.loads(_str)
         self.assertEqual(1, len(returned_networks))
@@ -375,7 +379,7 @@ class CLITestV20ListNetworkJSON(test_cli20.CLITestV20Base):
         reses = {resources: []}
         resstr = self.client.serialize(reses)
         # url method body
-        query = "router%3Aexternal=True&id=myfakeid"
+        query = "fields=id&router%3Aexternal=True&id=myfakeid"
         args = ['-c', 'id', '--', '--id', 'myfakeid']
         path = getattr(self.client, resources + "_path")
         resp = (test_cli20.MyResp(200), resstr)
@@ -608,6 +612,53 @@ class CLITestV20DeleteNetworkJSON(test_cli20.CLITestV20Base):
                           resource, cmd, myid1, args, extra_id=myid2,
                           delete_fail=True)
 
+    def test_bulk_delete_network_parallel(self):
+        # Delete net: --parallel 3 net1 ID2 dupname missing ID3.
+        id1 = '11111111-1111-1111-1111-111111111111'
+        id2 = '22222222-2222-2222-2222-222222222222'
+        id3 = '33333333-3333-3333-3333-333333333333'
+        nets = [{'id': id1, 'name': 'net1'}, {'id': id2, 'name': ''},
+                {'id': id3, 'name': ''},
+                {'id': 'dup1', 'name': 'dupname'},
+                {'id': 'dup2', 'name': 'dupname'}]
+
+        def fake_request(url, method, body=None, headers=None):
+            url = urlparse.urlparse(url)
+            if method == 'DELETE':
+                # id3 is deleted by someone else meanwhile.
+                status = 404 if url.path.endswith(id3) else 204
+                return (test_cli20.MyResp(status), None)
+            query = urlparse.parse_qs(url.query)
+            key = 'id' if 'id' in query else 'name'
+            return (test_cli20.MyResp(200), self.client.serialize(
+                {'networks': [n for n in nets if n[key] in query[key]]}))
+
+        cmd = network.DeleteNetwork(test_cli20.MyApp(sys.stdout), None)
+        args = ['--parallel', '3', 'net1', id2, 'dupname', 'missing', id3]
+        cmd_parser = cmd.get_parser('delete_network')
+        with mock.patch.object(cmd, "get_client",
+                               return_value=self.client), \
+                mock.patch.object(self.client.httpclient, "request",
+                                  side_effect=fake_request) as mock_request:
+            e = self.assertRaises(exceptions.NeutronCLIError,
+                                  shell.run_command, cmd, cmd_parser, args)
+
+        methods = [c[0][1] for c in mock_request.call_args_list]
+        # One lookup of the IDs, one of the names, then the deletes.
+        self.assertEqual(['GET', 'GET'], methods[:2])
+        self.assertEqual(['DELETE'] * 3, methods[2:])
+        self.assertIn('Deleted network(s): net1, %s' % id2,
+                      self.fake_stdout.make_string())
+        self.assertIn("id(s) 'missing, %s'" % id3, str(e))
+        self.assertIn("name(s) 'dupname'", str(e))
+
+    def test_bulk_delete_network_parallel_invalid(self):
+        cmd = network.DeleteNetwork(test_cli20.MyApp(sys.stdout), None)
+        cmd_parser = cmd.get_parser('delete_network')
+        with mock.patch.object(cmd, "get_client", return_value=self.client):
+            self.assertRaises(exceptions.CommandError, shell.run_command,
+                              cmd, cmd_parser, ['--parallel', '0', 'myid'])
+
 
 class CLITestV20ExtendListNetworkJSON(test_cli20.CLITestV20Base):
     def _build_test_data(self, data):
@@ -657,21 +708,26 @@ class CLITestV20ExtendListNetworkJSON(test_cli20.CLITestV20Base):
         filters2, response2 = self._build_test_data(data[len(data) - 1:])
         path = getattr(self.client, 'subnets_path')
         cmd = network.ListNetwork(test_cli20.MyApp(sys.stdout), None)
+        # Room for exactly 9 '&id=mysubidN' filters
+        max_uri_len = (len(self.endurl) + len(self.client.action_prefix) +
+                       client.URI_PATH_RESERVE +
+                       len('?fields=id&fields=cidr') + 9 * 12)
+
+        def _request(url, method, body=None, headers=None):
+            return response2 if url.endswith(filters2) else response1
+
         with mock.patch.object(cmd, "get_client",
                                return_value=self.client) as mock_get_client, \
-                mock.patch.object(self.client.httpclient,
-                                  "request") as mock_request, \
-                mock.patch.object(self.client.httpclient, "_check_uri_length",
-                                  return_value=None) as mock_check_uri_length:
-            # 1 char of extra URI len will cause a split in 2 requests
-            mock_check_uri_length.side_effect = [
-                exceptions.RequestURITooLong(excess=1), None, None]
-            mock_request.side_effect = [response1, response2]
+                mock.patch.object(self.client.httpclient, "request",
+                                  side_effect=_request) as mock_request, \
+                mock.patch('neutronclient.client.MAX_URI_LEN',
+                           max_uri_len):
             known_args, _vs = cmd.get_parser('create_subnets')\
                 .parse_known_args()
             cmd.extend_list(data, known_args)
 
         mock_get_client.assert_called_once_with()
+        # The filters are split up front, without a failing request.
         self.assertEqual(2, mock_request.call_count)
         mock_request.assert_has_calls([
             mock.call(
@@ -691,4 +747,6 @@ class CLITestV20ExtendListNetworkJSON(test_cli20.CLITestV20Base):
                 'GET',
                 body=None,
                 headers=test_cli20.ContainsKeyValue(
-                    {'X-Auth-Token': test_cli20.TOKEN}))])
+                    {'X-Auth-Token': test_cli20.TOKEN}))], any_order=True)
+        for n in data:
+            self.assertEqual('192.168.0.0/16', n['subnets'][0]['cidr'])
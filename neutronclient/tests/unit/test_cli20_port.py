@@ -457,6 +457,73 @@ class CLITestV20PortJSON(test_cli20.CLITestV20Base):
                                   response_contents=contents,
                                   output_format='csv')
 
+    def _test_list_ports_streamed(self, output_format, ports=None,
+                                  args=None):
+        cmd = port.ListPort(test_cli20.MyApp(sys.stdout), None)
+        path = getattr(self.client, "ports_path")
+        if ports is None:
+            ports = [[{'id': 'myid1', 'name': 'port1'}],
+                     [{'id': 'myid2', 'name': 'port2'}]]
+        pages = []
+        for i, page in enumerate(ports):
+            pages.append({'ports': page})
+            if i < len(ports) - 1:
+                pages[-1]['ports_links'] = [{'href': test_cli20.end_url(
+                    path, 'limit=1&marker=page%d' % i), 'rel': 'next'}]
+        printed = []
+
+        def fake_request(url, method, body=None, headers=None):
+            # The rows of a page are printed before the next page is
+            # requested.
+            printed.append(self.fake_stdout.make_string())
+            return (test_cli20.MyResp(200),
+                    self.client.serialize(pages[len(printed) - 1]))
+
+        cmd_parser = cmd.get_parser('list_ports')
+        if args is None:
+            args = ['-c', 'id', '-c', 'name']
+        args = ['-f', output_format, '-P', '1'] + args
+        with mock.patch.object(cmd, "get_client",
+                               return_value=self.client), \
+                mock.patch.object(self.client.httpclient, "request",
+                                  side_effect=fake_request):
+            shell.run_command(cmd, cmd_parser, args)
+        return printed, self.fake_stdout.make_string()
+
+    def test_list_ports_streamed(self):
+        printed, output = self._test_list_ports_streamed('value')
+        self.assertEqual(['', 'myid1 port1\n'], printed)
+        self.assertEqual('myid1 port1\nmyid2 port2\n', output)
+
+    def test_list_ports_streamed_csv(self):
+        printed, output = self._test_list_ports_streamed('csv')
+        self.assertIn('myid1', printed[1])
+        self.assertEqual(['"id","name"', '"myid1","port1"',
+                          '"myid2","port2"'], output.split())
+
+    def test_list_ports_streamed_with_other_keys(self):
+        # The columns of the first page are kept for the following ones.
+        ports = [[{'id': 'myid1', 'name': 'port1',
+                   'mac_address': 'fa:16:3e:00:00:01'}],
+                 [{'id': 'myid2', 'name': 'port2', 'status': 'ACTIVE',
+                   'fixed_ips': []}],
+                 [{'id': 'myid3', 'mac_address': 'fa:16:3e:00:00:03',
+                   'status': 'DOWN'}]]
+        printed, output = self._test_list_ports_streamed(
+            'csv', ports=ports, args=[])
+        self.assertEqual(['"id","name","mac_address"',
+                          '"myid1","port1","fa:16:3e:00:00:01"',
+                          '"myid2","port2",""',
+                          '"myid3","","fa:16:3e:00:00:03"'],
+                         output.split())
+
+    def test_list_ports_streamed_with_empty_pages(self):
+        ports = [[], [{'id': 'myid1', 'name': 'port1'}], [],
+                 [{'id': 'myid2', 'name': 'port2'}]]
+        printed, output = self._test_list_ports_streamed(
+            'value', ports=ports)
+        self.assertEqual('myid1 port1\nmyid2 port2\n', output)
+
     def _test_list_router_port(self, resources, cmd,
                                myid, detail=False, tags=(),
                                fields_1=(), fields_2=()):
@@ -14,9 +14,16 @@
 #    under the License.
 #
 
+import os
 import sys
+import threading
 
+import fixtures
+import mock
+
+from neutronclient.common import exceptions
 from neutronclient.neutron.v2_0 import purge
+from neutronclient import shell
 from neutronclient.tests.unit import test_cli20
 
 
@@ -98,3 +105,191 @@ class CLITestV20Purge(test_cli20.CLITestV20Base):
         # and all are not deleteable
         deleted = self._generate_resources_dict()
         self._verify_result(my_purge, deleted, failed)
+
+    def test_get_levels(self):
+        my_purge = purge.Purge(test_cli20.MyApp(sys.stdout), None)
+        self.assertEqual([['floatingip'], ['port'],
+                          ['router', 'security_group'], ['network']],
+                         my_purge._get_levels(self.resource_types))
+        # Dependencies on the types not purged are ignored.
+        self.assertEqual([['router'], ['network']],
+                         my_purge._get_levels(['router', 'network']))
+
+    def _fake_client(self, tenant_resources):
+        calls = []
+        lock = threading.Lock()
+        neutron_client = mock.Mock()
+
+        def record(name):
+            def _call(*args):
+                with lock:
+                    calls.append((name,) + args[:1])
+            return _call
+
+        for resource_type in self.resource_types:
+            plural = resource_type + 's'
+            getattr(neutron_client, 'list_' + plural).return_value = iter(
+                tenant_resources.get(resource_type, []))
+            getattr(neutron_client, 'delete_' + resource_type).side_effect = (
+                record('delete_' + resource_type))
+        neutron_client.remove_interface_router.side_effect = record(
+            'remove_interface_router')
+        return neutron_client, calls
+
+    def _purge(self, neutron_client, args=('mytenant',)):
+        cmd = purge.Purge(test_cli20.MyApp(sys.stdout), None)
+        cmd_parser = cmd.get_parser('purge')
+        with mock.patch.object(cmd, 'get_client',
+                               return_value=neutron_client):
+            shell.run_command(cmd, cmd_parser, list(args))
+        return self.fake_stdout.make_string()
+
+    def test_purge_dependency_order(self):
+        def _res(_id, **kwargs):
+            return dict(id=_id, tenant_id='mytenant', **kwargs)
+
+        neutron_client, calls = self._fake_client({
+            'floatingip': [_res('fip1'), _res('fip2')],
+            'port': [_res('port1', device_owner='network:router_interface',
+                          device_id='router1'),
+                     _res('port2', device_owner='compute:nova'),
+                     {'id': 'other', 'tenant_id': 'othertenant'}],
+            'router': [_res('router1')],
+            'network': [_res('net1')],
+            'security_group': [_res('sg1')]})
+        output = self._purge(neutron_client, ['--parallel', '4', 'mytenant'])
+
+        neutron_client.list_ports.assert_called_once_with(
+            fields=['id', 'tenant_id', 'device_id', 'device_owner'],
+            tenant_id='mytenant', stream=True)
+        self.assertNotIn(('delete_port', 'other'), calls)
+        self.assertEqual(7, len(calls))
+        index = dict((call, i) for i, call in enumerate(calls))
+        for fip in ('fip1', 'fip2'):
+            self.assertLess(index[('delete_floatingip', fip)],
+                            index[('remove_interface_router', 'router1')])
+            self.assertLess(index[('delete_floatingip', fip)],
+                            index[('delete_port', 'port2')])
+        for port in (('remove_interface_router', 'router1'),
+                     ('delete_port', 'port2')):
+            self.assertLess(index[port], index[('delete_router', 'router1')])
+            self.assertLess(index[port],
+                            index[('delete_security_group', 'sg1')])
+        self.assertLess(index[('delete_router', 'router1')],
+                        index[('delete_network', 'net1')])
+        self.assertIn('Purging resources: 100% complete.', output)
+        self.assertIn('Deleted 2 floatingips, 2 ports, 1 router, '
+                      '1 network, 1 security_group.', output)
+
+    @mock.patch('time.sleep')
+    def test_purge_skips_owned_ports(self, mock_sleep):
+        neutron_client, calls = self._fake_client({
+            'floatingip': [{'id': 'fip1', 'tenant_id': 'mytenant'}],
+            'port': [{'id': 'port1', 'tenant_id': 'mytenant',
+                      'device_owner': 'network:router_gateway',
+                      'device_id': 'router1'},
+                     {'id': 'port2', 'tenant_id': 'mytenant',
+                      'device_owner': 'network:floatingip',
+                      'device_id': 'fip1'}],
+            'router': [{'id': 'router1', 'tenant_id': 'mytenant'}]})
+        output = self._purge(neutron_client)
+
+        # They are deleted along with their router and floating IP.
+        self.assertEqual([('delete_floatingip', 'fip1'),
+                          ('delete_router', 'router1')], calls)
+        self.assertFalse(mock_sleep.called)
+        self.assertIn('Deleted 1 floatingip, 1 router.', output)
+        self.assertNotIn('could not be deleted', output)
+
+    @mock.patch('time.sleep')
+    def test_purge_retries_conflicts(self, mock_sleep):
+        neutron_client, calls = self._fake_client({
+            'network': [{'id': 'net1', 'tenant_id': 'mytenant'},
+                        {'id': 'net2', 'tenant_id': 'mytenant'}],
+            'security_group': [{'id': 'sg1', 'tenant_id': 'mytenant'}]})
+
+        attempts = []
+
+        def delete_network(network_id):
+            attempts.append(network_id)
+            if network_id == 'net2' or attempts.count('net1') == 1:
+                raise exceptions.NetworkInUseClient()
+
+        neutron_client.delete_network.side_effect = delete_network
+        neutron_client.delete_security_group.side_effect = (
+            exceptions.NotFound())
+        output = self._purge(neutron_client)
+
+        retries = purge.Purge.retry_policy.retries
+        # net1 is deleted on its second attempt, net2 never is.
+        self.assertEqual(['net1'] * 2 + ['net2'] * (1 + retries),
+                         sorted(attempts))
+        self.assertIn('Deleted 1 network, 1 security_group. The following '
+                      'resources could not be deleted: 1 network.', output)
+
+    def test_purge_page_size(self):
+        neutron_client, calls = self._fake_client({})
+        output = self._purge(neutron_client,
+                             ['--page-size', '100', 'mytenant'])
+        neutron_client.list_networks.assert_called_once_with(
+            fields=['id', 'tenant_id'], tenant_id='mytenant', limit=100,
+            stream=True)
+        self.assertIn('Tenant has no supported resources.', output)
+
+    def _tenant_resources(self):
+        return {
+            'port': [{'id': 'port1', 'tenant_id': 'mytenant',
+                      'device_owner': 'compute:nova'}],
+            'network': [{'id': 'net1', 'tenant_id': 'mytenant'},
+                        {'id': 'net2', 'tenant_id': 'mytenant'}]}
+
+    def test_purge_dry_run(self):
+        neutron_client, calls = self._fake_client(self._tenant_resources())
+        output = self._purge(neutron_client,
+                             ['--dry-run', '--page-size', '1', 'mytenant'])
+        self.assertEqual([], calls)
+        self.assertIn('Purge plan for tenant mytenant:', output)
+        self.assertIn('Step 2: 1 port', output)
+        self.assertIn('Step 4: 2 networks', output)
+        self.assertIn('Estimated requests: 8 to list the resources, '
+                      '3 to delete them.', output)
+
+    def test_purge_resume(self):
+        plan_file = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'plan.json')
+        neutron_client, calls = self._fake_client(self._tenant_resources())
+
+        def delete_network(network_id):
+            if network_id == 'net2':
+                raise exceptions.NeutronClientException()
+
+        neutron_client.delete_network.side_effect = delete_network
+        output = self._purge(neutron_client,
+                             ['--plan-file', plan_file, 'mytenant'])
+        self.assertIn('could not be deleted: 1 network.', output)
+        with open(plan_file + '.done') as f:
+            self.assertEqual(['port port1', 'network net1'],
+                             f.read().splitlines())
+
+        neutron_client.reset_mock()
+        neutron_client.delete_network.side_effect = None
+        output = self._purge(neutron_client,
+                             ['--plan-file', plan_file, '--resume',
+                              'mytenant'])
+        # Nothing is listed again and only the network left is deleted.
+        self.assertFalse(neutron_client.list_networks.called)
+        self.assertFalse(neutron_client.delete_port.called)
+        neutron_client.delete_network.assert_called_once_with('net2')
+        self.assertIn('Deleted 1 network.', output)
+
+    def test_purge_resume_errors(self):
+        plan_file = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'plan.json')
+        neutron_client, calls = self._fake_client({})
+        self.assertRaises(exceptions.CommandError, self._purge,
+                          neutron_client, ['--resume', 'mytenant'])
+        self._purge(neutron_client, ['--plan-file', plan_file, '--dry-run',
+                                     'mytenant'])
+        self.assertRaises(exceptions.CommandError, self._purge,
+                          neutron_client, ['--plan-file', plan_file,
+                                           '--resume', 'othertenant'])
@@ -20,10 +20,10 @@ import mock
 from oslo_utils import uuidutils
 import six
 
-from neutronclient.common import exceptions
 from neutronclient.common import utils
 from neutronclient.neutron.v2_0 import securitygroup
 from neutronclient.tests.unit import test_cli20
+from neutronclient.v2_0 import client
 
 
 class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
@@ -220,7 +220,7 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
         mock_extend_list.assert_called_once_with(test_cli20.IsA(list),
                                                  mock.ANY)
 
-    def _build_test_data(self, data, excess=0):
+    def _build_test_data(self, data):
         # Length of a query filter on security group rule id
         # in these testcases, id='secgroupid%02d' (with len(id)=12)
         sec_group_id_filter_len = 12
@@ -241,7 +241,7 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
         result = []
 
         sec_group_count = len(sec_group_ids)
-        max_size = ((sec_group_id_filter_len * sec_group_count) - excess)
+        max_size = sec_group_id_filter_len * sec_group_count
         chunk_size = max_size // sec_group_id_filter_len
 
         for i in range(0, sec_group_count, chunk_size):
@@ -300,41 +300,37 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
         cmd = securitygroup.ListSecurityGroupRule(
             test_cli20.MyApp(sys.stdout), None)
         path = getattr(self.client, resources + '_path')
-        responses = self._build_test_data(data, excess=1)
-
         known_args, _vs = cmd.get_parser(
             'list' + resources).parse_known_args()
-        mock_request_side_effects = []
-        mock_request_calls = []
-        mock_check_uri_side_effects = [exceptions.RequestURITooLong(excess=1)]
-        mock_check_uri_calls = [mock.call(mock.ANY)]
-        for item in responses:
-            mock_request_side_effects.append(item['response'])
-            mock_request_calls.append(mock.call(
-                test_cli20.MyUrlComparator(
-                    test_cli20.end_url(path, item['filter']), self.client),
-                'GET',
-                body=None,
-                headers=test_cli20.ContainsKeyValue(
-                    {'X-Auth-Token': test_cli20.TOKEN})))
-            mock_check_uri_side_effects.append(None)
-            mock_check_uri_calls.append(mock.call(mock.ANY))
+        # Room for 10 '&id=secgroupidNN' filters, the 21 IDs need 3 requests
+        max_uri_len = (len(self.endurl) + len(self.client.action_prefix) +
+                       client.URI_PATH_RESERVE +
+                       len('?fields=id&fields=name') + 10 * 16)
+
+        def _request(url, method, body=None, headers=None):
+            query = six.moves.urllib.parse.urlparse(url).query
+            ids = six.moves.urllib.parse.parse_qs(query)['id']
+            resp_str = self.client.serialize(
+                {'security_groups': [{'id': i, 'name': 'sg-' + i}
+                                     for i in ids]})
+            return (test_cli20.MyResp(200), resp_str)
 
         with mock.patch.object(cmd, "get_client",
                                return_value=self.client) as mock_get_client, \
-                mock.patch.object(self.client.httpclient,
-                                  "request") as mock_request, \
-                mock.patch.object(self.client.httpclient,
-                                  "_check_uri_length") as mock_check_uri:
-            mock_request.side_effect = mock_request_side_effects
-            mock_check_uri.side_effect = mock_check_uri_side_effects
+                mock.patch.object(self.client.httpclient, "request",
+                                  side_effect=_request) as mock_request, \
+                mock.patch('neutronclient.client.MAX_URI_LEN',
+                           max_uri_len):
             cmd.extend_list(data, known_args)
 
         mock_get_client.assert_called_once_with()
-        mock_request.assert_has_calls(mock_request_calls)
-        mock_check_uri.assert_has_calls(mock_check_uri_calls)
-        self.assertEqual(len(mock_request_calls), mock_request.call_count)
-        self.assertEqual(len(mock_check_uri_calls), mock_check_uri.call_count)
+        self.assertEqual(3, mock_request.call_count)
+        for call in mock_request.call_args_list:
+            self.assertTrue(call[0][0].startswith(
+                test_cli20.end_url(path, 'fields=id&fields=name&id=')))
+        for i, rule in enumerate(data):
+            self.assertEqual('sg-secgroupid%02d' % i,
+                             rule['security_group_id'])
 
     @mock.patch.object(securitygroup.ListSecurityGroupRule, "extend_list")
     def test_list_security_group_rules_pagination(self, mock_extend_list):
@@ -440,12 +436,14 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
             self.assertEqual(exp, res)
 
     def _test_list_security_group_rules_extend_sg_name(
-            self, expected_mode=None, args=(), conv=True, query_field=False):
+            self, expected_mode=None, args=(), conv=True, query_field=False,
+            columns_fields=None):
         if query_field:
             field_filters = ['id', 'security_group_id',
                              'remote_ip_prefix', 'remote_group_id']
         else:
-            field_filters = None
+            # Only the fields needed by the columns selected are requested.
+            field_filters = columns_fields
 
         data = [self._prepare_rule(rule_id='ruleid1', sg_id='myid1',
                                    remote_group_id='myid1',
@@ -479,23 +477,28 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
 
     def test_list_security_group_rules_extend_remote_sg_name(self):
         args = '-c id -c security_group -c remote'.split()
-        self._test_list_security_group_rules_extend_sg_name(args=args)
+        self._test_list_security_group_rules_extend_sg_name(
+            args=args, columns_fields=['id', 'security_group_id',
+                                       'remote_ip_prefix', 'remote_group_id'])
 
     def test_list_security_group_rules_extend_sg_name_noconv(self):
         args = '--no-nameconv -c id -c security_group_id -c remote_group_id'
         args = args.split()
         self._test_list_security_group_rules_extend_sg_name(
-            expected_mode='noconv', args=args, conv=False)
+            expected_mode='noconv', args=args, conv=False,
+            columns_fields=['id', 'security_group_id', 'remote_group_id'])
 
     def test_list_security_group_rules_extend_sg_name_with_columns(self):
         args = '-c id -c security_group_id -c remote_group_id'.split()
         self._test_list_security_group_rules_extend_sg_name(
-            expected_mode='remote_group_id', args=args)
+            expected_mode='remote_group_id', args=args,
+            columns_fields=['id', 'security_group_id', 'remote_group_id'])
 
     def test_list_security_group_rules_extend_sg_name_with_columns_no_id(self):
         args = '-c id -c security_group -c remote_group'.split()
         self._test_list_security_group_rules_extend_sg_name(
-            expected_mode='remote_group_id', args=args)
+            expected_mode='remote_group_id', args=args,
+            columns_fields=['id', 'security_group_id', 'remote_group_id'])
 
     def test_list_security_group_rules_extend_sg_name_with_fields(self):
         # NOTE: remote_ip_prefix is required to show "remote" column
@@ -511,6 +514,23 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
         self._test_list_security_group_rules_extend_sg_name(args=args,
                                                             query_field=True)
 
+    def test_list_security_group_rules_streamed(self):
+        cmd = securitygroup.ListSecurityGroupRule(
+            test_cli20.MyApp(sys.stdout), None)
+        parsed_args = cmd.get_parser('list_security_group_rules').parse_args(
+            '-f value -c id -c security_group'.split())
+        pages = [[{'id': 'ruleid1', 'security_group_id': 'myid1'}],
+                 [{'id': 'ruleid2', 'security_group_id': 'myid2',
+                   'direction': 'ingress'}]]
+        sg_names = {'myid1': 'group1', 'myid2': 'group2'}
+        with mock.patch.object(cmd, '_get_sg_name_dict',
+                               return_value=sg_names):
+            cols, rows = cmd._setup_streamed_columns(pages, parsed_args)
+            rows = list(rows)
+        self.assertEqual(['id', 'security_group'], cols)
+        self.assertEqual([('ruleid1', 'group1'), ('ruleid2', 'group2')],
+                         rows)
+
     def test_list_security_group_rules_extend_remote(self):
         args = '-c id -c security_group -c remote'.split()
 
@@ -524,7 +544,10 @@ class CLITestV20SecurityGroupsJSON(test_cli20.CLITestV20Base):
                     'data': [('ruleid1', 'group1', '172.16.18.0/24 (CIDR)'),
                              ('ruleid2', 'group2', '172.16.20.0/24 (CIDR)'),
                              ('ruleid3', 'group2', 'group3 (group)')]}
-        self._test_list_security_group_rules_extend(data, expected, args)
+        self._test_list_security_group_rules_extend(
+            data, expected, args,
+            query_fields=['id', 'security_group_id', 'remote_ip_prefix',
+                          'remote_group_id'])
 
     def test_list_security_group_rules_extend_proto_port(self):
         data = [self._prepare_rule(rule_id='ruleid1', sg_id='myid1',
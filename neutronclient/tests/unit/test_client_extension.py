@@ -15,14 +15,20 @@
 #
 
 import inspect
+import os
 import sys
+import threading
+import time
 
+import fixtures
 import mock
+import testtools
 
 from neutronclient.common import extension
 from neutronclient.neutron.v2_0.contrib import _fox_sockets as fox_sockets
 from neutronclient import shell
 from neutronclient.tests.unit import test_cli20
+from neutronclient.v2_0 import client
 
 
 class CLITestV20ExtensionJSON(test_cli20.CLITestV20Base):
@@ -37,6 +43,8 @@ class CLITestV20ExtensionJSON(test_cli20.CLITestV20Base):
     def _mock_extension_loading(self):
         ext_pkg = 'neutronclient.common.extension'
         contrib = mock.patch(ext_pkg + '._discover_via_entry_points').start()
+        extension.reset_cache()
+        self.addCleanup(extension.reset_cache)
         contrib.return_value = [("_fox_sockets", fox_sockets)]
         return contrib
 
@@ -115,6 +123,95 @@ class CLITestV20ExtensionJSON(test_cli20.CLITestV20Base):
                                  args, ['id', 'name'])
 
 
+class ExtensionDiscoveryTest(testtools.TestCase):
+
+    def setUp(self):
+        super(ExtensionDiscoveryTest, self).setUp()
+        self.discover = mock.patch('neutronclient.common.extension.'
+                                   '_discover_via_entry_points').start()
+        self.discover.return_value = [("_fox_sockets", fox_sockets)]
+        self.addCleanup(mock.patch.stopall)
+        extension.reset_cache()
+        self.addCleanup(extension.reset_cache)
+
+    def _client(self):
+        return client.Client(token='token', endpoint_url='localurl')
+
+    def test_discovered_once(self):
+        self._client()
+        self._client()
+        shell.NeutronShell('2.0')
+        self.assertEqual(1, self.discover.call_count)
+
+    def test_methods_bound_on_first_access(self):
+        neutron = self._client()
+        self.assertNotIn('list_fox_sockets', neutron.__dict__)
+        self.assertEqual('/fox_sockets', neutron.fox_sockets_path)
+        list_fox_sockets = neutron.list_fox_sockets
+        self.assertIs(list_fox_sockets, neutron.__dict__['list_fox_sockets'])
+        self.assertTrue(hasattr(neutron, 'show_fox_socket'))
+        self.assertFalse(hasattr(neutron, 'list_fox_hounds'))
+        with mock.patch.object(neutron, 'list_ext') as list_ext:
+            neutron.list_fox_sockets(name='fox')
+        list_ext.assert_called_once_with('fox_sockets', '/fox_sockets',
+                                         True, name='fox')
+
+    def test_methods_bound_concurrently(self):
+        extend_list = client.Client.extend_list
+
+        def _slow_extend_list(neutron, *args):
+            # Let the other threads look the method up meanwhile.
+            time.sleep(0.05)
+            extend_list(neutron, *args)
+
+        with mock.patch.object(client.Client, 'extend_list',
+                               _slow_extend_list):
+            neutron = self._client()
+        results = []
+        errors = []
+
+        def _get():
+            try:
+                results.append(neutron.list_fox_sockets)
+            except Exception as e:
+                errors.append(e)
+        threads = [threading.Thread(target=_get) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([], errors)
+        self.assertEqual(5, len(results))
+        self.assertTrue(all(r is results[0] for r in results))
+
+    def test_shell_doc_prefixed_once(self):
+        shell.NeutronShell('2.0')
+        shell.NeutronShell('2.0')
+        self.assertFalse(fox_sockets.FoxInSocketsList.__doc__.startswith(
+            "[_fox_sockets] [_fox_sockets]"))
+
+    def test_disk_cache(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'extensions.json')
+        self.useFixture(fixtures.EnvironmentVariable(extension.CACHE_ENV,
+                                                     path))
+        self.assertEqual([("_fox_sockets", fox_sockets)],
+                         extension.discover_extensions())
+        self.assertTrue(os.path.exists(path))
+
+        extension.reset_cache()
+        self.assertEqual([("_fox_sockets", fox_sockets)],
+                         extension.discover_extensions())
+        self.assertEqual(1, self.discover.call_count)
+
+        # Installing or upgrading a distribution invalidates the cache.
+        extension.reset_cache()
+        with mock.patch.object(extension, '_installed_distributions',
+                               return_value=['foo-1.0.dist-info']):
+            extension.discover_extensions()
+        self.assertEqual(2, self.discover.call_count)
+
+
 class CLITestV20ExtensionJSONAlternatePlurals(test_cli20.CLITestV20Base):
     class IPAddress(extension.NeutronClientExtension):
         resource = 'ip_address'
@@ -134,6 +231,8 @@ class CLITestV20ExtensionJSONAlternatePlurals(test_cli20.CLITestV20Base):
     def _mock_extension_loading(self):
         ext_pkg = 'neutronclient.common.extension'
         contrib = mock.patch(ext_pkg + '._discover_via_entry_points').start()
+        extension.reset_cache()
+        self.addCleanup(extension.reset_cache)
         ip_address = mock.Mock()
         ip_address.IPAddress = self.IPAddress
         ip_address.IPAddressesList = self.IPAddressesList
@@ -189,6 +288,8 @@ class CLITestV20ExtensionJSONChildResource(test_cli20.CLITestV20Base):
     def _mock_extension_loading(self):
         ext_pkg = 'neutronclient.common.extension'
         contrib = mock.patch(ext_pkg + '._discover_via_entry_points').start()
+        extension.reset_cache()
+        self.addCleanup(extension.reset_cache)
         child = mock.Mock()
         child.Child = self.Child
         child.ChildrenList = self.ChildrenList
@@ -14,15 +14,25 @@
 #    under the License.
 
 import abc
-
+import datetime
+import json
+import os
+import threading
+
+import fixtures
+from keystoneauth1 import fixture as ks_fixture
+import mock
 from oslo_utils import uuidutils
 import osprofiler.profiler
 import osprofiler.web
+import requests
 from requests_mock.contrib import fixture as mock_fixture
 import six
 import testtools
 
 from neutronclient import client
+from neutronclient.common import auth_cache
+from neutronclient.common import circuit_breaker
 from neutronclient.common import exceptions
 
 
@@ -157,3 +167,275 @@ class TestHTTPClientWithReqId(TestHTTPClientMixin, testtools.TestCase):
         }
         self.requests.register_uri(METHOD, URL, request_headers=headers)
         self.http.request(URL, METHOD)
+
+
+class TestHTTPClientConnectionPool(testtools.TestCase):
+
+    def setUp(self):
+        super(TestHTTPClientConnectionPool, self).setUp()
+        self.requests = self.useFixture(mock_fixture.Fixture())
+        self.requests.register_uri(METHOD, END_URL + URL, text='content')
+        self.http = client.HTTPClient(token=AUTH_TOKEN, endpoint_url=END_URL,
+                                      pool_maxsize=4)
+        self.addCleanup(self.http.close)
+
+    def test_session_is_shared_between_requests(self):
+        self.http.do_request(URL, METHOD)
+        session = self.http._session
+        self.assertIsNotNone(session)
+        self.http.do_request(URL, METHOD)
+        self.assertIs(session, self.http._session)
+        adapter = session.adapters['https://']
+        self.assertEqual(4, adapter._pool_maxsize)
+
+    def test_close_releases_session(self):
+        self.http.do_request(URL, METHOD)
+        session = self.http._session
+        self.http.close()
+        self.assertIsNone(self.http._session)
+        self.http.do_request(URL, METHOD)
+        self.assertIsNot(session, self.http._session)
+
+    def test_idle_session_is_recycled(self):
+        self.http.pool_idle_timeout = 30
+        self.http.do_request(URL, METHOD)
+        session = self.http._session
+        self.http._session_last_used -= 10
+        self.http.do_request(URL, METHOD)
+        self.assertIs(session, self.http._session)
+        self.http._session_last_used -= 31
+        self.http.do_request(URL, METHOD)
+        self.assertIsNot(session, self.http._session)
+
+    def test_pool_stats(self):
+        self.assertEqual({'hits': 0, 'misses': 0},
+                         self.http.get_pool_stats())
+        session = self.http._get_session()
+        pools = session.adapters['https://'].poolmanager.pools
+        pools['fake-host'] = mock.Mock(num_connections=2, num_requests=7)
+        self.assertEqual({'hits': 5, 'misses': 2},
+                         self.http.get_pool_stats())
+        # Counters survive the pool being closed.
+        self.http.close()
+        self.assertEqual({'hits': 5, 'misses': 2},
+                         self.http.get_pool_stats())
+
+
+class TestHTTPClientCircuitBreaker(testtools.TestCase):
+
+    def setUp(self):
+        super(TestHTTPClientCircuitBreaker, self).setUp()
+        self.requests = self.useFixture(mock_fixture.Fixture())
+        self.now = 0
+        self.breaker = circuit_breaker.CircuitBreaker(
+            failure_threshold=2, reset_timeout=10, timer=lambda: self.now)
+        self.http = client.HTTPClient(token=AUTH_TOKEN, endpoint_url=END_URL,
+                                      circuit_breaker=self.breaker)
+
+    def test_opens_after_consecutive_failures(self):
+        self.requests.register_uri(METHOD, END_URL + URL, status_code=503)
+        self.http.do_request(URL, METHOD)
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+        self.http.do_request(URL, METHOD)
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state)
+
+        self.assertRaises(exceptions.CircuitBreakerOpen,
+                          self.http.do_request, URL, METHOD)
+        self.assertEqual(2, self.requests.call_count)
+        self.assertEqual({'state': 'open', 'consecutive_failures': 2,
+                          'trips': 1, 'rejected': 1},
+                         self.breaker.get_stats())
+
+    def test_success_resets_failures(self):
+        self.requests.register_uri(METHOD, END_URL + URL,
+                                   [{'status_code': 500},
+                                    {'status_code': 404},
+                                    {'status_code': 500}])
+        for i in range(3):
+            self.http.do_request(URL, METHOD)
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+
+    def test_half_open_probe(self):
+        self.requests.register_uri(METHOD, END_URL + URL,
+                                   exc=requests.exceptions.ConnectTimeout)
+        for i in range(2):
+            self.assertRaises(exceptions.ConnectionFailed,
+                              self.http.do_request, URL, METHOD)
+        self.now = 10
+        # The failed probe opens the circuit again.
+        self.assertRaises(exceptions.ConnectionFailed,
+                          self.http.do_request, URL, METHOD)
+        self.assertRaises(exceptions.CircuitBreakerOpen,
+                          self.http.do_request, URL, METHOD)
+
+        self.now = 20
+        self.requests.register_uri(METHOD, END_URL + URL, text='content')
+        self.http.do_request(URL, METHOD)
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+        self.assertEqual(4, self.requests.call_count)
+
+    def test_opens_on_slow_responses(self):
+        self.breaker = circuit_breaker.CircuitBreaker(
+            latency_threshold=1, latency_window=10)
+        self.breaker._latencies.extend([2] * 9)
+        self.http.circuit_breaker = self.breaker
+        self.requests.register_uri(METHOD, END_URL + URL, text='content')
+        self.http.do_request(URL, METHOD)
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state)
+
+
+class TestHTTPClientAuthCache(testtools.TestCase):
+
+    auth_url = 'http://keystone.test:5000/v2.0'
+    endpoint = 'http://neutron.test:9696'
+    path = '/v2.0/test'
+
+    def setUp(self):
+        super(TestHTTPClientAuthCache, self).setUp()
+        self.requests = self.useFixture(mock_fixture.Fixture())
+        self.cache = auth_cache.MemoryAuthCache()
+        self.requests.register_uri(METHOD, self.endpoint + self.path,
+                                   text='ok')
+
+    def _token(self, expires):
+        token = ks_fixture.V2Token(token_id=uuidutils.generate_uuid(),
+                                   expires=expires)
+        service = token.add_service('network')
+        service.add_endpoint(self.endpoint, region='RegionOne')
+        return token
+
+    def _client(self, cache=None):
+        return client.HTTPClient(username='user', password='pass',
+                                 project_name='project',
+                                 auth_url=self.auth_url,
+                                 region_name='RegionOne',
+                                 auth_cache=cache or self.cache)
+
+    def _register_tokens(self, *tokens):
+        self.requests.register_uri('POST', self.auth_url + '/tokens',
+                                   [{'json': t} for t in tokens])
+
+    def test_token_shared_between_clients(self):
+        expires = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        token = self._token(expires)
+        self._register_tokens(token)
+
+        self._client().do_request(self.path, METHOD)
+        http = self._client()
+        http.do_request(self.path, METHOD)
+
+        self.assertEqual(token.token_id, http.auth_token)
+        self.assertEqual(self.endpoint, http.endpoint_url)
+        self.assertEqual(1, len([r for r in self.requests.request_history
+                                 if r.method == 'POST']))
+
+    def test_token_refreshed_before_expiry(self):
+        expires = datetime.datetime.utcnow() + datetime.timedelta(seconds=30)
+        later = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        old, new = self._token(expires), self._token(later)
+        self._register_tokens(old, new)
+
+        http = self._client()
+        http.do_request(self.path, METHOD)
+        self.assertEqual(old.token_id, http.auth_token)
+        # Renewed before the next request instead of after a 401.
+        http.do_request(self.path, METHOD)
+        self.assertEqual(new.token_id, http.auth_token)
+        self.assertEqual(new.token_id,
+                         self.requests.last_request.headers['X-Auth-Token'])
+        self.assertEqual(2, len([r for r in self.requests.request_history
+                                 if r.method == 'POST']))
+
+    def test_revoked_cached_token_is_dropped(self):
+        expires = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        revoked, new = self._token(expires), self._token(expires)
+        self._register_tokens(revoked, new)
+        self._client().authenticate()
+        self.requests.register_uri(METHOD, self.endpoint + self.path,
+                                   [{'status_code': 401}, {'text': 'ok'}])
+
+        http = self._client()
+        http.do_request(self.path, METHOD)
+        self.assertEqual(new.token_id, http.auth_token)
+        entry = self.cache.get(http._auth_cache_key())
+        self.assertEqual(new.token_id,
+                         entry['auth_ref']['access']['token']['id'])
+
+    def test_file_cache(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'auth.json')
+        cache = auth_cache.FileAuthCache(path)
+        expires = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        self._register_tokens(self._token(expires))
+
+        self._client(cache).do_request(self.path, METHOD)
+        self._client(auth_cache.FileAuthCache(path)).do_request(self.path,
+                                                                METHOD)
+
+        self.assertEqual(0o600, os.stat(path).st_mode & 0o777)
+        self.assertEqual(1, len([r for r in self.requests.request_history
+                                 if r.method == 'POST']))
+        cache.delete(self._client()._auth_cache_key())
+        with open(path) as f:
+            self.assertEqual({}, json.load(f))
+
+    def test_cache_key_leaves_password_out(self):
+        http = self._client()
+        other = self._client()
+        other.password = 'other'
+        self.assertEqual(http._auth_cache_key(), other._auth_cache_key())
+
+    def test_endpoint_shared_between_tokens(self):
+        path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                            'auth.json')
+        endpoints = {'endpoints': [{'type': 'network',
+                                    'region': 'RegionOne',
+                                    'publicURL': self.endpoint}]}
+        for token in ('token1', 'token2'):
+            self.requests.register_uri(
+                'GET', self.auth_url + '/tokens/%s/endpoints' % token,
+                json=endpoints)
+            http = client.HTTPClient(token=token, auth_url=self.auth_url,
+                                     region_name='RegionOne',
+                                     auth_cache=auth_cache.FileAuthCache(path))
+            http.do_request(self.path, METHOD)
+            self.assertEqual(self.endpoint, http.endpoint_url)
+
+        self.assertEqual(1, len([r for r in self.requests.request_history
+                                 if r.path.endswith('/endpoints')]))
+        with open(path) as f:
+            self.assertEqual(1, len(json.load(f)))
+
+    def _post_count(self):
+        return len([r for r in self.requests.request_history
+                    if r.method == 'POST'])
+
+    def test_token_refreshed_in_background(self):
+        soon = datetime.datetime.utcnow() + datetime.timedelta(seconds=90)
+        later = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        old, new = self._token(soon), self._token(later)
+        self._register_tokens(old, new)
+
+        http = self._client()
+        http.do_request(self.path, METHOD)
+        http.do_request(self.path, METHOD)
+        # The request did not wait for the new token.
+        self.assertEqual(old.token_id,
+                         self.requests.last_request.headers['X-Auth-Token'])
+        http._refresher.join()
+        self.assertEqual(new.token_id, http.auth_token)
+        self.assertEqual(2, self._post_count())
+
+    def test_single_flight_authentication(self):
+        expires = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+        self._register_tokens(self._token(expires))
+        http = self._client()
+        threads = [threading.Thread(target=http.do_request,
+                                    args=(self.path, METHOD))
+                   for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, self._post_count())
+        self.assertEqual(11, len(self.requests.request_history))
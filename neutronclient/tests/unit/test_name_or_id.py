@@ -16,6 +16,7 @@
 
 import mock
 from oslo_utils import uuidutils
+import six.moves.urllib.parse as urlparse
 import testtools
 
 from neutronclient.common import exceptions
@@ -241,3 +242,178 @@ class CLITestNameorID(testtools.TestCase):
 
     def test_get_resourceid_by_id(self):
         self._test_get_resource_by_id(id_only=True)
+
+
+class FindResourceCacheTest(testtools.TestCase):
+
+    def setUp(self):
+        super(FindResourceCacheTest, self).setUp()
+        self.client = client.Client(token=test_cli20.TOKEN,
+                                    endpoint_url=test_cli20.ENDURL,
+                                    resolve_cache_ttl=60)
+
+    def _resp(self, body):
+        return (test_cli20.MyResp(200), self.client.serialize(body))
+
+    def test_name_is_resolved_once(self):
+        _id = uuidutils.generate_uuid()
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=[
+                                   self._resp({'networks': [{'id': _id}]})
+                               ]) as mock_request:
+            for i in range(3):
+                self.assertEqual(_id, neutronV20.find_resourceid_by_name_or_id(
+                    self.client, 'network', 'mynet'))
+        self.assertEqual(1, mock_request.call_count)
+
+    def test_cache_dropped_on_write(self):
+        _id = uuidutils.generate_uuid()
+        found = self._resp({'networks': [{'id': _id}]})
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=[found, self._resp({}), found]
+                               ) as mock_request:
+            self.client.find_resource('network', 'mynet', fields='id')
+            self.client.delete_network(_id)
+            self.client.find_resource('network', 'mynet', fields='id')
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_trust_uuid(self):
+        _id = uuidutils.generate_uuid()
+        with mock.patch.object(self.client.httpclient,
+                               "request") as mock_request:
+            self.assertEqual({'id': _id}, self.client.find_resource(
+                'network', _id, trust_uuid=True))
+            self.assertEqual([_id], self.client.find_resource_ids(
+                'network', [_id], trust_uuid=True))
+        self.assertFalse(mock_request.called)
+
+    def test_find_resource_ids(self):
+        ids = [uuidutils.generate_uuid() for i in range(3)]
+        by_id = {'networks': [{'id': ids[0]}]}
+        by_name = {'networks': [{'id': ids[1], 'name': 'net1'},
+                                {'id': ids[2], 'name': 'net2'}]}
+        path = getattr(self.client, "networks_path")
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=[self._resp(by_id),
+                                            self._resp(by_name)]
+                               ) as mock_request:
+            self.assertEqual(
+                [ids[0], ids[1], ids[2], ids[1]],
+                self.client.find_resource_ids(
+                    'network', [ids[0], 'net1', 'net2', 'net1']))
+            self.assertEqual([ids[2]], self.client.find_resource_ids(
+                'network', ['net2']))
+
+        mock_request.assert_has_calls([
+            mock.call(
+                test_cli20.MyUrlComparator(
+                    test_cli20.end_url(
+                        path, "fields=id&fields=name&id=%s&id=net1&id=net2"
+                        % ids[0]),
+                    self.client),
+                'GET', body=None, headers=mock.ANY),
+            mock.call(
+                test_cli20.MyUrlComparator(
+                    test_cli20.end_url(
+                        path, "fields=id&fields=name&name=net1&name=net2"),
+                    self.client),
+                'GET', body=None, headers=mock.ANY)])
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_find_resource_ids_errors(self):
+        _id = uuidutils.generate_uuid()
+        by_name = {'networks': [{'id': _id, 'name': 'dup'},
+                                {'id': _id, 'name': 'dup'}]}
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._resp(by_name)):
+            self.assertRaises(exceptions.NeutronClientNoUniqueMatch,
+                              self.client.find_resource_ids,
+                              'network', ['dup'])
+            self.assertRaises(exceptions.NotFound,
+                              self.client.find_resource_ids,
+                              'network', ['missing'])
+
+    def test_find_resource_ids_return_exceptions(self):
+        _id = uuidutils.generate_uuid()
+        by_name = {'networks': [{'id': _id, 'name': 'net1'},
+                                {'id': 'dup1', 'name': 'dup'},
+                                {'id': 'dup2', 'name': 'dup'}]}
+        with mock.patch.object(self.client.httpclient, "request",
+                               return_value=self._resp(by_name)
+                               ) as mock_request:
+            found, dup, missing = self.client.find_resource_ids(
+                'network', ['net1', 'dup', 'missing'],
+                return_exceptions=True)
+        self.assertEqual(_id, found)
+        self.assertIsInstance(dup, exceptions.NeutronClientNoUniqueMatch)
+        self.assertIsInstance(missing, exceptions.NotFound)
+        self.assertIn('missing', str(missing))
+        # Looked up by ID, then by name.
+        self.assertEqual(2, mock_request.call_count)
+
+
+class FindResourcesTest(testtools.TestCase):
+
+    def setUp(self):
+        super(FindResourcesTest, self).setUp()
+        self.client = client.Client(token=test_cli20.TOKEN,
+                                    endpoint_url=test_cli20.ENDURL)
+
+    def _fake_list(self, networks):
+        def _request(url, method, body=None, headers=None):
+            query = urlparse.parse_qs(urlparse.urlparse(url).query)
+            if 'id' in query:
+                res = [n for n in networks if n['id'] in query['id']]
+            else:
+                res = [n for n in networks if n['name'] in query['name']]
+            return (test_cli20.MyResp(200),
+                    self.client.serialize({'networks': res}))
+        return _request
+
+    def test_find_resources(self):
+        nets = [{'id': uuidutils.generate_uuid(), 'name': 'net%d' % i}
+                for i in range(3)]
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=self._fake_list(nets)
+                               ) as mock_request:
+            found = self.client.find_resources(
+                'network', [nets[0]['id'], 'net1', 'net2'], fields='name')
+        self.assertEqual({nets[0]['id']: nets[0], 'net1': nets[1],
+                          'net2': nets[2]}, found)
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_find_resources_ids_not_uuids(self):
+        nets = [{'id': 'net-a', 'name': 'net1'},
+                {'id': uuidutils.generate_uuid(), 'name': 'net-a'}]
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=self._fake_list(nets)
+                               ) as mock_request:
+            found = self.client.find_resources('network', ['net-a', 'net1'])
+        # IDs take precedence over names, UUIDs or not.
+        self.assertEqual({'net-a': nets[0], 'net1': nets[0]}, found)
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_find_resources_errors(self):
+        nets = [{'id': uuidutils.generate_uuid(), 'name': 'dup'},
+                {'id': uuidutils.generate_uuid(), 'name': 'dup'}]
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=self._fake_list(nets)):
+            e = self.assertRaises(exceptions.NotFound,
+                                  self.client.find_resources,
+                                  'network', ['dup', 'miss1', 'miss2'])
+            self.assertIn("'miss1', 'miss2'", str(e))
+            e = self.assertRaises(exceptions.NeutronClientNoUniqueMatch,
+                                  self.client.find_resources,
+                                  'network', ['dup'])
+            self.assertIn("'dup'", str(e))
+
+    def test_find_resources_split_long_uri(self):
+        nets = [{'id': uuidutils.generate_uuid(), 'name': 'net%036d' % i}
+                for i in range(300)]
+        names = [n['name'] for n in nets]
+        with mock.patch.object(self.client.httpclient, "request",
+                               side_effect=self._fake_list(nets)
+                               ) as mock_request:
+            found = self.client.find_resources('network', names)
+        self.assertEqual(dict(zip(names, nets)), found)
+        self.assertLess(1, mock_request.call_count)
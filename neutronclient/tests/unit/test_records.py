@@ -0,0 +1,144 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import copy
+import pickle
+
+import mock
+import testtools
+
+from neutronclient.tests.unit import test_cli20
+from neutronclient.v2_0 import client
+from neutronclient.v2_0 import records
+
+
+class RecordTest(testtools.TestCase):
+
+    port = {'id': 'myid', 'name': 'port', 'device_id': 'vm',
+            'binding:host_id': 'compute-1'}
+
+    def test_mapping(self):
+        port = records.Port(self.port)
+        self.assertEqual(self.port, port)
+        self.assertEqual(self.port, port.to_dict())
+        self.assertEqual(4, len(port))
+        self.assertEqual('compute-1', port['binding:host_id'])
+        self.assertIsNone(port.get('network_id'))
+        self.assertNotIn('network_id', port)
+        self.assertRaises(KeyError, port.__getitem__, 'network_id')
+
+    def test_attributes(self):
+        port = records.Port(self.port)
+        self.assertEqual('vm', port.device_id)
+        self.assertEqual('compute-1', getattr(port, 'binding:host_id'))
+        self.assertRaises(AttributeError, getattr, port, 'network_id')
+        self.assertFalse(hasattr(port, '__dict__'))
+
+    def test_overflow_dict_only_created_when_needed(self):
+        port = records.Port({'id': 'myid'})
+        self.assertIsNone(port._extra)
+        port['binding:host_id'] = 'compute-1'
+        self.assertEqual({'binding:host_id': 'compute-1'}, port._extra)
+
+    def test_update(self):
+        port = records.Port(self.port)
+        port['name'] = 'renamed'
+        del port['device_id']
+        del port['binding:host_id']
+        port.update(network_id='net')
+        self.assertEqual({'id': 'myid', 'name': 'renamed',
+                          'network_id': 'net'}, port)
+        self.assertRaises(KeyError, port.__delitem__, 'device_id')
+
+    def test_copy_and_pickle(self):
+        port = records.Port(self.port)
+        self.assertEqual(port, copy.deepcopy(port))
+        unpickled = pickle.loads(pickle.dumps(port))
+        self.assertIsInstance(unpickled, records.Port)
+        self.assertEqual(port, unpickled)
+
+    def test_pickle_floating_ip(self):
+        self.assertEqual('FloatingIP', records.FloatingIP.__name__)
+        fip = records.FloatingIP({'id': 'myid', 'port_id': 'port'})
+        unpickled = pickle.loads(pickle.dumps(fip))
+        self.assertIsInstance(unpickled, records.FloatingIP)
+        self.assertEqual(fip, unpickled)
+
+    def test_convert(self):
+        body = {'ports': [dict(self.port)], 'ports_links': [],
+                'fox_sockets': [{'id': 'fox'}]}
+        self.assertIs(body, records.convert(body))
+        self.assertIsInstance(body['ports'][0], records.Port)
+        self.assertIs(dict, type(body['fox_sockets'][0]))
+        self.assertIsInstance(
+            records.convert({'network': {'id': 'myid'}})['network'],
+            records.Network)
+
+
+class ClientRecordsTest(testtools.TestCase):
+
+    def _client(self, **kwargs):
+        return client.Client(token=test_cli20.TOKEN,
+                             endpoint_url=test_cli20.ENDURL, **kwargs)
+
+    def _resp(self, body):
+        headers = {'x-openstack-request-id': test_cli20.REQUEST_ID}
+        return (test_cli20.MyResp(200, headers),
+                self._client().serialize(body))
+
+    def test_records_option(self):
+        neutron = self._client(records=True)
+        body = {'ports': [{'id': 'myid', 'device_id': 'vm'}]}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(body)):
+            res = neutron.list_ports()
+        self.assertIsInstance(res['ports'][0], records.Port)
+        self.assertEqual('vm', res['ports'][0].device_id)
+        self.assertEqual([test_cli20.REQUEST_ID], res.request_ids)
+
+    def test_records_per_call(self):
+        neutron = self._client()
+        body = {'network': {'id': 'myid'}}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(body)) as mock_req:
+            res = neutron.show_network('myid', records=True)
+            plain = neutron.show_network('myid')
+        self.assertIsInstance(res['network'], records.Network)
+        self.assertNotIn('records', mock_req.call_args_list[0][0][0])
+        self.assertNotIsInstance(plain['network'], records.Network)
+
+    def test_records_show_and_update(self):
+        neutron = self._client(records=True)
+        body = {'port': {'id': 'myid', 'name': 'p1',
+                         'binding:host_id': 'host'}}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(body)) as mock_req:
+            port = neutron.show_port('myid')['port']
+            port['name'] = 'p2'
+            neutron.update_port('myid', {'port': port})
+        sent = mock_req.call_args_list[1][1]['body']
+        self.assertEqual({'port': {'id': 'myid', 'name': 'p2',
+                                   'binding:host_id': 'host'}},
+                         neutron.deserialize(sent, 200))
+
+    def test_records_pages(self):
+        neutron = self._client(records=True)
+        body = {'subnets': [{'id': 'myid'}]}
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(body)):
+            pages = list(neutron.list_subnets(retrieve_all=False))
+            plain = neutron.list_subnets(records=False)
+        self.assertIsInstance(pages[0]['subnets'][0], records.Subnet)
+        self.assertNotIsInstance(plain['subnets'][0], records.Subnet)
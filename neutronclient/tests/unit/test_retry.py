@@ -0,0 +1,183 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import email.utils
+import time
+import warnings
+
+import mock
+import testtools
+
+from neutronclient.common import exceptions
+from neutronclient.common import retry
+from neutronclient.tests.unit import test_cli20
+from neutronclient.v2_0 import client
+
+
+class RetryPolicyTest(testtools.TestCase):
+
+    def test_exponential_delay(self):
+        policy = retry.RetryPolicy(backoff=0.5, max_backoff=3, jitter=False)
+        self.assertEqual([0.5, 1, 2, 3, 3],
+                         [policy.get_delay(i) for i in range(5)])
+
+    def test_full_jitter(self):
+        policy = retry.RetryPolicy(backoff=1, max_backoff=30)
+        for i in range(20):
+            delay = policy.get_delay(3)
+            self.assertTrue(0 <= delay <= 8)
+
+    def test_retry_after_is_a_minimum(self):
+        policy = retry.RetryPolicy(backoff=1, jitter=False)
+        self.assertEqual(5, policy.get_delay(0, retry_after=5))
+        self.assertEqual(4, policy.get_delay(2, retry_after=1))
+
+    def test_retry_after_is_capped(self):
+        policy = retry.RetryPolicy(backoff=1, max_backoff=10, jitter=False)
+        self.assertEqual(10, policy.get_delay(0, retry_after=3600))
+        policy = retry.RetryPolicy(backoff=1, max_backoff=10)
+        self.assertEqual(10, policy.get_delay(0, retry_after=3600))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(120, retry.parse_retry_after('120'))
+        self.assertIsNone(retry.parse_retry_after(None))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+        date = email.utils.formatdate(time.time() + 60, usegmt=True)
+        self.assertTrue(55 < retry.parse_retry_after(date) <= 60)
+
+    def test_deadline(self):
+        policy = retry.RetryPolicy(retries=10, deadline=5)
+        metrics = retry.RetryMetrics()
+        metrics.attempts = 1
+        self.assertTrue(policy.allows(metrics, 4))
+        self.assertFalse(policy.allows(metrics, 6))
+        metrics.attempts = 11
+        self.assertFalse(policy.allows(metrics, 0))
+
+
+@mock.patch('neutronclient.v2_0.client.time.sleep')
+class RetryRequestTest(testtools.TestCase):
+
+    def _client(self, **kwargs):
+        return client.Client(token=test_cli20.TOKEN,
+                             endpoint_url=test_cli20.ENDURL,
+                             retry_policy=retry.RetryPolicy(**kwargs))
+
+    def _resp(self, status_code, body, headers=None):
+        neutron = client.Client(token=test_cli20.TOKEN,
+                                endpoint_url=test_cli20.ENDURL)
+        return (test_cli20.MyResp(status_code, headers or {}),
+                neutron.serialize(body))
+
+    def test_retry_on_status_with_retry_after(self, mock_sleep):
+        neutron = self._client(retries=3, backoff=1, jitter=False)
+        unavailable = self._resp(503, {'message': 'busy'},
+                                 {'Retry-After': '7'})
+        ok = self._resp(200, {'network': {'id': 'myid'}})
+        with mock.patch.object(neutron.httpclient, "request",
+                               side_effect=[unavailable, unavailable, ok]):
+            res = neutron.show_network('myid')
+
+        self.assertEqual({'network': {'id': 'myid'}}, res)
+        self.assertEqual([mock.call(7), mock.call(7)],
+                         mock_sleep.call_args_list)
+        self.assertEqual(3, res.retry_metrics.attempts)
+        self.assertEqual(14, res.retry_metrics.delay)
+        self.assertEqual({'retried_calls': 1, 'retries': 2, 'delay': 14,
+                          'failed_calls': 0}, neutron.get_retry_stats())
+
+    def test_retry_exhausted(self, mock_sleep):
+        neutron = self._client(retries=2, backoff=1, jitter=False)
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(429, {})):
+            e = self.assertRaises(exceptions.NeutronClientException,
+                                  neutron.show_network, 'myid')
+
+        self.assertEqual(429, e.status_code)
+        self.assertEqual(3, e.retry_metrics.attempts)
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         mock_sleep.call_args_list)
+        self.assertEqual(1, neutron.get_retry_stats()['failed_calls'])
+
+    def test_no_metrics_without_retries(self, mock_sleep):
+        neutron = self._client(retries=2)
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(
+                                   200, {'network': {'id': 'myid'}})):
+            res = neutron.show_network('myid')
+        self.assertIsNone(res.retry_metrics)
+        self.assertRaises(AttributeError, getattr, res, '_retry_metrics')
+
+    def test_not_retryable_status(self, mock_sleep):
+        neutron = self._client(retries=2, retry_statuses=[503])
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(429, {})
+                               ) as mock_request:
+            self.assertRaises(exceptions.NeutronClientException,
+                              neutron.show_network, 'myid')
+        self.assertEqual(1, mock_request.call_count)
+        self.assertFalse(mock_sleep.called)
+
+    def test_post_is_not_retried(self, mock_sleep):
+        neutron = self._client(retries=2)
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(503, {})
+                               ) as mock_request:
+            self.assertRaises(exceptions.ServiceUnavailable,
+                              neutron.create_network, {'network': {}})
+        self.assertEqual(1, mock_request.call_count)
+
+    def test_connection_failure_deadline(self, mock_sleep):
+        neutron = self._client(retries=5, backoff=4, jitter=False,
+                               deadline=10)
+        clock = [1000.0]
+
+        def _sleep(delay):
+            clock[0] += delay
+        mock_sleep.side_effect = _sleep
+        with mock.patch.object(neutron.httpclient, "request",
+                               side_effect=exceptions.ConnectionFailed(
+                                   reason='down')) as mock_request, \
+                mock.patch('neutronclient.common.retry.time.time',
+                           side_effect=lambda: clock[0]):
+            self.assertRaises(exceptions.ConnectionFailed,
+                              neutron.show_network, 'myid')
+        # 4 + 8 would exceed the deadline
+        self.assertEqual(2, mock_request.call_count)
+        mock_sleep.assert_called_once_with(4)
+
+    def test_retries_set_after_construction(self, mock_sleep):
+        neutron = client.Client(token=test_cli20.TOKEN,
+                                endpoint_url=test_cli20.ENDURL)
+        self.assertEqual(0, neutron.retries)
+        neutron.retries = 2
+        self.assertEqual(2, neutron.retry_policy.retries)
+        with mock.patch.object(neutron.httpclient, "request",
+                               return_value=self._resp(503, {})
+                               ) as mock_request:
+            self.assertRaises(exceptions.ServiceUnavailable,
+                              neutron.show_network, 'myid')
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_retry_interval_is_deprecated(self, mock_sleep):
+        neutron = self._client(backoff=1)
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            neutron.retry_interval = 3
+            self.assertEqual(3, neutron.retry_interval)
+        self.assertEqual(3, neutron.retry_policy.backoff)
+        self.assertEqual(2, len(w))
+        self.assertTrue(all(issubclass(x.category, DeprecationWarning)
+                            for x in w))
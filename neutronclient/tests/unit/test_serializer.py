@@ -0,0 +1,97 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+import json
+
+import mock
+import testtools
+
+from neutronclient.common import exceptions
+from neutronclient.common import serializer
+from neutronclient.v2_0 import client
+
+
+class JSONCodecTest(testtools.TestCase):
+
+    body = {'network': {'id': 'myid', 'name': u'\u7f51\u7edc', 'mtu': 1500,
+                        'shared': False, 'subnets': [], 'qos': None}}
+
+    def test_codecs_round_trip(self):
+        for name in serializer.available_codecs():
+            s = serializer.Serializer(codec=name)
+            data = s.serialize(self.body)
+            self.assertEqual(self.body, json.loads(data), name)
+            self.assertEqual(self.body, s.deserialize(data)['body'], name)
+
+    def test_codec_malformed_body(self):
+        for name in serializer.available_codecs():
+            s = serializer.Serializer(codec=name)
+            self.assertRaises(exceptions.MalformedResponseBody,
+                              s.deserialize, '{"network": ')
+
+    def test_unknown_codec_falls_back_to_stdlib(self):
+        self.assertEqual('json', serializer.get_codec('no-such-codec').name)
+
+    def test_default_codec(self):
+        self.assertEqual('jsonutils', serializer.get_codec().name)
+        self.addCleanup(serializer.set_default_codec, 'jsonutils')
+        serializer.set_default_codec('json')
+        self.assertEqual('json', serializer.get_codec().name)
+
+    def test_register_codec(self):
+        self.addCleanup(serializer._CODECS.pop, 'fake', None)
+        dumps = mock.Mock(return_value='{}')
+        serializer.register_codec('fake', dumps, json.loads)
+        neutron = client.Client(token='token', endpoint_url='localurl',
+                                json_codec='fake')
+        self.assertEqual('{}', neutron.serialize({}))
+        dumps.assert_called_once_with({}, default=mock.ANY)
+
+    def _stream(self, codec, data):
+        chunks = [data[i:i + 7].encode('utf-8')
+                  for i in range(0, len(data), 7)]
+        extra = {}
+        deserializer = serializer.JSONCollectionDeserializer(codec)
+        items = list(deserializer.deserialize(chunks, 'networks', extra))
+        return items, extra
+
+    def test_codecs_stream(self):
+        body = {'networks': [self.body['network']] * 3,
+                'networks_links': []}
+        for name in serializer.available_codecs():
+            data = serializer.Serializer(codec=name).serialize(body)
+            self.assertEqual((body['networks'], {'networks_links': []}),
+                             self._stream(name, data), name)
+
+    def test_stream_uses_codec_raw_decode(self):
+        self.addCleanup(serializer._CODECS.pop, 'fake', None)
+        raw_decode = mock.Mock(side_effect=json.JSONDecoder().raw_decode)
+        serializer.register_codec('fake', json.dumps, json.loads, raw_decode)
+        data = '{"networks": [{"id": "myid"}]}'
+        self.assertEqual(([{'id': 'myid'}], {}), self._stream('fake', data))
+        self.assertTrue(raw_decode.called)
+
+    def test_stream_without_raw_decode(self):
+        self.addCleanup(serializer._CODECS.pop, 'fake', None)
+        serializer.register_codec('fake', json.dumps, json.loads)
+        data = '{"networks": [{"id": "myid"}]}'
+        self.assertEqual(([{'id': 'myid'}], {}), self._stream('fake', data))
+
+    def test_handlers_are_cached(self):
+        s = serializer.Serializer()
+        self.assertIs(s._get_serialize_handler('application/json'),
+                      s._get_serialize_handler('application/json'))
+        self.assertIs(s.get_deserialize_handler('application/json'),
+                      s.get_deserialize_handler('application/json'))
@@ -17,6 +17,7 @@ import argparse
 import logging
 import os
 import re
+import subprocess
 import sys
 
 import fixtures
@@ -45,6 +46,15 @@ DEFAULT_SERVICE_TYPE = 'network'
 DEFAULT_SERVICE_NAME = 'neutron'
 DEFAULT_RETRIES = 3
 DEFAULT_TIMEOUT = 3.0
+# Budget of the cumulative time of "import neutronclient.shell", in
+# microseconds. It is generous so that slow test nodes do not fail, the
+# deferred modules below are the actual regression check.
+IMPORT_TIME_BUDGET = int(os.environ.get('NEUTRONCLIENT_IMPORT_TIME_BUDGET',
+                                        2000000))
+DEFERRED_MODULES = ('keystoneauth1.session', 'os_client_config',
+                    'osprofiler', 'neutronclient.client',
+                    'neutronclient.common.clientmanager',
+                    'neutronclient.neutron.v2_0.subnet')
 
 
 class ShellTest(testtools.TestCase):
@@ -63,6 +73,11 @@ class ShellTest(testtools.TestCase):
     # Patch os.environ to avoid required auth info.
     def setUp(self):
         super(ShellTest, self).setUp()
+        self.completion_cache = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'completion.json')
+        self.useFixture(fixtures.MockPatchObject(
+            openstack_shell, 'get_completion_cache_path',
+            return_value=self.completion_cache))
         for var in self.FAKE_ENV:
             self.useFixture(
                 fixtures.EnvironmentVariable(
@@ -111,6 +126,26 @@ class ShellTest(testtools.TestCase):
             bash_completion,
             matchers.MatchesRegex(required))
 
+    def test_bash_completion_index_cached(self):
+        _shell = openstack_shell.NeutronShell('2.0')
+        _shell.command_manager.add_command('fake-list', network.ListNetwork)
+        index = _shell._get_completion_index()
+        self.assertIn('--fields', index['fake-list'])
+        self.assertTrue(os.path.exists(self.completion_cache))
+
+        with mock.patch.object(openstack_shell.NeutronShell,
+                               '_build_completion_index',
+                               return_value=index) as build:
+            self.assertEqual(index, _shell._get_completion_index())
+            self.assertFalse(build.called)
+
+            # Upgrading a distribution rebuilds the index.
+            with mock.patch('neutronclient.common.extension.'
+                            '_installed_distributions',
+                            return_value=['foo-1.0.dist-info']):
+                _shell._get_completion_index()
+            self.assertTrue(build.called)
+
     def test_help_on_subcommand(self):
         required = [
             '.*?^usage: .* quota-list']
@@ -364,3 +399,37 @@ class ShellTest(testtools.TestCase):
              'net-show': network.ShowNetwork,
              'net-update': network.UpdateNetwork},
             openstack_shell.COMMANDS['2.0'])
+
+
+@testtools.skipIf(sys.version_info < (3, 7), "-X importtime needs 3.7")
+class ShellImportTimeTest(testtools.TestCase):
+
+    def _importtime(self):
+        proc = subprocess.Popen(
+            [sys.executable, '-X', 'importtime', '-c',
+             'import neutronclient.shell'],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            universal_newlines=True)
+        _out, err = proc.communicate()
+        self.assertEqual(0, proc.returncode, err)
+        # Lines are "import time: <self us> | <cumulative us> | <module>".
+        modules = {}
+        for line in err.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            _self, cumulative, name = line[len('import time:'):].split('|')
+            if cumulative.strip().isdigit():
+                modules[name.strip()] = int(cumulative)
+        return modules
+
+    def test_import_time(self):
+        modules = self._importtime()
+        for name in DEFERRED_MODULES:
+            self.assertNotIn(name, modules)
+        self.assertLess(modules['neutronclient.shell'], IMPORT_TIME_BUDGET)
+
+    def test_commands_not_loaded(self):
+        shell = openstack_shell.NeutronShell('2.0')
+        commands = openstack_shell.COMMANDS['2.0']
+        self.assertEqual(len(shell.command_manager.commands), len(commands))
+        self.assertEqual({}, commands._classes)
@@ -0,0 +1,131 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""asyncio front-end for the Neutron v2.0 client (Python 3 only)."""
+
+import asyncio
+from concurrent import futures
+import functools
+
+from neutronclient import client as http_client
+from neutronclient.v2_0 import client as v2_client
+
+
+class _AsyncGeneratorWithMeta(object):
+    """Asynchronous iterator over the pages of a list call.
+
+    Each page is fetched in the executor of the owning AsyncClient, and
+    request ids are accumulated as with _GeneratorWithMeta.
+    """
+
+    def __init__(self, async_client, generator):
+        self._async_client = async_client
+        self._generator = generator
+
+    @property
+    def request_ids(self):
+        return self._generator.request_ids
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        return self._async_client._run(self._next_page)
+
+    def _next_page(self):
+        try:
+            return next(self._generator)
+        except StopIteration:
+            raise StopAsyncIteration()
+
+
+class AsyncClient(object):
+    """asyncio-native client for the OpenStack Neutron v2.0 API.
+
+    Every public method of :class:`neutronclient.v2_0.client.Client`
+    (``list_*``, ``show_*``, ``create_*``, ``update_*``, ``delete_*``, ...)
+    is exposed as a method returning an awaitable. Calls are run on a
+    bounded thread pool sized after the HTTP connection pool, so many
+    concurrent calls made from one event loop share the same pooled
+    connections. Results keep their ``request_ids`` and errors are raised
+    as the usual neutronclient exceptions.
+
+    :param client: An existing synchronous Client to wrap. It is not
+                   closed by close(). (optional)
+    :param integer max_workers: Maximum number of requests in flight.
+                                Defaults to the connection pool size.
+                                (optional)
+    :param executor: A concurrent.futures executor to run the requests
+                     on instead of the client's own thread pool. (optional)
+
+    Any other keyword argument is passed to Client.
+
+    Example::
+
+        from neutronclient.v2_0 import async_client
+        neutron = async_client.AsyncClient(session=sess)
+
+        nets, ports = await asyncio.gather(neutron.list_networks(),
+                                           neutron.list_ports())
+        ...
+    """
+
+    def __init__(self, client=None, max_workers=None, executor=None,
+                 **kwargs):
+        # Only the client and executor created here are closed by close().
+        self._owns_client = client is None
+        if client is None:
+            client = v2_client.Client(**kwargs)
+        self.client = client
+        if executor is None:
+            max_workers = max_workers or kwargs.get(
+                'pool_maxsize', http_client.DEFAULT_POOL_MAXSIZE)
+            executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+            self._owns_executor = True
+        else:
+            self._owns_executor = False
+        self._executor = executor
+
+    def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    def _call(self, func, *args, **kwargs):
+        result = func(*args, **kwargs)
+        if isinstance(result, v2_client._GeneratorWithMeta):
+            return _AsyncGeneratorWithMeta(self, result)
+        return result
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def _async_fx(*args, **kwargs):
+            return self._run(self._call, attr, *args, **kwargs)
+        return _async_fx
+
+    def close(self):
+        """Shut down the executor and release pooled connections.
+
+        A client or executor given to the constructor is left open, it is
+        up to the caller to close it.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        if self._owns_client:
+            self.client.close()
@@ -16,24 +16,34 @@
 #    under the License.
 #
 
+import collections
+from concurrent import futures
+import copy
+import functools
 import inspect
-import itertools
 import logging
 import re
+import threading
 import time
 
+import debtcollector
 import debtcollector.renames
 from keystoneauth1 import exceptions as ksa_exc
+from oslo_utils import uuidutils
 import requests
+from six.moves import queue
 import six.moves.urllib.parse as urlparse
 from six import string_types
 
 from neutronclient._i18n import _
 from neutronclient import client
+from neutronclient.common import cache
 from neutronclient.common import exceptions
 from neutronclient.common import extension as client_extension
+from neutronclient.common import retry
 from neutronclient.common import serializer
 from neutronclient.common import utils
+from neutronclient.v2_0 import records as resource_records
 
 
 _logger = logging.getLogger(__name__)
@@ -42,6 +52,14 @@ HEX_ELEM = '[0-9A-Fa-f]'
 UUID_PATTERN = '-'.join([HEX_ELEM + '{8}', HEX_ELEM + '{4}',
                          HEX_ELEM + '{4}', HEX_ELEM + '{4}',
                          HEX_ELEM + '{12}'])
+# Size of the chunks read from the response body when streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_CACHE_SIZE = 1000
+# Room left in the request URI for the path of the resources when
+# splitting filter values, e.g. /v2.0/qos/policies/<id>/bandwidth_limit_rules
+URI_PATH_RESERVE = 128
+# Serializes the definition of the extension methods on first use
+_extension_lock = threading.RLock()
 
 
 def exception_handler_v20(status_code, error_content):
@@ -95,13 +113,27 @@ def exception_handler_v20(status_code, error_content):
 
 class _RequestIdMixin(object):
     """Wrapper class to expose x-openstack-request-id to the caller."""
+    __slots__ = ()
+
     def _request_ids_setup(self):
-        self._request_ids = []
+        # The list is only created when a request id is recorded.
+        self._request_ids = None
 
     @property
     def request_ids(self):
+        if self._request_ids is None:
+            self._request_ids = []
         return self._request_ids
 
+    @property
+    def retry_metrics(self):
+        # Only calls that were retried carry their metrics.
+        return getattr(self, '_retry_metrics', None)
+
+    @retry_metrics.setter
+    def retry_metrics(self, metrics):
+        self._retry_metrics = metrics
+
     def _append_request_ids(self, resp):
         """Add request_ids as an attribute to the object
 
@@ -124,15 +156,27 @@ class _RequestIdMixin(object):
             # If resp is of type string.
             request_id = resp
         if request_id:
-            self._request_ids.append(request_id)
+            self.request_ids.append(request_id)
 
 
 class _DictWithMeta(dict, _RequestIdMixin):
+    # Results are often kept in large numbers, e.g. cached, so they do not
+    # carry an instance dict. tuple and str subclasses cannot define slots
+    # on Python 2, but they are only used for empty and plain text bodies.
+    __slots__ = ('_request_ids', '_retry_metrics')
+
     def __init__(self, values, resp):
         super(_DictWithMeta, self).__init__(values)
         self._request_ids_setup()
         self._append_request_ids(resp)
 
+    def __reduce__(self):
+        # The pickle protocols 0 and 1 cannot save the slots by
+        # themselves.
+        state = dict((name, getattr(self, name)) for name in self.__slots__
+                     if hasattr(self, name))
+        return type(self), (dict(self), None), (None, state)
+
 
 class _TupleWithMeta(tuple, _RequestIdMixin):
     def __new__(cls, values, resp):
@@ -186,6 +230,89 @@ class _GeneratorWithMeta(_RequestIdMixin):
         return obj
 
 
+class _StreamWithMeta(_RequestIdMixin):
+    """Iterator over resources decoded on the fly from list responses."""
+    def __init__(self, stream_func, collection, path, **params):
+        self._request_ids_setup()
+        self.generator = stream_func(collection, path,
+                                     self._append_request_ids, **params)
+
+    def __iter__(self):
+        return self
+
+    # Python 3 compatibility
+    def __next__(self):
+        return self.next()
+
+    def next(self):
+        return next(self.generator)
+
+
+class _BatchResult(_RequestIdMixin):
+    """Outcome of a single call executed as part of a batch."""
+    def __init__(self, result=None, exception=None):
+        self.result = result
+        self.exception = exception
+        self._request_ids_setup()
+        if exception is not None:
+            self._append_request_ids(getattr(exception, 'request_ids', None))
+        elif isinstance(result, _RequestIdMixin):
+            self._append_request_ids(result.request_ids)
+
+    def get(self):
+        """Return the result of the call or raise its exception."""
+        if self.exception is not None:
+            raise self.exception
+        return self.result
+
+
+class _Batch(object):
+    """Queue of client calls executed concurrently.
+
+    Any public client method can be queued by calling it on the batch,
+    e.g. ``batch.show_port(port_id)``. Nothing is sent until execute()
+    is called, which runs the queued calls with at most max_workers
+    requests in flight and returns one _BatchResult per call, in the
+    order the calls were queued.
+    """
+    def __init__(self, client, max_workers):
+        self.client = client
+        self.max_workers = max_workers
+        self._calls = []
+
+    def __len__(self):
+        return len(self._calls)
+
+    def add(self, func, *args, **kwargs):
+        """Queue func(*args, **kwargs) and return its position."""
+        self._calls.append((func, args, kwargs))
+        return len(self._calls) - 1
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        func = getattr(self.client, name)
+
+        def _queue(*args, **kwargs):
+            return self.add(func, *args, **kwargs)
+        return _queue
+
+    @staticmethod
+    def _run(func, args, kwargs):
+        try:
+            return _BatchResult(result=func(*args, **kwargs))
+        except Exception as e:
+            return _BatchResult(exception=e)
+
+    def execute(self):
+        calls, self._calls = self._calls, []
+        if not calls:
+            return []
+        max_workers = min(self.max_workers, len(calls))
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda call: self._run(*call), calls))
+
+
 class ClientBase(object):
     """Client for the OpenStack Neutron v2.0 API.
 
@@ -220,11 +347,78 @@ class ClientBase(object):
     :param integer retries: How many times idempotent (GET, PUT, DELETE)
                             requests to Neutron server should be retried if
                             they fail (default: 0).
+    :param retry_policy: A neutronclient.common.retry.RetryPolicy setting
+                         the backoff, deadline and HTTP status codes of
+                         the retries. Overrides retries. (optional)
     :param bool raise_errors: If True then exceptions caused by connection
                               failure are propagated to the caller.
                               (default: True)
+    :param string json_codec: Name of the JSON implementation used to
+                              encode and decode bodies, e.g. 'orjson'.
+                              Falls back to the standard library if it is
+                              not installed, and for the lists streamed
+                              with stream=True if it cannot decode
+                              partial bodies, as orjson. See
+                              neutronclient.common.serializer.
+                              (default: jsonutils) (optional)
+    :param integer prefetch: How many pages of a paginated list are fetched
+                             in the background ahead of the page being
+                             consumed (default: 0, no prefetching).
+                             Can be overridden per list call. (optional)
     :param session: Keystone client auth session to use. (optional)
     :param auth: Keystone auth plugin to use. (optional)
+    :param integer pool_connections: Number of per-host connection pools
+                                     kept by the client when no session is
+                                     given (default: 10). (optional)
+    :param integer pool_maxsize: Maximum number of connections kept alive
+                                 per host when no session is given
+                                 (default: 10). (optional)
+    :param float pool_idle_timeout: Seconds after which idle pooled
+                                    connections are dropped instead of
+                                    reused (default: never). (optional)
+    :param auth_cache: A neutronclient.common.auth_cache.AuthCache sharing
+                       the tokens and endpoints obtained from Keystone
+                       with other clients, e.g. a FileAuthCache shared by
+                       worker processes. Ignored with a session.
+                       (optional)
+    :param circuit_breaker: A neutronclient.common.circuit_breaker.
+                            CircuitBreaker making requests fail fast with
+                            CircuitBreakerOpen while the server is failing
+                            or too slow. (optional)
+    :param float cache_ttl: Seconds during which the responses to GET
+                            requests are served from a client-side cache
+                            (default: None, no caching). Entries are
+                            dropped when the client writes to the same
+                            resource path, but changes made by other
+                            clients are only seen once they expire.
+                            (optional)
+    :param integer cache_size: Maximum number of responses kept in the
+                               cache, the least recently used ones being
+                               evicted first (default: 1000). (optional)
+    :param bool cache_revalidate: If True, an expired resource carrying a
+                                  revision_number is revalidated by only
+                                  fetching its revision_number and is
+                                  reused if it did not change.
+                                  (default: True) (optional)
+    :param float resolve_cache_ttl: Seconds during which the IDs found by
+                                    find_resource() and find_resource_ids()
+                                    for a name or ID are remembered
+                                    (default: None, not remembered).
+                                    (optional)
+    :param bool capture_request_ids: If False, the request_ids of the
+                                     results are left empty, saving their
+                                     recording on hot paths. Errors still
+                                     carry them. (default: True) (optional)
+    :param bool records: If True, networks, ports, subnets, security group
+                         rules, floating IPs and routers are returned as
+                         compact neutronclient.v2_0.records objects
+                         instead of dicts. Can be overridden per call
+                         with the records argument of list_* and show_*
+                         methods. Records take about half the memory
+                         of dicts but are several times slower to
+                         build, about 0.75s against 0.085s for 100k
+                         ports in tools/records_benchmark.py.
+                         (default: False) (optional)
 
     Example::
 
@@ -247,12 +441,36 @@ class ClientBase(object):
     def __init__(self, **kwargs):
         """Initialize a new client for the Neutron v2.0 API."""
         super(ClientBase, self).__init__()
-        self.retries = kwargs.pop('retries', 0)
+        self.retry_policy = kwargs.pop('retry_policy', None)
+        if self.retry_policy is None:
+            self.retry_policy = retry.RetryPolicy(
+                retries=kwargs.pop('retries', 0))
+        else:
+            kwargs.pop('retries', None)
+        self._retry_stats = {'retried_calls': 0, 'retries': 0,
+                             'delay': 0.0, 'failed_calls': 0}
+        self._retry_stats_lock = threading.Lock()
         self.raise_errors = kwargs.pop('raise_errors', True)
+        self.capture_request_ids = kwargs.pop('capture_request_ids', True)
+        self.records = kwargs.pop('records', False)
+        self.prefetch = kwargs.pop('prefetch', 0)
+        cache_ttl = kwargs.pop('cache_ttl', None)
+        cache_size = kwargs.pop('cache_size', DEFAULT_CACHE_SIZE)
+        self.cache_revalidate = kwargs.pop('cache_revalidate', True)
+        self._cache = None
+        self._cache_revalidations = 0
+        if cache_ttl:
+            self._cache = cache.TTLCache(cache_size, cache_ttl)
+        resolve_cache_ttl = kwargs.pop('resolve_cache_ttl', None)
+        self._resolve_cache = None
+        if resolve_cache_ttl:
+            self._resolve_cache = cache.TTLCache(DEFAULT_CACHE_SIZE,
+                                                 resolve_cache_ttl)
+        self._serializer = serializer.Serializer(
+            codec=kwargs.pop('json_codec', None))
         self.httpclient = client.construct_http_client(**kwargs)
         self.version = '2.0'
         self.action_prefix = "/v%s" % (self.version)
-        self.retry_interval = 1
 
     def _handle_fault_response(self, status_code, response_body, resp):
         # Create exception with HTTP status code and message
@@ -266,9 +484,20 @@ class ClientBase(object):
             des_error_body = {'message': response_body}
         error_body = self._convert_into_with_meta(des_error_body, resp)
         # Raise the appropriate exception
-        exception_handler_v20(status_code, error_body)
-
-    def do_request(self, method, action, body=None, headers=None, params=None):
+        try:
+            exception_handler_v20(status_code, error_body)
+        except exceptions.NeutronClientException as e:
+            e.retry_after = retry.parse_retry_after(
+                resp.headers.get('Retry-After'))
+            raise
+
+    def do_request(self, method, action, body=None, headers=None, params=None,
+                   stream=False):
+        """Send a request to the Neutron server.
+
+        If stream is True the body of a successful response is not read
+        and the response object itself is returned.
+        """
         # Add format and project_id
         action = self.action_prefix + action
         if isinstance(params, dict) and params:
@@ -278,17 +507,27 @@ class ClientBase(object):
         if body:
             body = self.serialize(body)
 
-        resp, replybody = self.httpclient.do_request(action, method, body=body,
-                                                     headers=headers)
+        if stream:
+            resp, replybody = self.httpclient.do_request(
+                action, method, body=body, headers=headers, stream=True)
+        else:
+            resp, replybody = self.httpclient.do_request(
+                action, method, body=body, headers=headers)
 
         status_code = resp.status_code
         if status_code in (requests.codes.ok,
                            requests.codes.created,
                            requests.codes.accepted,
                            requests.codes.no_content):
+            if stream:
+                return resp
             data = self.deserialize(replybody, status_code)
+            if not self.capture_request_ids:
+                resp = None
             return self._convert_into_with_meta(data, resp)
         else:
+            if stream:
+                replybody = resp.text
             if not replybody:
                 replybody = resp.reason
             self._handle_fault_response(status_code, replybody, resp)
@@ -296,6 +535,33 @@ class ClientBase(object):
     def get_auth_info(self):
         return self.httpclient.get_auth_info()
 
+    def batch(self, max_workers=None):
+        """Return a batch to run many calls concurrently.
+
+        Example::
+
+            batch = neutron.batch(max_workers=10)
+            for port_id in port_ids:
+                batch.show_port(port_id)
+            for res in batch.execute():
+                print(res.request_ids, res.exception or res.result)
+
+        :param integer max_workers: Maximum number of requests in flight.
+                                    Defaults to the connection pool size.
+        """
+        if not max_workers:
+            max_workers = getattr(self.httpclient, 'pool_maxsize',
+                                  client.DEFAULT_POOL_MAXSIZE)
+        return _Batch(self, max_workers)
+
+    def close(self):
+        """Release the connections pooled by the underlying HTTP client."""
+        # NOTE: SessionClient relies on a keystoneauth session which is
+        # owned by the caller, so there is nothing to close in that case.
+        close = getattr(self.httpclient, 'close', None)
+        if close:
+            close()
+
     def serialize(self, data):
         """Serializes a dictionary into JSON.
 
@@ -305,7 +571,7 @@ class ClientBase(object):
         if data is None:
             return None
         elif isinstance(data, dict):
-            return serializer.Serializer().serialize(data)
+            return self._serializer.serialize(data)
         else:
             raise Exception(_("Unable to serialize object of type = '%s'") %
                             type(data))
@@ -314,66 +580,353 @@ class ClientBase(object):
         """Deserializes a JSON string into a dictionary."""
         if not data:
             return data
-        return serializer.Serializer().deserialize(
-            data)['body']
+        return self._serializer.deserialize(data)['body']
 
     def retry_request(self, method, action, body=None,
-                      headers=None, params=None):
-        """Call do_request with the default retry configuration.
+                      headers=None, params=None, stream=False):
+        """Call do_request, retrying as set by the retry policy.
 
-        Only idempotent requests should retry failed connection attempts.
+        Only idempotent requests should retry failed connection attempts
+        and responses with a retryable status code. What it took is
+        recorded in the retry_metrics attribute of the exception raised,
+        or of the result if the call was retried.
         :raises: ConnectionFailed if the maximum # of retries is exceeded
         """
-        max_attempts = self.retries + 1
-        for i in range(max_attempts):
+        kwargs = {'stream': True} if stream else {}
+        policy = self.retry_policy
+        metrics = retry.RetryMetrics()
+        while True:
+            metrics.attempts += 1
+            retry_after = None
             try:
-                return self.do_request(method, action, body=body,
-                                       headers=headers, params=params)
-            except (exceptions.ConnectionFailed, ksa_exc.ConnectionError):
+                res = self.do_request(method, action, body=body,
+                                      headers=headers, params=params,
+                                      **kwargs)
+            except (exceptions.ConnectionFailed, ksa_exc.ConnectionError) as e:
                 # Exception has already been logged by do_request()
-                if i < self.retries:
-                    _logger.debug('Retrying connection to Neutron service')
-                    time.sleep(self.retry_interval)
-                elif self.raise_errors:
+                error = e
+            except exceptions.NeutronClientException as e:
+                if e.status_code not in policy.retry_statuses:
+                    self._record_retry_metrics(metrics, e)
                     raise
-
-        if self.retries:
+                error = e
+                retry_after = getattr(e, 'retry_after', None)
+            else:
+                self._record_retry_metrics(metrics, res)
+                return res
+            metrics.errors.append(error)
+            delay = policy.get_delay(metrics.retries, retry_after)
+            if not policy.allows(metrics, delay):
+                break
+            _logger.debug('Retrying request to Neutron service in %.2f '
+                          'seconds', delay)
+            time.sleep(delay)
+            metrics.delay += delay
+
+        with self._retry_stats_lock:
+            self._retry_stats['failed_calls'] += 1
+        if (self.raise_errors or
+                not isinstance(error, (exceptions.ConnectionFailed,
+                                       ksa_exc.ConnectionError))):
+            self._record_retry_metrics(metrics, error)
+            raise error
+
+        if metrics.retries:
             msg = (_("Failed to connect to Neutron server after %d attempts")
-                   % max_attempts)
+                   % metrics.attempts)
         else:
             msg = _("Failed to connect Neutron server")
 
-        raise exceptions.ConnectionFailed(reason=msg)
+        error = exceptions.ConnectionFailed(reason=msg)
+        self._record_retry_metrics(metrics, error)
+        raise error
+
+    def _record_retry_metrics(self, metrics, obj):
+        if isinstance(obj, Exception):
+            obj.retry_metrics = metrics
+        if not metrics.retries:
+            # The results of calls made at once are not given metrics,
+            # which would about double their footprint.
+            return
+        with self._retry_stats_lock:
+            self._retry_stats['retried_calls'] += 1
+            self._retry_stats['retries'] += metrics.retries
+            self._retry_stats['delay'] += metrics.delay
+        if isinstance(obj, _RequestIdMixin):
+            obj.retry_metrics = metrics
+
+    @property
+    def retries(self):
+        """How many times idempotent requests are retried."""
+        return self.retry_policy.retries
+
+    @retries.setter
+    def retries(self, value):
+        self.retry_policy.retries = value
+
+    @property
+    def retry_interval(self):
+        debtcollector.deprecate(
+            'retry_interval is deprecated',
+            message='Use retry_policy.backoff instead.')
+        return self.retry_policy.backoff
+
+    @retry_interval.setter
+    def retry_interval(self, value):
+        debtcollector.deprecate(
+            'retry_interval is deprecated',
+            message='Use retry_policy.backoff instead.')
+        self.retry_policy.backoff = value
+
+    def get_retry_stats(self):
+        """Return the retries made by this client so far.
+
+        'retried_calls' is the number of calls which needed more than one
+        attempt, 'failed_calls' the number of calls which ran out of
+        retries and 'delay' the total time spent waiting between retries.
+        """
+        with self._retry_stats_lock:
+            return dict(self._retry_stats)
 
     def delete(self, action, body=None, headers=None, params=None):
-        return self.retry_request("DELETE", action, body=body,
-                                  headers=headers, params=params)
+        try:
+            return self.retry_request("DELETE", action, body=body,
+                                      headers=headers, params=params)
+        finally:
+            self._invalidate_cache(action)
 
     def get(self, action, body=None, headers=None, params=None):
-        return self.retry_request("GET", action, body=body,
-                                  headers=headers, params=params)
+        use_records = self.records
+        if params and 'records' in params:
+            params = dict(params)
+            use_records = params.pop('records')
+        if self._cache is None or body or headers:
+            res = self.retry_request("GET", action, body=body,
+                                     headers=headers, params=params)
+        else:
+            res = self._cached_get(action, params)
+        if use_records and isinstance(res, dict):
+            resource_records.convert(res)
+        return res
 
     def post(self, action, body=None, headers=None, params=None):
         # Do not retry POST requests to avoid the orphan objects problem.
-        return self.do_request("POST", action, body=body,
-                               headers=headers, params=params)
+        try:
+            return self.do_request("POST", action, body=body,
+                                   headers=headers, params=params)
+        finally:
+            self._invalidate_cache(action)
 
     def put(self, action, body=None, headers=None, params=None):
-        return self.retry_request("PUT", action, body=body,
-                                  headers=headers, params=params)
+        try:
+            return self.retry_request("PUT", action, body=body,
+                                      headers=headers, params=params)
+        finally:
+            self._invalidate_cache(action)
+
+    def _cached_get(self, action, params):
+        key = (action, urlparse.urlencode(
+            sorted(utils.safe_encode_dict(params or {}).items()), doseq=1))
+        entry = self._cache.get(key)
+        if entry is None and self.cache_revalidate:
+            entry = self._revalidate(key)
+        if entry is None:
+            res = self.retry_request("GET", action, params=params)
+            if not isinstance(res, dict):
+                return res
+            entry = (copy.deepcopy(dict(res)), res.request_ids)
+            self._cache.set(key, entry)
+        # Callers are free to modify what they get back.
+        return _DictWithMeta(copy.deepcopy(entry[0]), entry[1])
+
+    def _revalidate(self, key):
+        """Reuse an expired resource if its revision_number is unchanged.
+
+        Only the revision_number of the resource is fetched, which is much
+        cheaper than fetching it whole.
+        """
+        entry = self._cache.get_expired(key)
+        if entry is None or len(entry[0]) != 1:
+            return None
+        resource, data = list(entry[0].items())[0]
+        if not isinstance(data, dict) or 'revision_number' not in data:
+            return None
+        try:
+            res = self.retry_request("GET", key[0],
+                                     params={'fields': 'revision_number'})
+        except exceptions.NeutronClientException:
+            self._cache.pop(key)
+            raise
+        try:
+            revision_number = res[resource]['revision_number']
+        except (KeyError, TypeError):
+            return None
+        if revision_number != data['revision_number']:
+            return None
+        self._cache.touch(key)
+        self._cache_revalidations += 1
+        return entry
 
-    def list(self, collection, path, retrieve_all=True, **params):
+    def _invalidate_cache(self, action):
+        """Drop the cached responses for the resource path written to.
+
+        This covers the resource itself, its sub-resources and the
+        collections it belongs to, e.g. a write to /ports/<id> drops
+        /ports, /ports/<id> and /ports/<id>/tags.
+        """
+        if self._resolve_cache is not None:
+            # The resources written to may have been renamed or deleted.
+            segments = set(action.split('/'))
+            self._resolve_cache.invalidate(
+                lambda key, resource_id: resource_id in segments)
+        if self._cache is None:
+            return
+        action = action.rstrip('/')
+
+        def _related(key, value):
+            path = key[0].rstrip('/')
+            return (path == action or path.startswith(action + '/') or
+                    action.startswith(path + '/'))
+
+        self._cache.invalidate(_related)
+
+    def get_cache_stats(self):
+        """Return the statistics of the response cache, None if disabled.
+
+        'revalidated' counts the expired entries reused after checking
+        their revision_number, these are not counted as hits.
+        """
+        if self._cache is None:
+            return None
+        stats = self._cache.get_stats()
+        stats['revalidated'] = self._cache_revalidations
+        return stats
+
+    def clear_cache(self):
+        """Drop all the responses held by the response cache."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def list(self, collection, path, retrieve_all=True, prefetch=None,
+             stream=False, records=None, **params):
+        """Fetch a collection, following the pagination links.
+
+        If stream is True, the resources are decoded as the response
+        bodies arrive and yielded one at a time, whatever retrieve_all.
+        records overrides the records option of the client for this call.
+        """
+        if records is None:
+            records = self.records
+        if stream:
+            stream_func = self._stream_pagination
+            if records:
+                stream_func = functools.partial(self._stream_records,
+                                                stream_func)
+            return _StreamWithMeta(stream_func, collection, path, **params)
+        if prefetch is None:
+            prefetch = self.prefetch
+        if prefetch:
+            paginate_func = functools.partial(self._prefetch_pagination,
+                                              prefetch=prefetch)
+        else:
+            paginate_func = self._pagination
+        if records:
+            # Pages are converted as they come so that the dicts of a
+            # single page at most are alive at any time.
+            paginate_func = functools.partial(self._paginate_records,
+                                              paginate_func)
         if retrieve_all:
             res = []
             request_ids = []
-            for r in self._pagination(collection, path, **params):
+            for r in paginate_func(collection, path, **params):
                 res.extend(r[collection])
                 request_ids.extend(r.request_ids)
             return _DictWithMeta({collection: res}, request_ids)
         else:
-            return _GeneratorWithMeta(self._pagination, collection,
+            return _GeneratorWithMeta(paginate_func, collection,
                                       path, **params)
 
+    def _paginate_records(self, paginate_func, collection, path, **params):
+        for page in paginate_func(collection, path, **params):
+            yield resource_records.convert(page)
+
+    def _stream_records(self, stream_func, collection, path,
+                        append_request_ids, **params):
+        cls = resource_records.COLLECTION_TYPES.get(collection)
+        for item in stream_func(collection, path, append_request_ids,
+                                **params):
+            yield cls(item) if cls and isinstance(item, dict) else item
+
+    def _stream_pagination(self, collection, path, append_request_ids,
+                           **params):
+        if params.get('page_reverse', False):
+            linkrel = 'previous'
+        else:
+            linkrel = 'next'
+        deserializer = serializer.JSONCollectionDeserializer(
+            self._serializer.codec)
+        while params is not None:
+            resp = self.retry_request("GET", path, params=params, stream=True)
+            if self.capture_request_ids:
+                append_request_ids(resp)
+            extra = {}
+            try:
+                for item in deserializer.deserialize(
+                        resp.iter_content(STREAM_CHUNK_SIZE),
+                        collection, extra):
+                    yield item
+            finally:
+                resp.close()
+            params = None
+            for link in extra.get('%s_links' % collection, []):
+                if link['rel'] == linkrel:
+                    query_str = urlparse.urlparse(link['href']).query
+                    params = urlparse.parse_qs(query_str)
+                    break
+
+    def _prefetch_pagination(self, collection, path, prefetch, **params):
+        """Paginate while fetching up to prefetch pages in the background.
+
+        The next page is requested as soon as the previous one has been
+        received instead of waiting for the caller to consume it.
+        """
+        pages = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def _put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def _fetch():
+            try:
+                for page in self._pagination(collection, path, **params):
+                    if not _put((page, None)):
+                        return
+            except Exception as e:
+                _put((None, e))
+            else:
+                _put((None, None))
+
+        fetcher = threading.Thread(target=_fetch)
+        fetcher.daemon = True
+        fetcher.start()
+        try:
+            while True:
+                page, error = pages.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    break
+                yield page
+        finally:
+            # Let the fetcher go if the caller stops iterating early.
+            stop.set()
+
     def _pagination(self, collection, path, **params):
         if params.get('page_reverse', False):
             linkrel = 'previous'
@@ -381,7 +934,8 @@ class ClientBase(object):
             linkrel = 'next'
         next = True
         while next:
-            res = self.get(path, params=params)
+            # list() turns the pages into records itself, if asked to.
+            res = self.get(path, params=dict(params, records=False))
             yield res
             next = False
             try:
@@ -467,14 +1021,59 @@ class ClientBase(object):
         else:
             return info[0]
 
+    def _list_resources(self, resource, cmd_resource=None, parent_id=None,
+                        **params):
+        if not cmd_resource:
+            cmd_resource = resource
+        obj_lister = getattr(self, "list_%s" %
+                             self.get_resource_plural(cmd_resource))
+        if parent_id:
+            data = obj_lister(parent_id, **params)
+        else:
+            data = obj_lister(**params)
+        return data[self.get_resource_plural(resource)]
+
+    @staticmethod
+    def _resolve_cache_key(resource, name_or_id, project_id, cmd_resource,
+                           parent_id):
+        return (resource, cmd_resource, name_or_id, project_id, parent_id)
+
+    @staticmethod
+    def _only_id(fields):
+        return fields == 'id' or fields == ['id']
+
     def find_resource(self, resource, name_or_id, project_id=None,
-                      cmd_resource=None, parent_id=None, fields=None):
+                      cmd_resource=None, parent_id=None, fields=None,
+                      trust_uuid=False):
+        """Find a resource by ID, or by name if no resource has that ID.
+
+        If trust_uuid is True and name_or_id is a valid UUID, it is assumed
+        to be the ID of an existing resource and {'id': name_or_id} is
+        returned without querying the server.
+        """
+        if trust_uuid and uuidutils.is_uuid_like(name_or_id):
+            return {'id': name_or_id}
+        key = self._resolve_cache_key(resource, name_or_id, project_id,
+                                      cmd_resource, parent_id)
+        resource_id = None
+        if self._resolve_cache is not None:
+            resource_id = self._resolve_cache.get(key)
+        if resource_id is not None:
+            if self._only_id(fields):
+                return {'id': resource_id}
+            try:
+                return self.find_resource_by_id(resource, resource_id,
+                                                cmd_resource, parent_id,
+                                                fields)
+            except exceptions.NotFound:
+                # Deleted since, look it up again.
+                self._resolve_cache.pop(key)
         try:
-            return self.find_resource_by_id(resource, name_or_id,
+            info = self.find_resource_by_id(resource, name_or_id,
                                             cmd_resource, parent_id, fields)
         except exceptions.NotFound:
             try:
-                return self._find_resource_by_name(
+                info = self._find_resource_by_name(
                     resource, name_or_id, project_id,
                     cmd_resource, parent_id, fields)
             except exceptions.NotFound:
@@ -484,6 +1083,237 @@ class ClientBase(object):
                                       'name_or_id': name_or_id})
                 raise exceptions.NotFound(
                     message=not_found_message)
+        if self._resolve_cache is not None and 'id' in info:
+            self._resolve_cache.set(key, info['id'])
+        return info
+
+    def _split_filter_values(self, key, values, params):
+        """Split values in chunks whose query fits in a request URI."""
+        endpoint_url = self.httpclient.endpoint_url
+        budget = (client.MAX_URI_LEN - URI_PATH_RESERVE -
+                  len(self.action_prefix) -
+                  (len(endpoint_url) if endpoint_url else URI_PATH_RESERVE))
+        if params:
+            budget -= len(urlparse.urlencode(
+                utils.safe_encode_dict(params), doseq=1)) + 1
+        chunks = []
+        chunk = []
+        length = 0
+        for value in values:
+            # '&' or '?' then key=value
+            value_len = len(urlparse.urlencode(
+                utils.safe_encode_dict({key: value}))) + 1
+            if chunk and length + value_len > budget:
+                chunks.append(chunk)
+                chunk = []
+                length = 0
+            chunk.append(value)
+            length += value_len
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _list_chunk(self, list_func, key, values, params):
+        chunk_params = dict(params)
+        chunk_params[key] = values
+        try:
+            return [list_func(**chunk_params)]
+        except exceptions.RequestURITooLong:
+            # The URI of the resources is longer than expected.
+            if len(values) == 1:
+                raise
+            half = len(values) // 2
+            return (self._list_chunk(list_func, key, values[:half], params) +
+                    self._list_chunk(list_func, key, values[half:], params))
+
+    def list_chunked(self, list_func, key, values, max_workers=None,
+                     **params):
+        """Call a list method filtering on many values of an attribute.
+
+        The values are split up front in chunks whose query fits within
+        the maximum length of a request URI and the chunks are listed
+        concurrently, as in a batch. Nothing is listed if there is no
+        value.
+
+        Example::
+
+            subnets = neutron.list_chunked(neutron.list_subnets, 'id',
+                                           subnet_ids, fields=['id', 'cidr'])
+
+        :param list_func: a list method of this client, e.g. list_ports.
+                          Use functools.partial to pass the ID of a parent
+                          resource.
+        :param string key: the attribute to filter on, e.g. 'id'.
+        :param list values: the values of the filter.
+        :param integer max_workers: Maximum number of requests in flight.
+                                    Defaults to the connection pool size.
+        :returns: a dict mapping the collection to the resources of all
+                  the chunks.
+        """
+        chunks = self._split_filter_values(key, values, params)
+        if len(chunks) == 1:
+            results = self._list_chunk(list_func, key, chunks[0], params)
+        else:
+            batch = self.batch(max_workers)
+            for chunk in chunks:
+                batch.add(self._list_chunk, list_func, key, chunk, params)
+            results = []
+            for res in batch.execute():
+                results.extend(res.get())
+        merged = {}
+        request_ids = []
+        for res in results:
+            for collection, items in res.items():
+                if not collection.endswith('_links'):
+                    merged.setdefault(collection, []).extend(items)
+            request_ids.extend(res.request_ids)
+        return _DictWithMeta(merged, request_ids)
+
+    def _list_by_filter(self, resource, cmd_resource, parent_id, key, values,
+                        **params):
+        """List the resources whose key attribute is one of values."""
+        if not values:
+            return []
+        if not cmd_resource:
+            cmd_resource = resource
+        list_func = getattr(self, "list_%s" %
+                            self.get_resource_plural(cmd_resource))
+        if parent_id:
+            list_func = functools.partial(list_func, parent_id)
+        data = self.list_chunked(list_func, key, values, **params)
+        return data.get(self.get_resource_plural(resource), [])
+
+    def find_resources(self, resource, names_or_ids, project_id=None,
+                       cmd_resource=None, parent_id=None, fields=None):
+        """Find many resources given by name or ID.
+
+        Instead of up to two list calls per resource as with
+        find_resource(), all the values are looked up as IDs with one list
+        call and those which are not IDs as names with a second one, each
+        of them being split if the request URI would be too long. IDs take
+        precedence over names as with find_resource().
+
+        Use it when the attributes of the resources are needed. Callers
+        which only need their IDs, e.g. to fill a request body, should
+        use find_resource_ids() instead: it only fetches the IDs and
+        names, uses the resolve cache and trust_uuid, and can report the
+        failures entry by entry.
+
+        :returns: a dict mapping each name or ID to its resource.
+        :raises: NotFound listing all the names or IDs which match no
+                 resource, or NeutronClientNoUniqueMatch listing all the
+                 names matching several resources.
+        """
+        found, missing, ambiguous = self._match_resources(
+            resource, names_or_ids, project_id, cmd_resource, parent_id,
+            fields)
+        if missing:
+            not_found_message = (_("Unable to find %(resource)s with name or "
+                                   "id '%(names_or_ids)s'") %
+                                 {'resource': resource,
+                                  'names_or_ids': "', '".join(missing)})
+            raise exceptions.NotFound(message=not_found_message)
+        if ambiguous:
+            raise exceptions.NeutronClientNoUniqueMatch(
+                message=_("Multiple %(resource)s matches found for names "
+                          "'%(name)s', use IDs to be more specific."),
+                resource=resource, name="', '".join(ambiguous))
+        return found
+
+    def _match_resources(self, resource, names_or_ids, project_id,
+                         cmd_resource, parent_id, fields):
+        # Return the resources found by name or ID, the names or IDs
+        # matching no resource and the names matching several resources.
+        pending = []
+        for name_or_id in names_or_ids:
+            if name_or_id not in pending:
+                pending.append(name_or_id)
+        params = {}
+        if fields:
+            if not isinstance(fields, list):
+                fields = [fields]
+            params['fields'] = fields + [f for f in ('id', 'name')
+                                         if f not in fields]
+
+        found = {}
+        # Every value is tried as an ID, some resources having IDs which
+        # are not UUIDs.
+        for info in self._list_by_filter(resource, cmd_resource, parent_id,
+                                         'id', pending, **params):
+            found[info['id']] = info
+        names = [n for n in pending if n not in found]
+        if project_id:
+            params['tenant_id'] = project_id
+        matches = collections.defaultdict(list)
+        for info in self._list_by_filter(resource, cmd_resource, parent_id,
+                                         'name', names, **params):
+            matches[info['name']].append(info)
+
+        missing = [n for n in names if not matches[n]]
+        ambiguous = [n for n in names if len(matches[n]) > 1]
+        for name in names:
+            if len(matches[name]) == 1:
+                found[name] = matches[name][0]
+        return found, missing, ambiguous
+
+    def find_resource_ids(self, resource, names_or_ids, project_id=None,
+                          cmd_resource=None, parent_id=None,
+                          trust_uuid=False, return_exceptions=False):
+        """Return the IDs of many resources given by name or ID.
+
+        See find_resources(), the IDs are remembered as with
+        find_resource(). This is what the commands resolving several
+        names given on the command line should use, rather than one
+        find_resource() call per name.
+
+        If return_exceptions is True, nothing is raised for the names or
+        IDs matching no resource or several resources, their entries in
+        the returned list being the NotFound or NeutronClientNoUniqueMatch
+        exception instead of an ID.
+        """
+        resolved = {}
+        pending = []
+        for name_or_id in names_or_ids:
+            if name_or_id in resolved or name_or_id in pending:
+                continue
+            if trust_uuid and uuidutils.is_uuid_like(name_or_id):
+                resolved[name_or_id] = name_or_id
+                continue
+            if self._resolve_cache is not None:
+                resource_id = self._resolve_cache.get(self._resolve_cache_key(
+                    resource, name_or_id, project_id, cmd_resource,
+                    parent_id))
+                if resource_id is not None:
+                    resolved[name_or_id] = resource_id
+                    continue
+            pending.append(name_or_id)
+
+        if pending and return_exceptions:
+            found, missing, ambiguous = self._match_resources(
+                resource, pending, project_id, cmd_resource, parent_id,
+                ['id', 'name'])
+            for name_or_id in missing:
+                resolved[name_or_id] = exceptions.NotFound(
+                    message=_("Unable to find %(resource)s with name or id "
+                              "'%(name_or_id)s'") %
+                    {'resource': resource, 'name_or_id': name_or_id})
+            for name in ambiguous:
+                resolved[name] = exceptions.NeutronClientNoUniqueMatch(
+                    resource=resource, name=name)
+            pending = [n for n in pending if n in found]
+        elif pending:
+            found = self.find_resources(resource, pending, project_id,
+                                        cmd_resource, parent_id,
+                                        fields=['id', 'name'])
+        for name_or_id in pending:
+            resolved[name_or_id] = found[name_or_id]['id']
+            if self._resolve_cache is not None:
+                self._resolve_cache.set(
+                    self._resolve_cache_key(resource, name_or_id,
+                                            project_id, cmd_resource,
+                                            parent_id),
+                    resolved[name_or_id])
+        return [resolved[n] for n in names_or_ids]
 
 
 class Client(ClientBase):
@@ -2421,35 +3251,62 @@ class Client(ClientBase):
         fn = _fx if not parent_resource else _parent_fx
         setattr(self, "update_%s" % resource_singular, fn)
 
+    def _extend_client_with_class(self, cls):
+        parent_resource = getattr(cls, 'parent_resource', None)
+        if issubclass(cls, client_extension.ClientExtensionList):
+            self._extension_methods["list_%s" % cls.resource_plural] = (
+                self.extend_list, cls.resource_plural, cls.object_path,
+                parent_resource)
+        elif issubclass(cls, client_extension.ClientExtensionCreate):
+            self._extension_methods["create_%s" % cls.resource] = (
+                self.extend_create, cls.resource, cls.object_path,
+                parent_resource)
+        elif issubclass(cls, client_extension.ClientExtensionUpdate):
+            self._extension_methods["update_%s" % cls.resource] = (
+                self.extend_update, cls.resource, cls.resource_path,
+                parent_resource)
+        elif issubclass(cls, client_extension.ClientExtensionDelete):
+            self._extension_methods["delete_%s" % cls.resource] = (
+                self.extend_delete, cls.resource, cls.resource_path,
+                parent_resource)
+        elif issubclass(cls, client_extension.ClientExtensionShow):
+            self._extension_methods["show_%s" % cls.resource] = (
+                self.extend_show, cls.resource, cls.resource_path,
+                parent_resource)
+        elif issubclass(cls, client_extension.NeutronClientExtension):
+            setattr(self, "%s_path" % cls.resource_plural,
+                    cls.object_path)
+            setattr(self, "%s_path" % cls.resource, cls.resource_path)
+            self.EXTED_PLURALS.update({cls.resource_plural: cls.resource})
+
     def _extend_client_with_module(self, module, version):
+        self.__dict__.setdefault('_extension_methods', {})
         classes = inspect.getmembers(module, inspect.isclass)
         for cls_name, cls in classes:
             if hasattr(cls, 'versions'):
                 if version not in cls.versions:
                     continue
-            parent_resource = getattr(cls, 'parent_resource', None)
-            if issubclass(cls, client_extension.ClientExtensionList):
-                self.extend_list(cls.resource_plural, cls.object_path,
-                                 parent_resource)
-            elif issubclass(cls, client_extension.ClientExtensionCreate):
-                self.extend_create(cls.resource, cls.object_path,
-                                   parent_resource)
-            elif issubclass(cls, client_extension.ClientExtensionUpdate):
-                self.extend_update(cls.resource, cls.resource_path,
-                                   parent_resource)
-            elif issubclass(cls, client_extension.ClientExtensionDelete):
-                self.extend_delete(cls.resource, cls.resource_path,
-                                   parent_resource)
-            elif issubclass(cls, client_extension.ClientExtensionShow):
-                self.extend_show(cls.resource, cls.resource_path,
-                                 parent_resource)
-            elif issubclass(cls, client_extension.NeutronClientExtension):
-                setattr(self, "%s_path" % cls.resource_plural,
-                        cls.object_path)
-                setattr(self, "%s_path" % cls.resource, cls.resource_path)
-                self.EXTED_PLURALS.update({cls.resource_plural: cls.resource})
+            self._extend_client_with_class(cls)
 
     def _register_extensions(self, version):
-        for name, module in itertools.chain(
-                client_extension._discover_via_entry_points()):
-            self._extend_client_with_module(module, version)
+        # The methods of the extensions are only defined when first used,
+        # see __getattr__(), and the extensions are discovered once per
+        # process.
+        self._extension_methods = {}
+        for name, cls in client_extension.get_extension_classes(version):
+            self._extend_client_with_class(cls)
+
+    def __getattr__(self, name):
+        # Only called when the attribute is not found the usual way.
+        methods = self.__dict__.get('_extension_methods')
+        if methods is not None:
+            with _extension_lock:
+                method = methods.pop(name, None)
+                if method is not None:
+                    extend, resource, path, parent_resource = method
+                    extend(resource, path, parent_resource)
+            # Defined above, or by another thread in the meantime.
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (type(self).__name__, name))
@@ -0,0 +1,201 @@
+# All Rights Reserved
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""Compact records of the most common Neutron resources.
+
+Records store the well-known attributes of a resource in slots, and any
+other attribute, e.g. the ones of extensions such as binding:host_id, in
+an overflow dict. They are mutable mappings, so code written for the
+dicts returned by the client keeps working, and they also expose the
+attributes, e.g. ``port.device_id``.
+"""
+
+try:
+    from collections import abc as collections_abc
+except ImportError:
+    # Python 2
+    import collections as collections_abc
+
+_COMMON_FIELDS = ('id', 'tenant_id', 'project_id', 'revision_number',
+                  'tags', 'description', 'created_at', 'updated_at')
+
+
+class Record(collections_abc.MutableMapping):
+    """Base class of the resource records."""
+
+    __slots__ = ('_extra',)
+
+    # Names of the slots of the attributes, set by record_type().
+    _fields = frozenset()
+
+    def __init__(self, data=None):
+        # Inlined __setitem__, records are built by the thousands.
+        fields = self._fields
+        set_field = object.__setattr__
+        extra = None
+        for key, value in (data or {}).items():
+            if key in fields:
+                set_field(self, key, value)
+            elif extra is None:
+                extra = {key: value}
+            else:
+                extra[key] = value
+        self._extra = extra
+
+    def __getitem__(self, key):
+        if key in self._fields:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._fields:
+            object.__setattr__(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in self._fields:
+            try:
+                object.__delattr__(self, key)
+            except AttributeError:
+                raise KeyError(key)
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __getattr__(self, name):
+        # Only called for the attributes which are neither set slots nor
+        # class attributes.
+        if not name.startswith('_'):
+            extra = self._extra
+            if extra and name in extra:
+                return extra[name]
+        raise AttributeError("'%s' object has no attribute '%s'" %
+                             (type(self).__name__, name))
+
+    def __iter__(self):
+        for name in self.__slots__:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                continue
+            yield name
+        if self._extra:
+            for key in self._extra:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _key in self)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.to_dict())
+
+    def __reduce__(self):
+        return type(self), (self.to_dict(),)
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+def record_type(resource, fields, name=None):
+    """Return a Record class storing fields in slots.
+
+    The class is named after the resource unless name is given. The name
+    must match the module attribute holding the class for its records to
+    be picklable.
+    """
+    fields = tuple(fields)
+    if name is None:
+        name = ''.join(word.capitalize() for word in resource.split('_'))
+    return type(str(name), (Record,), {'__slots__': fields,
+                                       '_fields': frozenset(fields),
+                                       '__module__': __name__})
+
+
+Network = record_type('network', _COMMON_FIELDS + (
+    'name', 'admin_state_up', 'status', 'shared', 'mtu', 'subnets',
+    'availability_zones', 'availability_zone_hints',
+    'port_security_enabled', 'qos_policy_id'))
+
+Port = record_type('port', _COMMON_FIELDS + (
+    'name', 'network_id', 'mac_address', 'admin_state_up', 'status',
+    'device_id', 'device_owner', 'fixed_ips', 'allowed_address_pairs',
+    'extra_dhcp_opts', 'security_groups', 'port_security_enabled',
+    'qos_policy_id'))
+
+Subnet = record_type('subnet', _COMMON_FIELDS + (
+    'name', 'network_id', 'ip_version', 'cidr', 'gateway_ip',
+    'enable_dhcp', 'allocation_pools', 'dns_nameservers', 'host_routes',
+    'ipv6_ra_mode', 'ipv6_address_mode', 'subnetpool_id',
+    'service_types'))
+
+SecurityGroupRule = record_type('security_group_rule', _COMMON_FIELDS + (
+    'security_group_id', 'direction', 'ethertype', 'protocol',
+    'port_range_min', 'port_range_max', 'remote_ip_prefix',
+    'remote_group_id'))
+
+FloatingIP = record_type('floating_ip', _COMMON_FIELDS + (
+    'floating_ip_address', 'floating_network_id', 'fixed_ip_address',
+    'port_id', 'router_id', 'status', 'dns_domain', 'dns_name',
+    'qos_policy_id'), name='FloatingIP')
+
+Router = record_type('router', _COMMON_FIELDS + (
+    'name', 'admin_state_up', 'status', 'external_gateway_info', 'routes',
+    'distributed', 'ha', 'availability_zones', 'availability_zone_hints',
+    'flavor_id'))
+
+# Record types by resource and by collection name.
+RECORD_TYPES = {
+    'network': Network,
+    'port': Port,
+    'subnet': Subnet,
+    'security_group_rule': SecurityGroupRule,
+    'floatingip': FloatingIP,
+    'router': Router,
+}
+COLLECTION_TYPES = {
+    'networks': Network,
+    'ports': Port,
+    'subnets': Subnet,
+    'security_group_rules': SecurityGroupRule,
+    'floatingips': FloatingIP,
+    'routers': Router,
+}
+
+
+def convert(body):
+    """Replace the resources of a response body by records, in place.
+
+    Resources without a record type are left alone. body is returned.
+    """
+    for key, value in body.items():
+        if isinstance(value, dict):
+            cls = RECORD_TYPES.get(key)
+            if cls is not None:
+                body[key] = cls(value)
+        elif isinstance(value, list):
+            cls = COLLECTION_TYPES.get(key)
+            if cls is not None:
+                value[:] = [cls(item) if isinstance(item, dict) else item
+                            for item in value]
+    return body
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the memory footprint of the results returned by the client.
+
+Usage: python tools/meta_memory_benchmark.py [NUMBER]
+
+Prints the bytes taken per result by NUMBER show_network results of a
+client whose HTTP requests are stubbed, i.e. the result dict with its
+metadata but without the network itself. They are compared with the
+plain dicts decoded from the same body and with the previous dict based
+wrapper. The client results are measured with and without request id
+capture, and for calls retried once, which carry their retry metrics.
+"""
+
+from __future__ import print_function
+
+import gc
+import itertools
+import json
+import sys
+import tracemalloc
+
+import requests
+
+from neutronclient.common import retry
+from neutronclient.v2_0 import client
+
+REQUEST_ID = 'req-aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+BODY = json.dumps({'network': None})
+
+
+class _LegacyDictWithMeta(dict):
+    # The wrapper as it was before it defined __slots__.
+    def __init__(self, values, request_id):
+        super(_LegacyDictWithMeta, self).__init__(values)
+        self._request_ids = []
+        if request_id:
+            self._request_ids.append(request_id)
+
+
+def _response(status_code, body):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.headers['x-openstack-request-id'] = REQUEST_ID
+    resp.request = requests.Request('GET', 'http://neutron').prepare()
+    return resp, body
+
+
+def _client(responses, **kwargs):
+    neutron = client.Client(token='token', endpoint_url='http://neutron',
+                            retry_policy=retry.RetryPolicy(retries=1,
+                                                           backoff=0),
+                            **kwargs)
+    # A plain function rather than a mock, which would keep every call.
+    responses = itertools.cycle(responses)
+    neutron.httpclient.request = lambda *args, **kwargs: next(responses)
+    return neutron
+
+
+def _show_network(neutron):
+    return lambda: neutron.show_network('myid')
+
+
+FACTORIES = [
+    ('dict', lambda: json.loads(BODY)),
+    ('legacy wrapper',
+     lambda: _LegacyDictWithMeta(json.loads(BODY), REQUEST_ID)),
+    ('client', _show_network(_client([_response(200, BODY)]))),
+    ('no request ids', _show_network(_client([_response(200, BODY)],
+                                             capture_request_ids=False))),
+    ('retried once', _show_network(_client([_response(503, ''),
+                                            _response(200, BODY)]))),
+]
+
+
+def measure(factory, number):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    results = [factory() for _i in range(number)]
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del results
+    return float(size) / number
+
+
+def main(number=20000):
+    print('%-16s %12s' % ('result', 'bytes'))
+    for name, factory in FACTORIES:
+        print('%-16s %12.1f' % (name, measure(factory, number)))
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:2]]))
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compare port records with the port dicts returned by the client.
+
+Usage: python tools/records_benchmark.py [NUMBER]
+
+Prints the memory taken by NUMBER ports, the time it takes to build them
+from a decoded response body and the time it takes to read an attribute
+of each of them, for dicts and for records.
+"""
+
+from __future__ import print_function
+
+import gc
+import sys
+import timeit
+import tracemalloc
+
+from neutronclient.v2_0 import records
+
+UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+PORT = {
+    'id': UUID, 'name': 'port', 'network_id': UUID, 'tenant_id': UUID,
+    'project_id': UUID, 'mac_address': 'fa:16:3e:00:00:01',
+    'admin_state_up': True, 'status': 'ACTIVE', 'device_id': UUID,
+    'device_owner': 'compute:nova',
+    'fixed_ips': [{'subnet_id': UUID, 'ip_address': '10.0.0.3'}],
+    'allowed_address_pairs': [], 'extra_dhcp_opts': [],
+    'security_groups': [UUID], 'binding:host_id': 'compute-1',
+    'binding:vif_type': 'ovs', 'binding:vnic_type': 'normal',
+    'port_security_enabled': True, 'qos_policy_id': None,
+    'revision_number': 7, 'tags': [], 'description': '',
+    'created_at': '2018-01-01T00:00:00Z',
+    'updated_at': '2018-01-01T00:00:00Z',
+}
+
+FACTORIES = [
+    ('dict', dict),
+    ('record', records.Port),
+]
+
+
+def memory(factory, ports):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    results = [factory(port) for port in ports]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del results
+    return size
+
+
+def main(number=100000):
+    # The values are shared, only the containers are measured.
+    ports = [dict(PORT) for _i in range(number)]
+    print('%-8s %14s %12s %12s' % ('ports', 'memory (MiB)', 'build (s)',
+                                   'access (s)'))
+    for name, factory in FACTORIES:
+        results = [factory(port) for port in ports]
+        build = timeit.timeit(lambda: [factory(port) for port in ports],
+                              number=1)
+        access = timeit.timeit(
+            lambda: [port['device_id'] for port in results], number=1)
+        print('%-8s %14.1f %12.3f %12.3f' % (
+            name, memory(factory, ports) / 1024.0 / 1024, build, access))
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:2]]))
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measure the per-request JSON serialization cost of the client.
+
+Usage: python tools/serializer_benchmark.py [NUMBER]
+
+For each available JSON codec, prints the time ClientBase spends encoding
+a request body and decoding a response body for typical network, port
+and security group rule payloads, and for a 1000 port list response.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+from neutronclient.common import serializer
+from neutronclient.v2_0 import client
+
+UUID = 'aaaaaaaa-bbbb-cccc-dddd-eeeeeeeeeeee'
+
+NETWORK = {
+    'id': UUID, 'name': 'private', 'tenant_id': UUID, 'project_id': UUID,
+    'admin_state_up': True, 'status': 'ACTIVE', 'shared': False,
+    'router:external': False, 'mtu': 1450, 'subnets': [UUID, UUID],
+    'availability_zones': ['nova'], 'availability_zone_hints': [],
+    'ipv4_address_scope': None, 'ipv6_address_scope': None,
+    'port_security_enabled': True, 'qos_policy_id': None,
+    'revision_number': 3, 'tags': [], 'description': '',
+    'created_at': '2018-01-01T00:00:00Z',
+    'updated_at': '2018-01-01T00:00:00Z',
+}
+
+PORT = {
+    'id': UUID, 'name': 'port', 'network_id': UUID, 'tenant_id': UUID,
+    'project_id': UUID, 'mac_address': 'fa:16:3e:00:00:01',
+    'admin_state_up': True, 'status': 'ACTIVE', 'device_id': UUID,
+    'device_owner': 'compute:nova',
+    'fixed_ips': [{'subnet_id': UUID, 'ip_address': '10.0.0.3'},
+                  {'subnet_id': UUID, 'ip_address': 'fd00::3'}],
+    'allowed_address_pairs': [], 'extra_dhcp_opts': [],
+    'security_groups': [UUID], 'binding:host_id': 'compute-1',
+    'binding:vif_type': 'ovs', 'binding:vnic_type': 'normal',
+    'binding:vif_details': {'port_filter': True, 'ovs_hybrid_plug': True},
+    'binding:profile': {}, 'port_security_enabled': True,
+    'revision_number': 7, 'tags': [], 'description': '',
+    'created_at': '2018-01-01T00:00:00Z',
+    'updated_at': '2018-01-01T00:00:00Z',
+}
+
+SECURITY_GROUP_RULE = {
+    'id': UUID, 'security_group_id': UUID, 'tenant_id': UUID,
+    'project_id': UUID, 'direction': 'ingress', 'ethertype': 'IPv4',
+    'protocol': 'tcp', 'port_range_min': 22, 'port_range_max': 22,
+    'remote_ip_prefix': '0.0.0.0/0', 'remote_group_id': None,
+    'revision_number': 0, 'description': '',
+    'created_at': '2018-01-01T00:00:00Z',
+    'updated_at': '2018-01-01T00:00:00Z',
+}
+
+PAYLOADS = [
+    ('network', {'network': NETWORK}),
+    ('port', {'port': PORT}),
+    ('security_group_rule', {'security_group_rule': SECURITY_GROUP_RULE}),
+    ('1000 ports', {'ports': [PORT] * 1000}),
+]
+
+
+def main(number=2000):
+    print('%-12s %-20s %12s %12s' % ('codec', 'payload',
+                                     'encode (us)', 'decode (us)'))
+    for codec in serializer.available_codecs():
+        neutron = client.Client(token='token', endpoint_url='http://x',
+                                json_codec=codec)
+        for name, payload in PAYLOADS:
+            n = max(1, number // 100) if name.startswith('1000') else number
+            body = neutron.serialize(payload)
+            encode = timeit.timeit(lambda: neutron.serialize(payload),
+                                   number=n)
+            decode = timeit.timeit(lambda: neutron.deserialize(body, 200),
+                                   number=n)
+            print('%-12s %-20s %12.1f %12.1f' % (
+                codec, name, encode / n * 1e6, decode / n * 1e6))
+
+
+if __name__ == '__main__':
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:2]]))